@@ -0,0 +1,200 @@
+##
+# @file         Batch.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Solves many starting positions without the Menu, so it needs no terminal or keyboard module.
+#               Each input line is a JSON object of piece color to the [row, column] spots it starts on,
+#               and each output line is a JSON object with the results for that line, in the same order
+
+# Imports
+import argparse, json, multiprocessing, os, sys, time
+from cache import TranspositionCache
+from catalog import loadCatalog, startPosition
+from placements import PlacementTable
+from solver import solve, count
+import vectorized
+
+# The BatchWorker each worker process builds once when it starts
+worker = None
+
+class BatchWorker():
+
+    ##
+    # @function     init
+    # @purpose      BatchWorker constructor. Builds the pieces and placement table once for every position it solves
+    # @param        self - the BatchWorker instance
+    # @param        engine - the Solver engine to search with
+    # @param        order - the Solver order to search in
+    # @param        wantCount - True to count every solution
+    # @param        wantSolution - True to find the first solution
+    # @param        symmetry - True to count with the symmetries of the starting position
+    # @param        cacheSize - the most entries for the TranspositionCache shared by every position, 0 for no cache
+    # @param        catalog - the catalog file of the board size and pieces, None for the Kanoodle ones
+    def __init__(self, engine="bitboard", order="fixed", wantCount=True, wantSolution=True, symmetry=False,
+                 cacheSize=0, catalog=None):
+        rows, cols, self.pieces = loadCatalog(catalog)
+        self.table = PlacementTable(self.pieces, rows, cols)
+        self.engine = engine
+        self.order = order
+        self.wantCount = wantCount
+        self.wantSolution = wantSolution
+        self.symmetry = symmetry
+        self.cache = TranspositionCache(cacheSize) if cacheSize > 0 else None
+
+    ##
+    # @function     answer
+    # @purpose      Counts and finds the solutions of one starting position
+    # @param        self - the BatchWorker instance
+    # @param        position - the dictionary of piece color to the [row, column] spots it starts on
+    # @param        wantCount - True to count every solution
+    # @param        limit - the most solutions to find, 0 for none
+    # @return       the dictionary with the "count" when it was wanted, and the list of "solutions" when any
+    #               were wanted, each one the list of its rows of characters
+    def answer(self, position, wantCount=True, limit=1):
+        board, needsplace = startPosition(position, self.pieces, self.table)
+        result = {}
+        if(wantCount):
+            result["count"] = count(board, needsplace, self.table, self.engine, self.order,
+                                    symmetry=self.symmetry, cache=self.cache)
+        if(limit > 0):
+            result["solutions"] = []
+            # No point searching again when the count says there is nothing to find
+            if(result.get("count", 1) > 0):
+                for s in solve(board, needsplace, self.table, self.engine, self.order, limit, cache=self.cache):
+                    result["solutions"].append(["".join(row) for row in s.toBoard().board])
+        return result
+
+    ##
+    # @function     run
+    # @purpose      Solves the starting position on one input line
+    # @param        self - the BatchWorker instance
+    # @param        line - the line number and the text of the line
+    # @return       the dictionary of results to write out for the line
+    def run(self, line):
+        result = {"line": line[0]}
+        start = time.perf_counter()
+        try:
+            found = self.answer(json.loads(line[1]), self.wantCount, 1 if self.wantSolution else 0)
+            if(self.wantCount):
+                result["count"] = found["count"]
+            if(self.wantSolution):
+                result["solution"] = found["solutions"][0] if found["solutions"] else None
+        except ValueError as e:
+            result["error"] = str(e)
+        result["seconds"] = round(time.perf_counter() - start, 6)
+        return result
+
+##
+# @function     startWorker
+# @purpose      Builds the worker process's BatchWorker, only called by the process pool
+# @param        settings - the arguments for the BatchWorker
+def startWorker(settings):
+    global worker
+    worker = BatchWorker(*settings)
+
+##
+# @function     runLine
+# @purpose      Solves one input line in a worker process
+# @param        line - the line number and the text of the line
+# @return       the dictionary of results
+def runLine(line):
+    return worker.run(line)
+
+##
+# @function     readLines
+# @purpose      Reads the starting positions to solve, skipping blank lines
+# @param        file - the file to read from
+# @return       a generator of (line number, text), the first line is 1
+def readLines(file):
+    n = 0
+    for text in file:
+        n += 1
+        if(text.strip()):
+            yield (n, text)
+
+##
+# @function     runBatch
+# @purpose      Solves every starting position in a file and writes out the results as they are ready
+# @param        infile - the file of JSON lines to read
+# @param        outfile - the file to write a JSON line of results to for each input line
+# @param        settings - the arguments for each BatchWorker
+# @param        workers - the number of processes, 0 for one per core
+# @param        chunksize - the number of lines to send a worker at a time
+# @return       the number of lines solved
+def runBatch(infile, outfile, settings, workers=1, chunksize=8):
+    if(not workers):
+        workers = os.cpu_count()
+
+    n = 0
+    if(workers == 1):
+        # Not worth starting another process for
+        startWorker(settings)
+        results = map(runLine, readLines(infile))
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, startWorker, (settings,))
+        # imap hands back results in the order of the input lines
+        results = pool.imap(runLine, readLines(infile), chunksize)
+    try:
+        for result in results:
+            outfile.write(json.dumps(result) + "\n")
+            outfile.flush()
+            n += 1
+    finally:
+        if(pool):
+            pool.terminate()
+    return n
+
+##
+# @function     Main
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Solves Kanoodle starting positions from JSON lines, "
+                                     "without the menu")
+    parser.add_argument("input", nargs="?", default="-",
+                        help="the file of starting positions, one JSON object of piece color to a list of "
+                        "[row, column] spots per line (default - for stdin)")
+    parser.add_argument("--output", default="-",
+                        help="the file to write a JSON line of results to for each input line (default - for stdout)")
+    parser.add_argument("--engine", choices=["grid", "bitboard", "numpy", "dlx"], default="bitboard",
+                        help="the engine to search with, see main.py (default bitboard)")
+    parser.add_argument("--order", choices=["fixed", "cell", "constrained", "piece"], default="constrained",
+                        help="the order to search in, see main.py (default constrained)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="the number of processes to solve with, 0 for one per core (default 0)")
+    parser.add_argument("--chunksize", type=int, default=8,
+                        help="the number of lines to send a worker at a time (default 8)")
+    parser.add_argument("--no-count", action="store_true",
+                        help="don't count the solutions, only find the first one")
+    parser.add_argument("--no-solution", action="store_true",
+                        help="don't write out the first solution, only count them")
+    parser.add_argument("--symmetry", action="store_true",
+                        help="count using the symmetries of each starting position, see main.py")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="the most entries for each worker's cache, shared by every position it solves "
+                        "(default 0, no cache, bitboard engine only)")
+    parser.add_argument("--catalog", default=None,
+                        help="read the board size and pieces from this JSON file, see catalog.py")
+    args = parser.parse_args()
+    if(args.order != "fixed" and args.engine != "bitboard"):
+        parser.error("--order " + args.order + " needs --engine bitboard")
+    if(args.no_count and args.no_solution):
+        parser.error("--no-count and --no-solution leave nothing to do")
+    if(args.engine == "numpy" and not vectorized.AVAILABLE):
+        parser.error("--engine numpy needs numpy installed")
+    try:
+        loadCatalog(args.catalog)
+    except (OSError, ValueError) as e:
+        parser.error("--catalog: " + str(e))
+
+    settings = (args.engine, args.order, not args.no_count, not args.no_solution, args.symmetry, args.cache_size,
+                args.catalog)
+    infile = sys.stdin if args.input == "-" else open(args.input)
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        runBatch(infile, outfile, settings, args.workers, args.chunksize)
+    finally:
+        if(infile is not sys.stdin):
+            infile.close()
+        if(outfile is not sys.stdout):
+            outfile.close()
@@ -0,0 +1,224 @@
+##
+# @file         Bench.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Benchmarks the solver on a fixed set of starting positions, from nearly full boards down to
+#               3 starting pieces, and times the board checks on their own. Results are saved as JSON and
+#               can be compared against a saved baseline to catch slowdowns
+
+# Imports
+import argparse, io, json, platform, sys, time, timeit
+from bitboard import BitBoard
+from catalog import makePieces, startPosition
+from output import FORMATS, SolutionWriter
+from placements import PlacementTable
+from regions import PruneStats, RegionCheck
+from solver import solve
+import vectorized
+
+# Three full solutions, as (color, spots) in the order they were placed. Starting positions are made by
+# keeping the first few pieces of one of them, so every position has at least one solution
+SOLVED = [
+    [("B", [[0, 0], [1, 0], [1, 1], [1, 2], [1, 3]]), ("P", [[0, 1], [0, 2], [0, 3], [0, 4]]),
+     ("G", [[0, 5], [0, 6], [0, 7], [1, 7], [1, 8]]), ("b", [[0, 8], [0, 9], [0, 10], [1, 10], [2, 10]]),
+     ("Y", [[1, 4], [1, 5], [2, 4], [3, 4], [3, 5]]), ("+", [[1, 6], [2, 5], [2, 6], [2, 7], [3, 6]]),
+     ("W", [[1, 9], [2, 8], [2, 9]]), ("O", [[2, 0], [2, 1], [3, 0], [4, 0]]),
+     ("M", [[2, 2], [2, 3], [3, 1], [3, 2], [4, 1]]), ("p", [[3, 3], [4, 2], [4, 3], [4, 4], [4, 5]]),
+     ("R", [[3, 7], [3, 8], [4, 6], [4, 7], [4, 8]]), ("g", [[3, 9], [3, 10], [4, 9], [4, 10]])],
+    [("B", [[0, 0], [0, 1], [0, 2], [0, 3], [1, 3]]), ("W", [[0, 4], [1, 4], [1, 5]]),
+     ("M", [[0, 5], [0, 6], [1, 6], [1, 7], [2, 7]]), ("P", [[0, 7], [0, 8], [0, 9], [0, 10]]),
+     ("b", [[1, 0], [1, 1], [1, 2], [2, 0], [3, 0]]), ("G", [[1, 8], [2, 8], [3, 7], [3, 8], [4, 7]]),
+     ("g", [[1, 9], [1, 10], [2, 9], [2, 10]]), ("O", [[2, 1], [2, 2], [2, 3], [3, 1]]),
+     ("+", [[2, 4], [3, 3], [3, 4], [3, 5], [4, 4]]), ("Y", [[2, 5], [2, 6], [3, 6], [4, 5], [4, 6]]),
+     ("p", [[3, 2], [4, 0], [4, 1], [4, 2], [4, 3]]), ("R", [[3, 9], [3, 10], [4, 8], [4, 9], [4, 10]])],
+    [("B", [[0, 0], [0, 1], [0, 2], [0, 3], [1, 0]]), ("G", [[0, 4], [1, 4], [1, 5], [2, 5], [3, 5]]),
+     ("O", [[0, 5], [0, 6], [0, 7], [1, 7]]), ("g", [[0, 8], [0, 9], [1, 8], [1, 9]]),
+     ("p", [[0, 10], [1, 10], [2, 9], [2, 10], [3, 10]]), ("Y", [[1, 1], [1, 2], [2, 1], [3, 1], [3, 2]]),
+     ("+", [[1, 3], [2, 2], [2, 3], [2, 4], [3, 3]]), ("R", [[1, 6], [2, 6], [2, 7], [3, 6], [3, 7]]),
+     ("b", [[2, 0], [3, 0], [4, 0], [4, 1], [4, 2]]), ("M", [[2, 8], [3, 8], [3, 9], [4, 9], [4, 10]]),
+     ("W", [[3, 4], [4, 3], [4, 4]]), ("P", [[4, 5], [4, 6], [4, 7], [4, 8]])],
+]
+
+# The number of starting pieces to keep from each solution
+KEEP = [10, 8, 6, 4, 3]
+
+# The (engine, order) pairs to run the corpus with
+ENGINES = [("grid", "fixed"), ("bitboard", "fixed"), ("bitboard", "constrained"), ("bitboard", "piece"),
+           ("dlx", "fixed")]
+if(vectorized.AVAILABLE):
+    ENGINES.append(("numpy", "fixed"))
+
+##
+# @function     corpus
+# @purpose      Makes the fixed set of starting positions
+# @return       the list of (name, position), position is a dictionary of piece color to spots
+def corpus():
+    positions = []
+    for i in range(len(SOLVED)):
+        for keep in KEEP:
+            positions.append(("s" + str(i) + "-keep" + str(keep), dict(SOLVED[i][:keep])))
+    return positions
+
+##
+# @function     best
+# @purpose      Runs a function a few times and keeps the fastest run, which is the least disturbed by anything else
+# @param        run - the function to time, it returns a dictionary of what it counted
+# @param        repeat - the number of times to run it
+# @return       the dictionary from the fastest run, with its "seconds" added
+def best(run, repeat):
+    fastest = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        result["seconds"] = time.perf_counter() - start
+        if(fastest is None or result["seconds"] < fastest["seconds"]):
+            fastest = result
+    return fastest
+
+##
+# @function     benchSolver
+# @purpose      Times finding every solution of every position in the corpus with every engine
+# @param        pieces - the list of every piece
+# @param        table - the PlacementTable of every piece
+# @param        repeat - the number of times to run each one
+# @return       the dictionary of case name to results
+def benchSolver(pieces, table, repeat):
+    results = {}
+    for name, position in corpus():
+        for engine, order in ENGINES:
+            board, needsplace = startPosition(position, pieces, table)
+
+            def run():
+                stats = PruneStats()
+                n = 0
+                for s in solve(board, needsplace, table, engine, order, stats=stats):
+                    n += 1
+                # A node is a placement that fit and had its empty regions checked,
+                # Dancing Links doesn't check regions so it has no count of them
+                return {"solutions": n, "nodes": stats.placements if engine != "dlx" else None}
+
+            result = best(run, repeat)
+            if(result["nodes"] is not None):
+                result["nodesPerSecond"] = result["nodes"] / result["seconds"] if result["seconds"] else 0
+            result["solutionsPerSecond"] = result["solutions"] / result["seconds"] if result["seconds"] else 0
+            results["solve/" + name + "/" + engine + "-" + order] = result
+    return results
+
+##
+# @function     benchChecks
+# @purpose      Times the board checks the search spends most of its time in
+# @param        pieces - the list of every piece
+# @param        table - the PlacementTable of every piece
+# @param        repeat - the number of times to run each one
+# @return       the dictionary of case name to results
+def benchChecks(pieces, table, repeat):
+    board, needsplace = startPosition(dict(SOLVED[0][:3]), pieces, table)
+    bits = BitBoard.fromBoard(board)
+    check = RegionCheck([len(p.shape) for p in needsplace[1:]])
+    placements = [pl for p in needsplace for pl in table.placements[p.color]]
+    fitting = [pl for pl in placements if bits.fits(pl.mask)]
+    solved, rest = startPosition(dict(SOLVED[0]), pieces, table)
+    solution = next(solve(board, needsplace, table, first=True))
+    writers = {}
+    for format in FORMATS:
+        writers[format] = SolutionWriter(io.BytesIO(), format, [p.color for p in pieces])
+
+    cases = {
+        # Every placement of every remaining piece, most of them don't fit
+        "check/grid-isValidPlacement": (lambda: [board.isValidPlacement(pl, check) for pl in placements],
+                                        len(placements)),
+        "check/bitboard-isValidPlacement": (lambda: [bits.isValidPlacement(pl, check) for pl in placements],
+                                            len(placements)),
+        # Only the placements that fit, so every one labels the empty regions
+        "check/grid-floodFill": (lambda: [board.openSpotForEachPiece(pl, check) for pl in fitting], len(fitting)),
+        "check/bitboard-floodFill": (lambda: [bits.openSpotForEachPiece(pl.mask, check) for pl in fitting],
+                                     len(fitting)),
+        "check/render": (lambda: str(solved), 1),
+    }
+    if(vectorized.AVAILABLE):
+        # Every placement of every piece at once, against checking each one on the bitboard
+        fitter = vectorized.FitTable(table)
+        every = [pl for color in table.placements for pl in table.placements[color]]
+        cases["check/bitboard-fits"] = (lambda: [bits.fits(pl.mask) for pl in every], len(every))
+        cases["check/numpy-validity"] = (lambda: fitter.validity(bits.filled), len(every))
+    # Turning a solution into the bytes of each output format, without writing them anywhere
+    for format in FORMATS:
+        cases["check/output-" + format] = (lambda writer=writers[format]: writer.render(solution), 1)
+
+    results = {}
+    for name in cases:
+        run, calls = cases[name]
+        number = max(1, 20000 // calls)
+        seconds = min(timeit.repeat(run, number=number, repeat=repeat)) / number
+        results[name] = {"seconds": seconds, "calls": calls, "callsPerSecond": calls / seconds if seconds else 0}
+    return results
+
+##
+# @function     compare
+# @purpose      Finds the cases that got slower than the baseline
+# @param        results - the dictionary of case name to results
+# @param        baseline - the dictionary of case name to results to compare against
+# @param        tolerance - how much slower a case can get before it counts, 0.1 for 10%
+# @param        minimum - the fewest seconds a case has to take in the baseline to count, since the
+#               shortest cases are mostly timing noise
+# @return       the list of (case name, baseline seconds, seconds) for each slower case
+def compare(results, baseline, tolerance, minimum=0.001):
+    slower = []
+    for name in results:
+        if(name in baseline and baseline[name]["seconds"] >= minimum
+           and results[name]["seconds"] > baseline[name]["seconds"] * (1 + tolerance)):
+            slower.append((name, baseline[name]["seconds"], results[name]["seconds"]))
+    return slower
+
+##
+# @function     Main
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmarks the Kanoodle solver")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="the JSON file to save the results to (default bench_results.json)")
+    parser.add_argument("--baseline", default=None,
+                        help="a JSON file saved by an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="how much slower than the baseline a case can get before it is flagged (default 0.1)")
+    parser.add_argument("--minimum", type=float, default=0.001,
+                        help="cases faster than this many seconds in the baseline are never flagged (default 0.001)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="the number of times to run each case, the fastest run is kept (default 3)")
+    parser.add_argument("--only", choices=["solve", "check"], default=None,
+                        help="only run the solver or the board check benchmarks")
+    args = parser.parse_args()
+
+    pieces = makePieces()
+    table = PlacementTable(pieces)
+    results = {}
+    if(args.only != "check"):
+        results.update(benchSolver(pieces, table, args.repeat))
+    if(args.only != "solve"):
+        results.update(benchChecks(pieces, table, args.repeat))
+
+    for name in results:
+        line = name.ljust(48) + format(results[name]["seconds"] * 1000, "10.3f") + " ms"
+        if("nodesPerSecond" in results[name]):
+            line += format(results[name]["nodesPerSecond"], "12.0f") + " nodes/s"
+        elif("nodes" in results[name]):
+            line += "           - nodes/s"
+        if("solutionsPerSecond" in results[name]):
+            line += format(results[name]["solutionsPerSecond"], "10.1f") + " solutions/s"
+        else:
+            line += format(results[name]["callsPerSecond"], "12.0f") + " calls/s"
+        print(line)
+
+    with open(args.output, "w") as f:
+        json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                  f, indent=1)
+
+    if(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        slower = compare(results, baseline, args.tolerance, args.minimum)
+        for name, before, after in slower:
+            print("SLOWER", name, format(before * 1000, ".3f"), "ms ->", format(after * 1000, ".3f"), "ms",
+                  file=sys.stderr)
+        if(slower):
+            sys.exit(1)
@@ -0,0 +1,158 @@
+##
+# @file         BitBoard.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      A kanoodle board stored as a single integer, one bit per spot,
+#               so placements can be checked, placed and removed with one bitwise operation
+
+# Imports
+from regions import RegionCheck
+
+class BitBoard():
+
+    ##
+    # @function     init
+    # @purpose      BitBoard constructor. Creates an empty BitBoard
+    # @param        self - the BitBoard instance
+    # @param        rows - the number of rows on the board
+    # @param        cols - the number of columns on the board
+    def __init__(self, rows=5, cols=11):
+        self.rows = rows
+        self.cols = cols
+        self.full = (1 << (rows * cols)) - 1
+        self.filled = 0
+
+        # Masks of every spot that can move one column right/left without wrapping to another row
+        self.notLastCol = 0
+        self.notFirstCol = 0
+        for r in range(rows):
+            for c in range(cols):
+                if(c < cols - 1):
+                    self.notLastCol |= 1 << (r * cols + c)
+                if(c > 0):
+                    self.notFirstCol |= 1 << (r * cols + c)
+
+    ##
+    # @function     fromBoard
+    # @purpose      Creates a BitBoard with the same filled spots as a Board
+    # @param        board - the Board to copy
+    # @return       the new BitBoard
+    @staticmethod
+    def fromBoard(board):
+        bits = BitBoard(len(board.board), len(board.board[0]))
+        for r in range(bits.rows):
+            for c in range(bits.cols):
+                if(not board.isEmptySpot(r, c)):
+                    bits.filled |= 1 << (r * bits.cols + c)
+        return bits
+
+    ##
+    # @function     fits
+    # @purpose      Checks if every spot of a placement is currently empty
+    # @param        self - the BitBoard instance
+    # @param        mask - the bitmask of the placement
+    def fits(self, mask):
+        return not (self.filled & mask)
+
+    ##
+    # @function     place
+    # @purpose      Fills the spots of a placement
+    # @param        self - the BitBoard instance
+    # @param        mask - the bitmask of the placement
+    def place(self, mask):
+        self.filled |= mask
+
+    ##
+    # @function     remove
+    # @purpose      Empties the spots of a placement that was placed
+    # @param        self - the BitBoard instance
+    # @param        mask - the bitmask of the placement
+    def remove(self, mask):
+        self.filled ^= mask
+
+    ##
+    # @function     reset
+    # @purpose      Puts the filled spots back to how they were before some placements
+    # @param        self - the BitBoard instance
+    # @param        filled - the mask of filled spots to go back to
+    def reset(self, filled):
+        self.filled = filled
+
+    ##
+    # @function     isValidPlacement
+    # @purpose      Checks if a placement fits and would not isolate any open spaces
+    # @param        self - the BitBoard instance
+    # @param        placement - the placement to check
+    # @param        check - the RegionCheck for the pieces left after this one, None to only
+    #               reject regions smaller than 3 spots
+    def isValidPlacement(self, placement, check=None):
+        return self.fits(placement.mask) and self.openSpotForEachPiece(placement.mask, check)
+
+    ##
+    # @function     spread
+    # @purpose      Finds the spots next to any spot in a mask
+    # @param        self - the BitBoard instance
+    # @param        mask - the spots to spread out from
+    # @return       the mask of the spots above, below, left and right of the given spots
+    def spread(self, mask):
+        return (((mask & self.notLastCol) << 1) | ((mask & self.notFirstCol) >> 1)
+                | (mask << self.cols) | (mask >> self.cols)) & self.full
+
+    ##
+    # @function     firstOpen
+    # @purpose      Finds the first open spot in row major order
+    # @param        self - the BitBoard instance
+    # @return       the bit number of the spot, r * cols + c for spot [r, c]
+    def firstOpen(self):
+        empty = self.full & ~self.filled
+        return (empty & -empty).bit_length() - 1
+
+    ##
+    # @function     mostConstrained
+    # @purpose      Finds the open spot with the fewest open spots next to it, the first one on a tie
+    # @param        self - the BitBoard instance
+    # @return       the bit number of the spot, r * cols + c for spot [r, c]
+    def mostConstrained(self):
+        empty = self.full & ~self.filled
+        best = empty & -empty
+        fewest = 5
+        while(empty):
+            spot = empty & -empty
+            n = (self.spread(spot) & ~self.filled).bit_count()
+            if(n < fewest):
+                best = spot
+                fewest = n
+                # Can't do better than a spot with at most one way out
+                if(n <= 1):
+                    break
+            empty ^= spot
+        return best.bit_length() - 1
+
+    ##
+    # @function     openSpotForEachPiece
+    # @purpose      Checks that no open spots would be isolated by a placement
+    # @param        self - the BitBoard instance
+    # @param        mask - the bitmask of the placement
+    # @param        check - the RegionCheck for the pieces left after this one, None to only
+    #               reject regions smaller than 3 spots
+    def openSpotForEachPiece(self, mask, check=None):
+        if(check is None):
+            check = RegionCheck()
+        if(check.stats):
+            check.stats.placements += 1
+
+        # Grow a region out of the lowest open spot until it stops changing,
+        # then take that region away and repeat until there are no open spots left
+        empty = self.full & ~(self.filled | mask)
+        while(empty):
+            region = empty & -empty
+            while(True):
+                grown = (region | self.spread(region)) & empty
+                if(grown == region):
+                    break
+                region = grown
+            # A region the pieces that are left can't fill is considered "isolated"
+            if(not check.canFill(region.bit_count())):
+                return False
+            empty ^= region
+        return True
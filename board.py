@@ -1,144 +1,189 @@
-##
-# @file         Board.py
-# @author       Daniel Epstein
-# @date         August 20, 2023
-# @purpose      A class that represents a kanoodle board
-
-# Imports
-import piece
-
-class Board():
-
-    ##
-    # @function     init
-    # @purpose      Board constructor. Creates an instance of the Board
-    # @param        self - the Board instance
-    def __init__(self):
-        self.board = []
-        self.opens = []
-        for i in range(5):
-            self.board.append(['X'] * 11)
-            for j in range(11):
-                self.opens.append([i, j])
-
-    ##
-    # @function     str
-    # @purpose      String version of the board so it can be printed
-    # @param        self - the Board instance
-    def __str__(self):
-        bstr = ""
-        for r in range(len(self.board)):
-            for c in range(len(self.board[r])):
-                # Changes the ANSI Code to print the board in colors close to the actual pieces
-                s=""
-                match self.board[r][c]:
-                    case 'P':   
-                        s="\033[0;35m"
-                    case 'R':
-                        s="\033[0;31m"
-                    case '+':
-                        s="\033[0;37m"
-                    case 'W':
-                        s="\033[1;37m"
-                    case 'p':
-                        s="\033[1m"
-                    case 'b':
-                        s="\033[1;34m"
-                    case 'B':
-                        s="\033[0;34m"
-                    case 'g':
-                        s="\033[1;32m"
-                    case 'G':
-                        s="\033[0;32m"
-                    case 'Y':
-                        s="\033[1;33m"
-                    case 'O':
-                        s="\033[0;31m"
-                    case 'M':
-                        s="\033[1;35m"
-                    case _:
-                        s="\033[1;30m"
-                bstr += s + self.board[r][c] + "\033[0m "
-            bstr +="\n"
-        return bstr
-
-    ##
-    # @function     isEmptySpot
-    # @purpose      Checks if a given spot on the board is not currently holding a piece
-    # @param        self - the Board instance
-    # @param        r - the row of the spot to check
-    # @param        c - the column of the spot to check
-    def isEmptySpot(self, r, c):
-        return self.board[r][c] == 'X'
-
-    ##
-    # @function     isValidPlacement
-    # @purpose      Checks if the current position of a piece is a valid placement for that piece
-    # @param        self - the Board instance
-    # @param        piece - the piece to check the placement of
-    def isValidPlacement(self, piece):
-        # A placement is valid if 
-        # - all the coordinates that make up the shape are on the board and currently empty
-        # - placing the piece here would not isolate any other open spaces, 
-        # thus making it impossible to place a piece there
-        for c in piece.shape:
-            if(c[0] < 0 or c[0] > 4 or c[1] < 0 or c[1] > 10 or not self.isEmptySpot(c[0], c[1])):
-                return False
-        return self.openSpotForEachPiece(piece)
-
-    ##
-    # @function     placePiece
-    # @purpose      Overwrites the coordinates on the board to place the piece
-    # @param        self - the Board instance
-    # @param        piece - the piece to place
-    def placePiece(self, piece):
-        for c in piece.shape:
-            self.board[c[0]][c[1]] = piece.color
-    
-    ##
-    # @function     removePiece
-    # @purpose      Overwrites the coordinates on the board to remove the placed piece
-    # @param        self - the Board instance
-    # @param        piece - the piece to remove
-    def removePiece(self, piece):
-        for c in piece.shape:
-            self.board[c[0]][c[1]] = 'X'
-
-    ##
-    # @function     openSpotForEachPiece
-    # @purpose      Checks that no open spots would be isolated
-    # @param        self - the Board instance
-    # @param        piece - the piece to check the placement of
-    def openSpotForEachPiece(self, piece):
-        # Copy the remaining open spots and remove the spots taken up by piece
-        other = self.opens.copy()
-        traversed = []
-        for c in piece.shape:
-            other.remove(c)
-            traversed.append(c)
-
-        # For each open spot, if the spot is empty, count the connected spots
-        # If any spot is not connected to at least 3 other spots, it is considered "isolated"
-        # because a kanoodle piece could not possibly fit there 
-        for o in other:
-            if(self.isEmptySpot(o[0], o[1])):
-                t = 1 + self.countConnected(o[0], o[1], traversed.copy())
-                if(t < 4):
-                    return False
-        return True
-        
-    ##
-    # @function     countConnected
-    # @purpose      Recursive function to count the number of connected spots to a given spot
-    # @param        self - the Board instance
-    # @param        r - the row number of the current spot
-    # @param        c - the column number of the current spot
-    # @param        traversed - the list of spots that are already part of the current connection
-    def countConnected(self, r, c, traversed):
-        if(r < 0 or r > 4 or c < 0 or c > 10 or [r, c] in traversed or not self.isEmptySpot(r, c)):
-            return 0
-        else:
-            traversed.append([r, c])
-            connected = self.countConnected(r + 1, c, traversed) + self.countConnected(r - 1, c, traversed) + self.countConnected(r, c + 1, traversed) + self.countConnected(r, c - 1, traversed)
-            return 1 + connected
-
+##
+# @file         Board.py
+# @author       Daniel Epstein
+# @date         August 20, 2023
+# @purpose      A class that represents a kanoodle board, 5 by 11 unless a catalog says otherwise
+
+# Imports
+import piece
+from regions import RegionCheck
+
+# The ANSI Codes to print each piece in colors close to the actual pieces
+COLORS = {'P': "\033[0;35m", 'R': "\033[0;31m", '+': "\033[0;37m", 'W': "\033[1;37m", 'p': "\033[1m",
+          'b': "\033[1;34m", 'B': "\033[0;34m", 'g': "\033[1;32m", 'G': "\033[0;32m", 'Y': "\033[1;33m",
+          'O': "\033[0;31m", 'M': "\033[1;35m"}
+
+# The ANSI Code for empty spots and anything else
+OTHER_COLOR = "\033[1;30m"
+
+# The text printed for each spot, built once for each character
+cells = {}
+
+##
+# @function     cellText
+# @purpose      The colored text printed for one spot of a board
+# @param        spot - the character on the spot
+# @return       the text, ending with a space
+def cellText(spot):
+    if(spot not in cells):
+        cells[spot] = COLORS.get(spot, OTHER_COLOR) + spot + "\033[0m "
+    return cells[spot]
+
+class Board():
+
+    ##
+    # @function     init
+    # @purpose      Board constructor. Creates an instance of the Board
+    # @param        self - the Board instance
+    # @param        rows - the number of rows on the board
+    # @param        cols - the number of columns on the board
+    def __init__(self, rows=5, cols=11):
+        self.rows = rows
+        self.cols = cols
+        self.board = []
+        # The set of (row, column) spots no piece is on
+        self.opens = set()
+        for i in range(rows):
+            self.board.append(['X'] * cols)
+            for j in range(cols):
+                self.opens.add((i, j))
+        # The pieces put on by apply, in order, so undo can take the last one off
+        self.journal = []
+
+    ##
+    # @function     str
+    # @purpose      String version of the board so it can be printed
+    # @param        self - the Board instance
+    def __str__(self):
+        bstr = ""
+        for r in range(len(self.board)):
+            bstr += "".join(cellText(spot) for spot in self.board[r]) + "\n"
+        return bstr
+
+    ##
+    # @function     isEmptySpot
+    # @purpose      Checks if a given spot on the board is not currently holding a piece
+    # @param        self - the Board instance
+    # @param        r - the row of the spot to check
+    # @param        c - the column of the spot to check
+    def isEmptySpot(self, r, c):
+        return self.board[r][c] == 'X'
+
+    ##
+    # @function     isValidPlacement
+    # @purpose      Checks if the current position of a piece is a valid placement for that piece
+    # @param        self - the Board instance
+    # @param        piece - the piece to check the placement of
+    # @param        check - the RegionCheck for the pieces left after this one, None to only
+    #               reject regions smaller than 3 spots
+    def isValidPlacement(self, piece, check=None):
+        # A placement is valid if 
+        # - all the coordinates that make up the shape are on the board and currently empty
+        # - placing the piece here would not isolate any other open spaces, 
+        # thus making it impossible to place a piece there
+        return self.fits(piece) and self.openSpotForEachPiece(piece, check)
+
+    ##
+    # @function     fits
+    # @purpose      Checks if every spot of a piece is on the board and currently empty
+    # @param        self - the Board instance
+    # @param        piece - the piece to check the placement of
+    def fits(self, piece):
+        for c in piece.shape:
+            if(c[0] < 0 or c[0] >= self.rows or c[1] < 0 or c[1] >= self.cols or not self.isEmptySpot(c[0], c[1])):
+                return False
+        return True
+
+    ##
+    # @function     placePiece
+    # @purpose      Overwrites the coordinates on the board to place the piece
+    # @param        self - the Board instance
+    # @param        piece - the piece to place
+    def placePiece(self, piece):
+        for c in piece.shape:
+            self.board[c[0]][c[1]] = piece.color
+    
+    ##
+    # @function     removePiece
+    # @purpose      Overwrites the coordinates on the board to remove the placed piece
+    # @param        self - the Board instance
+    # @param        piece - the piece to remove
+    def removePiece(self, piece):
+        for c in piece.shape:
+            self.board[c[0]][c[1]] = 'X'
+
+    ##
+    # @function     apply
+    # @purpose      Puts a piece on the board and remembers it, so it can be taken off again with undo
+    # @param        self - the Board instance
+    # @param        piece - the piece or placement to put on
+    def apply(self, piece):
+        self.placePiece(piece)
+        self.opens.difference_update(piece.shape)
+        self.journal.append(piece)
+
+    ##
+    # @function     undo
+    # @purpose      Takes off the last piece put on by apply
+    # @param        self - the Board instance
+    # @return       the piece taken off
+    def undo(self):
+        piece = self.journal.pop()
+        self.removePiece(piece)
+        self.opens.update(piece.shape)
+        return piece
+
+    ##
+    # @function     undoTo
+    # @purpose      Takes off pieces until only the first ones put on by apply are left
+    # @param        self - the Board instance
+    # @param        depth - the number of pieces to leave on
+    def undoTo(self, depth):
+        while(len(self.journal) > depth):
+            self.undo()
+
+    ##
+    # @function     openSpotForEachPiece
+    # @purpose      Checks that no open spots would be isolated
+    # @param        self - the Board instance
+    # @param        piece - the piece to check the placement of
+    # @param        check - the RegionCheck for the pieces left after this one, None to only
+    #               reject regions smaller than 3 spots
+    def openSpotForEachPiece(self, piece, check=None):
+        if(check is None):
+            check = RegionCheck()
+        if(check.stats):
+            check.stats.placements += 1
+
+        # Mark every filled spot, and the spots taken up by piece, as already seen
+        seen = [[not self.isEmptySpot(r, c) for c in range(self.cols)] for r in range(self.rows)]
+        for c in piece.shape:
+            seen[c[0]][c[1]] = True
+
+        # Label each connected region of open spots once, and make sure the pieces
+        # that are left could fill it, otherwise the region is considered "isolated"
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if(not seen[r][c] and not check.canFill(self.countConnected(r, c, seen))):
+                    return False
+        return True
+        
+    ##
+    # @function     countConnected
+    # @purpose      Counts the number of open spots connected to a given spot, including itself
+    # @param        self - the Board instance
+    # @param        r - the row number of the starting spot
+    # @param        c - the column number of the starting spot
+    # @param        seen - the grid of spots already counted, every counted spot is marked in it
+    def countConnected(self, r, c, seen):
+        seen[r][c] = True
+        stack = [(r, c)]
+        count = 0
+        while(stack):
+            r, c = stack.pop()
+            count += 1
+            for n in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+                if(0 <= n[0] < self.rows and 0 <= n[1] < self.cols and not seen[n[0]][n[1]]):
+                    seen[n[0]][n[1]] = True
+                    stack.append(n)
+        return count
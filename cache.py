@@ -0,0 +1,96 @@
+##
+# @file         Cache.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Remembers how many solutions the search found from a filled board and a set of
+#               remaining pieces, since the same filled spots are reached through many different
+#               placements. Only keeps so many entries, throwing out the least recently used
+
+# Imports
+from collections import OrderedDict
+
+class CacheStats():
+
+    ##
+    # @function     init
+    # @purpose      CacheStats constructor. Counts how well the cache is doing, to help pick its size
+    # @param        self - the CacheStats instance
+    def __init__(self):
+        self.hits = 0           # lookups that found an entry
+        self.misses = 0         # lookups that didn't
+        self.stores = 0         # entries added
+        self.evictions = 0      # entries thrown out to make room
+
+    ##
+    # @function     add
+    # @purpose      Adds the counts from another CacheStats, such as one from a worker process
+    # @param        self - the CacheStats instance
+    # @param        other - the CacheStats to add
+    def add(self, other):
+        self.hits += other.hits
+        self.misses += other.misses
+        self.stores += other.stores
+        self.evictions += other.evictions
+
+    ##
+    # @function     str
+    # @purpose      String version of the statistics so they can be printed
+    # @param        self - the CacheStats instance
+    def __str__(self):
+        lookups = self.hits + self.misses
+        percent = 100 * self.hits / lookups if lookups else 0
+        return ("Cache hits:         " + str(self.hits) + " (" + format(percent, ".1f") + "%)\n"
+                + "Cache misses:       " + str(self.misses) + "\n"
+                + "Cache stores:       " + str(self.stores) + "\n"
+                + "Cache evictions:    " + str(self.evictions))
+
+class TranspositionCache():
+
+    ##
+    # @function     init
+    # @purpose      TranspositionCache constructor. Creates an empty cache
+    # @param        self - the TranspositionCache instance
+    # @param        maxEntries - the most entries to keep, each one takes a few hundred bytes
+    def __init__(self, maxEntries=1000000):
+        self.maxEntries = maxEntries
+        self.entries = OrderedDict()
+        self.stats = CacheStats()
+
+    ##
+    # @function     get
+    # @purpose      Looks up the number of solutions for a filled board and remaining pieces
+    # @param        self - the TranspositionCache instance
+    # @param        key - the (filled mask, remaining piece colors, table restriction) to look up
+    # @return       the number of solutions, or None if it isn't in the cache
+    def get(self, key):
+        n = self.entries.get(key)
+        if(n is None):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        self.entries.move_to_end(key)
+        return n
+
+    ##
+    # @function     put
+    # @purpose      Remembers the number of solutions for a filled board and remaining pieces
+    # @param        self - the TranspositionCache instance
+    # @param        key - the (filled mask, remaining piece colors, table restriction)
+    # @param        n - the number of solutions, 0 for a dead end
+    def put(self, key, n):
+        if(self.maxEntries <= 0):
+            return
+        if(key not in self.entries):
+            self.stats.stores += 1
+            if(len(self.entries) >= self.maxEntries):
+                self.entries.popitem(last=False)
+                self.stats.evictions += 1
+        self.entries[key] = n
+        self.entries.move_to_end(key)
+
+    ##
+    # @function     clear
+    # @purpose      Throws out every entry, keeping the counts
+    # @param        self - the TranspositionCache instance
+    def clear(self):
+        self.entries.clear()
@@ -0,0 +1,130 @@
+##
+# @file         Catalog.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      The set of Kanoodle pieces, kept apart from the Menu so the solver
+#               can be run without a terminal or the keyboard module, and starting positions read from data
+#
+#               Another board size and set of pieces can be read from a catalog file, a JSON object like
+#                 {"rows": 5, "cols": 11, "pieces": [{"color": "+", "shape": [[0, 1], [1, 0], [1, 1], [1, 2], [2, 1]],
+#                                                     "rots": 1, "flips": 1}, ...]}
+#               with the pieces in the order they are placed. The color is the one character printed for the piece,
+#               rots (1 to 4, default 4) and flips (1 or 2, default 2) are the numbers of different rotations and
+#               flips the piece has, and the pieces have to fill the board exactly
+
+# Imports
+import json
+from board import Board
+from piece import Piece
+
+# The size of the Kanoodle board
+ROWS = 5
+COLS = 11
+
+##
+# @function     makePieces
+# @purpose      Creates a new Piece for each of the 12 Kanoodle pieces
+# @return       the list of pieces, arranged in the order they are placed
+def makePieces():
+    # Initialize each piece, starting at [-1, -1]
+    # Pieces must start off the board, so that they can be moved to any position on the board
+    purple = Piece('P', [[-1, -1], [0, -1], [1, -1], [2, -1]], 2, 1)
+    red = Piece('R', [[-1, -1], [0, -1], [1, -1], [-1, 0], [0, 0]], 4, 2)
+    lightpink = Piece('p', [[-1, -1], [-1, 0], [-1, 1], [0, 1], [-1, 2]], 4, 2)
+    white = Piece('W', [[-1, -1], [-1, 0], [0, -1]], 4, 1)
+    lightgreen = Piece('g', [[-1, -1], [0, -1], [-1, 0], [0, 0]], 1, 1)
+    lightblue = Piece('b', [[-1, -1], [0, -1], [1, -1], [1, 0], [1, 1]], 4, 1)
+    blue = Piece('B', [[-1, -1], [0, -1], [0, 0], [0, 1], [0, 2]], 4, 2)
+    silver = Piece('+', [[-1, -1], [-2, -1], [-1, -2], [-1, 0], [0, -1]], 1, 1)
+    yellow = Piece('Y', [[-1, -1], [0, -1], [1, -1], [1, 0], [-1, 0]], 4, 1)
+    green = Piece('G', [[-1, -1], [-1, 0], [-1, 1], [0, 1], [0, 2]], 4, 2)
+    pink = Piece('M', [[-1, -1], [0, -1], [0, 0], [1, 0], [1, 1]], 4, 1)
+    orange = Piece('O', [[-1, -1], [0, -1], [0, 0], [0, 1]], 4, 2)
+
+    # Pieces arranged in order of size to place the larger pieces first
+    return [silver, yellow, pink, green, lightpink, lightblue, red, blue, lightgreen, orange, purple, white]
+
+##
+# @function     parseCatalog
+# @purpose      Makes the board size and pieces described by a catalog, see the top of the file
+# @param        data - the catalog dictionary
+# @return       the number of rows, the number of columns and the list of pieces
+def parseCatalog(data):
+    if(not isinstance(data, dict) or not isinstance(data.get("pieces"), list) or not data["pieces"]):
+        raise ValueError("a catalog must be an object with a list of pieces")
+    rows = data.get("rows")
+    cols = data.get("cols")
+    if(not isinstance(rows, int) or not isinstance(cols, int) or rows < 1 or cols < 1):
+        raise ValueError("a catalog must have a positive number of rows and cols")
+
+    pieces = []
+    for entry in data["pieces"]:
+        color = entry.get("color") if isinstance(entry, dict) else None
+        if(not isinstance(color, str) or len(color) != 1 or not color.isascii() or not color.isprintable()
+           or color in "X "):
+            raise ValueError("a piece color must be one printable character other than X")
+        if(color in [p.color for p in pieces]):
+            raise ValueError("there is more than one piece " + repr(color))
+        shape = entry.get("shape")
+        if(not isinstance(shape, list) or not shape
+           or not all(isinstance(c, list) and len(c) == 2 and all(isinstance(n, int) for n in c) for c in shape)):
+            raise ValueError("the shape of piece " + color + " must be a list of [row, column]")
+        if(len(set((c[0], c[1]) for c in shape)) != len(shape)):
+            raise ValueError("the shape of piece " + color + " covers a spot more than once")
+        rots = entry.get("rots", 4)
+        flips = entry.get("flips", 2)
+        if(rots not in [1, 2, 3, 4] or flips not in [1, 2]):
+            raise ValueError("piece " + color + " must have 1 to 4 rots and 1 or 2 flips")
+
+        # Start the piece off the board like the Kanoodle pieces, with its first spot at [-1, -1]
+        pieces.append(Piece(color, [[c[0] - shape[0][0] - 1, c[1] - shape[0][1] - 1] for c in shape], rots, flips))
+
+    if(sum(len(p.shape) for p in pieces) != rows * cols):
+        raise ValueError("the pieces cover " + str(sum(len(p.shape) for p in pieces)) + " spots but the board has "
+                         + str(rows * cols))
+    return rows, cols, pieces
+
+##
+# @function     loadCatalog
+# @purpose      Reads the board size and pieces from a catalog file
+# @param        path - the file to read, None for the Kanoodle board and pieces
+# @return       the number of rows, the number of columns and the list of pieces
+def loadCatalog(path=None):
+    if(path is None):
+        return ROWS, COLS, makePieces()
+    with open(path) as f:
+        return parseCatalog(json.load(f))
+
+##
+# @function     startPosition
+# @purpose      Puts the starting pieces of a position on a new board
+# @param        position - the dictionary of piece color to the list of [row, column] spots it starts on
+# @param        pieces - the list of every piece
+# @param        table - the PlacementTable of every piece
+# @return       the Board and the list of pieces that still need to be added
+def startPosition(position, pieces, table):
+    if(not isinstance(position, dict)):
+        raise ValueError("a starting position must be an object of piece color to spots")
+    board = Board(table.rows, table.cols)
+    rows = table.rows
+    cols = table.cols
+    for color in position:
+        if(color not in table.placements):
+            raise ValueError("unknown piece " + repr(color))
+        cells = position[color]
+        # Checked before sorting, since spots that aren't numbers can't be sorted
+        if(not isinstance(cells, list) or not all(isinstance(c, list) and len(c) == 2 and isinstance(c[0], int)
+                                                  and isinstance(c[1], int) for c in cells)):
+            raise ValueError("the spots for piece " + color + " must be a list of [row, column]")
+        if(not all(0 <= r < rows and 0 <= c < cols for r, c in cells)):
+            raise ValueError("piece " + color + " is off the board")
+        shape = tuple(sorted((c[0], c[1]) for c in cells))
+
+        # Every legal position of every orientation is in the table, so anything else isn't the piece's shape
+        pl = table.byMask[color].get(table.maskOf(shape))
+        if(pl is None):
+            raise ValueError("the spots for piece " + color + " are not its shape")
+        if(not all(board.isEmptySpot(r, c) for r, c in shape)):
+            raise ValueError("piece " + color + " overlaps another piece")
+        board.apply(pl)
+    return board, [p for p in pieces if p.color not in position]
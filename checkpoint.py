@@ -0,0 +1,155 @@
+##
+# @file         Checkpoint.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Lets a long search be stopped, by a deadline or by cancelling it from another thread or a
+#               signal handler, and saves where it got to in a checkpoint file so it can be picked up again
+#               later, handing back exactly the solutions it hadn't handed back yet
+#
+#               Where the search got to is its frontier, which is one of
+#                 {"path": [[color, mask], ...], "after": False}  the placements on the stack, every
+#                             solution before them has been handed back and none under them has
+#                 {"path": [[color, mask], ...], "after": True}   the same, except the solution or
+#                             subtree at the end of the path is done too
+#                 {"part": i, "skip": j}  the parallel search, subproblems before i are done and the first j
+#                             solutions of subproblem i have been handed back
+#                 {"done": True}  the search finished
+
+# Imports
+import json, os, threading, time
+
+VERSION = 1
+
+class SearchStopped(Exception):
+
+    ##
+    # @function     init
+    # @purpose      SearchStopped constructor. Raised inside the search to unwind it when it has to stop
+    # @param        self - the SearchStopped instance
+    # @param        frontier - where the search stopped, see the top of the file
+    def __init__(self, frontier):
+        Exception.__init__(self, "the search was stopped")
+        self.frontier = frontier
+
+##
+# @function     readCheckpoint
+# @purpose      Reads a checkpoint file saved by a SearchControl
+# @param        path - the file to read
+# @return       the dictionary saved in it
+def readCheckpoint(path):
+    with open(path) as f:
+        state = json.load(f)
+    if(not isinstance(state, dict) or state.get("version") != VERSION or "frontier" not in state):
+        raise ValueError(path + " is not a checkpoint")
+    return state
+
+class SearchControl():
+
+    ##
+    # @function     init
+    # @purpose      SearchControl constructor. Handed to solve to stop the search and save checkpoints
+    # @param        self - the SearchControl instance
+    # @param        deadline - the most seconds to search for, None for no limit
+    # @param        checkpoint - the file to save checkpoints to, None to not save them
+    # @param        interval - the seconds between checkpoints
+    # @param        resume - a dictionary read by readCheckpoint to carry on from, or None to start from the beginning
+    # @param        flush - a function to call before each checkpoint is saved, so that every solution handed back
+    #               before it is really written out, or None
+    def __init__(self, deadline=None, checkpoint=None, interval=60.0, resume=None, flush=None):
+        self.deadline = None if deadline is None else time.monotonic() + deadline
+        self.checkpoint = checkpoint
+        self.interval = interval
+        self.resume = resume
+        self.flush = flush
+        self.stopping = threading.Event()
+        self.reason = None          # "deadline" or "cancelled" once the search has been told to stop
+        self.settings = None        # what the search is, set by begin
+        self.frontier = resume["frontier"] if resume else None
+        self.found = resume["found"] if resume else 0
+        self.calls = 0
+        self.nextSave = time.monotonic() + interval
+        self.saveDue = False        # True when it is time to save a checkpoint
+
+    ##
+    # @function     begin
+    # @purpose      Starts a search, making sure it is the same search as the checkpoint being carried on from
+    # @param        self - the SearchControl instance
+    # @param        settings - a dictionary of everything that changes the order solutions are found in
+    def begin(self, settings):
+        if(self.resume is not None and self.resume["settings"] != settings):
+            raise ValueError("the checkpoint is for a different search")
+        self.settings = settings
+
+    ##
+    # @function     cancel
+    # @purpose      Tells the search to stop, it is safe to call from another thread or a signal handler
+    # @param        self - the SearchControl instance
+    def cancel(self):
+        if(self.reason is None):
+            self.reason = "cancelled"
+        self.stopping.set()
+
+    ##
+    # @function     poll
+    # @purpose      Looks at the clock for the deadline and the next checkpoint
+    # @param        self - the SearchControl instance
+    # @return       True when the search has to stop
+    def poll(self):
+        now = time.monotonic()
+        if(self.deadline is not None and now >= self.deadline and self.reason is None):
+            self.reason = "deadline"
+            self.stopping.set()
+        if(self.checkpoint is not None and now >= self.nextSave):
+            self.saveDue = True
+        return self.stopping.is_set()
+
+    ##
+    # @function     check
+    # @purpose      Checks if the search has to stop, only looking at the clock every so often since it is
+    #               called for every placement
+    # @param        self - the SearchControl instance
+    # @return       True when the search has to stop
+    def check(self):
+        self.calls += 1
+        if(self.calls & 255 == 0):
+            return self.poll()
+        return self.stopping.is_set()
+
+    ##
+    # @function     passed
+    # @purpose      Moves the frontier past a solution as it is handed back. It is only saved once the search
+    #               is asked for the next one, by which time the solution has been taken
+    # @param        self - the SearchControl instance
+    # @param        frontier - the frontier just after the solution
+    def passed(self, frontier):
+        self.frontier = frontier
+        self.found += 1
+
+    ##
+    # @function     save
+    # @purpose      Saves a checkpoint, replacing the last one only once the new one is completely written
+    # @param        self - the SearchControl instance
+    # @param        frontier - where the search has got to, None for the last frontier passed
+    def save(self, frontier=None):
+        if(frontier is not None):
+            self.frontier = frontier
+        if(self.checkpoint is None or self.settings is None):
+            return
+        if(self.flush):
+            self.flush()
+        temp = self.checkpoint + ".tmp"
+        with open(temp, "w") as f:
+            json.dump({"version": VERSION, "settings": self.settings, "frontier": self.frontier,
+                       "found": self.found}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.checkpoint)
+        self.nextSave = time.monotonic() + self.interval
+        self.saveDue = False
+
+    ##
+    # @function     finished
+    # @purpose      Checks if the checkpoint being carried on from is of a search that already finished
+    # @param        self - the SearchControl instance
+    def finished(self):
+        return self.frontier is not None and self.frontier.get("done", False)
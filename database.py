@@ -0,0 +1,275 @@
+##
+# @file         Database.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Every solution from a base position (the empty board by default) found once and saved to a
+#               file, with an index from each placement to the bitmap of solutions that use it. Any starting
+#               position that includes the base pieces is then answered by ANDing a bitmap per starting piece
+#               instead of searching
+#
+#               File layout, all little endian:
+#                 header      "KNDB", version (H), rows (B), cols (B), pieces (B), base pieces (B),
+#                             solutions (I), bitmaps (I)
+#                 colors      one byte per piece, in the order the pieces are placed
+#                 counts      the number of placements of each piece in the table (H each)
+#                 base        the piece number (B) and placement number (H) of each base piece
+#                 solutions   the placement number of every piece (H each), for each solution
+#                 directory   the bitmap number of every placement of every piece (I each),
+#                             NONE when no solution uses the placement
+#                 bitmaps     one bit per solution, bit i of the little endian number is solution i
+
+# Imports
+import argparse, json, mmap, struct, sys
+from catalog import loadCatalog, startPosition
+from placements import PlacementTable
+from solver import Solver, solve
+
+MAGIC = b"KNDB"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBBBII")
+NONE = 0xFFFFFFFF
+
+##
+# @function     buildDatabase
+# @purpose      Finds every solution from a base position and writes them and their index to a file
+# @param        path - the file to write
+# @param        board - the Board holding the base pieces, an empty Board for every solution
+# @param        pieces - the list of every piece, in the order they are placed
+# @param        table - the PlacementTable of every piece
+# @param        engine - the engine to search with, see Solver
+# @param        order - the order to search in, see Solver
+# @param        workers - the number of processes to search with
+# @param        symmetry - True to only search one of each set of mirror image solutions
+# @return       the number of solutions written
+def buildDatabase(path, board, pieces, table, engine="bitboard", order="constrained", workers=1, symmetry=True):
+    colors = [p.color for p in pieces]
+    number = {}
+    for color in colors:
+        number[color] = {}
+        for i in range(len(table.placements[color])):
+            number[color][table.placements[color][i].mask] = i
+
+    # The base pieces are in every solution, they are listed after the header as well as in each solution's record
+    start = Solver(board, table)
+    base = []
+    for color in start.startCells:
+        if(color not in number):
+            raise ValueError("unknown piece " + repr(color))
+        base.append((colors.index(color), number[color][table.maskOf(start.startCells[color])]))
+    needsplace = [p for p in pieces if p.color not in start.startCells]
+
+    records = []
+    for s in solve(board, needsplace, table, engine, order, workers=workers, symmetry=symmetry, expand=True):
+        record = [0] * len(pieces)
+        for i, pl in base:
+            record[i] = pl
+        for pl in s.placements:
+            record[colors.index(pl.color)] = number[pl.color][pl.mask]
+        records.append(tuple(record))
+
+    # Sorted by placement number in piece order, which is the order the fixed order search finds them,
+    # so a query hands back solutions in the same order as searching for them would
+    records.sort()
+
+    # The solutions that use each placement, only for the placements some solution uses
+    uses = {}
+    for n in range(len(records)):
+        for i in range(len(pieces)):
+            key = (i, records[n][i])
+            if(key not in uses):
+                uses[key] = []
+            uses[key].append(n)
+    size = (len(records) + 7) // 8
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, table.rows, table.cols, len(pieces), len(base), len(records), len(uses)))
+        f.write("".join(colors).encode("ascii"))
+        f.write(struct.pack("<" + str(len(pieces)) + "H", *[len(table.placements[c]) for c in colors]))
+        for i, pl in base:
+            f.write(struct.pack("<BH", i, pl))
+        for record in records:
+            f.write(struct.pack("<" + str(len(pieces)) + "H", *record))
+
+        keys = sorted(uses)
+        where = {}
+        for k in range(len(keys)):
+            where[keys[k]] = k
+        for i in range(len(pieces)):
+            for pl in range(len(table.placements[colors[i]])):
+                f.write(struct.pack("<I", where.get((i, pl), NONE)))
+        for key in keys:
+            bitmap = bytearray(size)
+            for n in uses[key]:
+                bitmap[n >> 3] |= 1 << (n & 7)
+            f.write(bitmap)
+    return len(records)
+
+class SolutionDatabase():
+
+    ##
+    # @function     init
+    # @purpose      SolutionDatabase constructor. Memory maps a file written by buildDatabase
+    # @param        self - the SolutionDatabase instance
+    # @param        path - the file to open
+    # @param        pieces - the list of every piece, in the same order the database was built with
+    # @param        table - the PlacementTable of every piece
+    def __init__(self, path, pieces, table):
+        self.table = table
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, rows, cols, n, nbase, self.solutions, nbitmaps = HEADER.unpack_from(self.data, 0)
+        if(magic != MAGIC or version != VERSION):
+            raise ValueError(path + " is not a solution database")
+        at = HEADER.size
+        self.colors = self.data[at:at + n].decode("ascii")
+        at += n
+        counts = struct.unpack_from("<" + str(n) + "H", self.data, at)
+        at += 2 * n
+        if((rows, cols) != (table.rows, table.cols) or list(self.colors) != [p.color for p in pieces]
+           or list(counts) != [len(table.placements[c]) for c in self.colors]):
+            raise ValueError(path + " was built for a different board or set of pieces")
+
+        # Piece color to the placement number it has in every solution
+        self.base = {}
+        for k in range(nbase):
+            i, pl = struct.unpack_from("<BH", self.data, at)
+            self.base[self.colors[i]] = pl
+            at += 3
+
+        self.record = struct.Struct("<" + str(n) + "H")
+        self.solutionsAt = at
+        at += self.solutions * self.record.size
+
+        # Where the directory entries of each piece start
+        self.directory = {}
+        for i in range(n):
+            self.directory[self.colors[i]] = at
+            at += 4 * counts[i]
+        self.bitmapsAt = at
+        self.bitmapSize = (self.solutions + 7) // 8
+
+        # Piece color to the mask to placement number, to look up starting pieces
+        self.number = {}
+        for c in self.colors:
+            self.number[c] = {}
+            for i in range(len(table.placements[c])):
+                self.number[c][table.placements[c][i].mask] = i
+
+    ##
+    # @function     close
+    # @purpose      Unmaps the file
+    # @param        self - the SolutionDatabase instance
+    def close(self):
+        self.data.close()
+
+    ##
+    # @function     bitmap
+    # @purpose      Reads the bitmap of the solutions that use a placement
+    # @param        self - the SolutionDatabase instance
+    # @param        color - the piece's color
+    # @param        pl - the placement number
+    # @return       the bitmap as a number, bit i is set when solution i uses the placement
+    def bitmap(self, color, pl):
+        k = struct.unpack_from("<I", self.data, self.directory[color] + 4 * pl)[0]
+        if(k == NONE):
+            return 0
+        at = self.bitmapsAt + k * self.bitmapSize
+        return int.from_bytes(self.data[at:at + self.bitmapSize], "little")
+
+    ##
+    # @function     lookup
+    # @purpose      Finds the solutions that have every starting piece of a board where it is
+    # @param        self - the SolutionDatabase instance
+    # @param        board - the Board holding the starting pieces, which has to include the base pieces
+    # @return       the bitmap of the matching solutions
+    def lookup(self, board):
+        startCells = {}
+        for r in range(len(board.board)):
+            for c in range(len(board.board[r])):
+                if(not board.isEmptySpot(r, c)):
+                    startCells[board.board[r][c]] = startCells.get(board.board[r][c], ()) + ((r, c),)
+
+        found = (1 << self.solutions) - 1
+        for color in startCells:
+            if(color not in self.number):
+                raise ValueError("unknown piece " + repr(color))
+            pl = self.number[color].get(self.table.maskOf(startCells[color]))
+            if(color in self.base):
+                # Every solution has the base piece where it is, so this only needs checking
+                if(pl != self.base[color]):
+                    raise ValueError("the database only has solutions with piece " + color + " where it started")
+            elif(pl is None):
+                return 0
+            else:
+                found &= self.bitmap(color, pl)
+        for color in self.base:
+            if(color not in startCells):
+                raise ValueError("the database only has solutions with piece " + color + " on the board")
+        return found
+
+    ##
+    # @function     count
+    # @purpose      Counts the solutions for a starting position
+    # @param        self - the SolutionDatabase instance
+    # @param        board - the Board holding the starting pieces
+    # @return       the number of solutions
+    def count(self, board):
+        return self.lookup(board).bit_count()
+
+    ##
+    # @function     solve
+    # @purpose      Reads the solutions for a starting position
+    # @param        self - the SolutionDatabase instance
+    # @param        board - the Board holding the starting pieces
+    # @param        limit - the most solutions to read, None for all of them
+    # @return       a generator of Solutions, in the order the fixed order search finds them
+    def solve(self, board, limit=None):
+        found = self.lookup(board)
+        start = Solver(board, self.table)
+        while(found and (limit is None or limit > 0)):
+            n = (found & -found).bit_length() - 1
+            found &= found - 1
+            record = self.record.unpack_from(self.data, self.solutionsAt + n * self.record.size)
+            yield start.solution([self.table.placements[self.colors[i]][record[i]] for i in range(len(record))
+                                  if self.colors[i] not in start.startCells])
+            if(limit is not None):
+                limit -= 1
+
+##
+# @function     Main
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Builds the database of every Kanoodle solution")
+    parser.add_argument("output", help="the file to write the database to")
+    parser.add_argument("--start", default="{}",
+                        help="a JSON object of piece color to [row, column] spots for pieces every solution "
+                        "in the database starts with (default {}, every solution)")
+    parser.add_argument("--engine", choices=["grid", "bitboard", "dlx"], default="bitboard",
+                        help="the engine to search with, see main.py (default bitboard)")
+    parser.add_argument("--order", choices=["fixed", "cell", "constrained", "piece"], default="constrained",
+                        help="the order to search in, see main.py (default constrained)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="the number of processes to search with, 0 for one per core (default 0)")
+    parser.add_argument("--no-symmetry", action="store_true",
+                        help="search every solution instead of making the mirror images from one of each")
+    parser.add_argument("--catalog", default=None,
+                        help="read the board size and pieces from this JSON file, see catalog.py. The database can "
+                        "only be used with the same catalog")
+    args = parser.parse_args()
+    if(args.order != "fixed" and args.engine != "bitboard"):
+        parser.error("--order " + args.order + " needs --engine bitboard")
+    if(args.workers != 1 and args.engine == "dlx"):
+        parser.error("--engine dlx can only use one worker")
+
+    try:
+        rows, cols, pieces = loadCatalog(args.catalog)
+    except (OSError, ValueError) as e:
+        parser.error("--catalog: " + str(e))
+    table = PlacementTable(pieces, rows, cols)
+    try:
+        board = startPosition(json.loads(args.start), pieces, table)[0]
+    except ValueError as e:
+        parser.error("--start: " + str(e))
+    print(buildDatabase(args.output, board, pieces, table, args.engine, args.order, args.workers,
+                        not args.no_symmetry), "solutions written to", args.output, file=sys.stderr)
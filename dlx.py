@@ -0,0 +1,205 @@
+##
+# @file         DLX.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Knuth's Dancing Links (Algorithm X). Kanoodle is an exact cover problem:
+#               every open spot and every unplaced piece must be covered exactly once
+
+class DancingLinks():
+
+    ##
+    # @function     init
+    # @purpose      DancingLinks constructor. Creates a matrix with no rows
+    # @param        self - the DancingLinks instance
+    # @param        columns - the number of columns that must each be covered exactly once
+    def __init__(self, columns):
+        # Node 0 is the root and nodes 1 to columns are the column headers.
+        # Every node is an index into these lists instead of an object to keep the links cheap
+        self.columns = columns
+        self.L = [i - 1 for i in range(columns + 1)]
+        self.R = [i + 1 for i in range(columns + 1)]
+        self.L[0] = columns
+        self.R[columns] = 0
+        self.U = list(range(columns + 1))
+        self.D = list(range(columns + 1))
+        self.C = list(range(columns + 1))
+        self.S = [0] * (columns + 1)
+        self.rowOf = [None] * (columns + 1)
+
+    ##
+    # @function     addRow
+    # @purpose      Adds a row to the bottom of the matrix
+    # @param        self - the DancingLinks instance
+    # @param        row - the value to return in a solution when this row is chosen
+    # @param        cols - the columns (0 based) this row covers
+    def addRow(self, row, cols):
+        first = None
+        for c in cols:
+            h = c + 1
+            n = len(self.C)
+            self.C.append(h)
+            self.rowOf.append(row)
+
+            # Link in to the bottom of the column
+            self.U.append(self.U[h])
+            self.D.append(h)
+            self.D[self.U[h]] = n
+            self.U[h] = n
+            self.S[h] += 1
+
+            # Link in to the end of the row
+            if(first is None):
+                first = n
+                self.L.append(n)
+                self.R.append(n)
+            else:
+                self.L.append(self.L[first])
+                self.R.append(first)
+                self.R[self.L[first]] = n
+                self.L[first] = n
+
+    ##
+    # @function     cover
+    # @purpose      Removes a column and every row that covers it from the matrix
+    # @param        self - the DancingLinks instance
+    # @param        c - the column header to cover
+    def cover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        L[R[c]] = L[c]
+        R[L[c]] = R[c]
+        i = D[c]
+        while(i != c):
+            j = R[i]
+            while(j != i):
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    ##
+    # @function     uncover
+    # @purpose      Puts a covered column back, in exactly the reverse order it was removed
+    # @param        self - the DancingLinks instance
+    # @param        c - the column header to uncover
+    def uncover(self, c):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while(i != c):
+            j = L[i]
+            while(j != i):
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        L[R[c]] = c
+        R[L[c]] = c
+
+    ##
+    # @function     search
+    # @purpose      Finds every set of rows that covers each column exactly once
+    # @param        self - the DancingLinks instance
+    # @param        chosen - the nodes of the rows chosen so far, only passed by the recursion
+    # @return       a generator of solutions, each solution is the list of chosen rows
+    def search(self, chosen=None):
+        if(chosen is None):
+            chosen = []
+        R, D, S = self.R, self.D, self.S
+
+        # Every column is covered, this is a solution
+        if(R[0] == 0):
+            yield [self.rowOf[n] for n in chosen]
+            return
+
+        # Branch on the column with the fewest rows left
+        c = R[0]
+        j = R[c]
+        while(j != 0):
+            if(S[j] < S[c]):
+                c = j
+            j = R[j]
+        if(S[c] == 0):
+            return
+
+        self.cover(c)
+        r = D[c]
+        while(r != c):
+            chosen.append(r)
+            j = self.R[r]
+            while(j != r):
+                self.cover(self.C[j])
+                j = self.R[j]
+
+            yield from self.search(chosen)
+
+            j = self.L[r]
+            while(j != r):
+                self.uncover(self.C[j])
+                j = self.L[j]
+            chosen.pop()
+            r = D[r]
+        self.uncover(c)
+
+    ##
+    # @function     count
+    # @purpose      Counts the sets of rows that cover each column exactly once, without building them
+    # @param        self - the DancingLinks instance
+    # @param        tally - a function to call with each row and the number of solutions it is part of, or None
+    # @return       the number of solutions
+    def count(self, tally=None):
+        R, D, S = self.R, self.D, self.S
+        if(R[0] == 0):
+            return 1
+
+        c = R[0]
+        j = R[c]
+        while(j != 0):
+            if(S[j] < S[c]):
+                c = j
+            j = R[j]
+        if(S[c] == 0):
+            return 0
+
+        total = 0
+        self.cover(c)
+        r = D[c]
+        while(r != c):
+            j = self.R[r]
+            while(j != r):
+                self.cover(self.C[j])
+                j = self.R[j]
+
+            n = self.count(tally)
+            if(n and tally):
+                tally(self.rowOf[r], n)
+            total += n
+
+            j = self.L[r]
+            while(j != r):
+                self.uncover(self.C[j])
+                j = self.L[j]
+            r = D[r]
+        self.uncover(c)
+        return total
+
+##
+# @function     fromBoard
+# @purpose      Builds the exact cover matrix for the pieces left to place on a board
+# @param        bits - the BitBoard holding the starting pieces
+# @param        pieces - the list of pieces that still need to be added
+# @param        table - the PlacementTable of every piece
+# @return       the DancingLinks matrix, whose rows are the placements
+def fromBoard(bits, pieces, table):
+    # One column per remaining piece followed by one column per open spot
+    spots = [i for i in range(bits.rows * bits.cols) if not (bits.filled >> i) & 1]
+    spotCol = {}
+    for s in spots:
+        spotCol[s] = len(pieces) + len(spotCol)
+    links = DancingLinks(len(pieces) + len(spots))
+
+    for i in range(len(pieces)):
+        for pl in table.placements[pieces[i].color]:
+            if(bits.fits(pl.mask)):
+                links.addRow(pl, [i] + [spotCol[c[0] * bits.cols + c[1]] for c in pl.shape])
+    return links
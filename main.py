@@ -1,119 +1,247 @@
-##
-# @mainpage     Kanoodle Solver
-# @author       Daniel Epstein
-# @date         August 20, 2023
-# @purpose      The game Kanoodle consists of placing colored pieces 
-#               on a rectangular board. This takes the starting position
-#               and finds all viable solutions (if one exists).               
-
-# Imports
-from board import Board
-from piece import Piece
-from menu import Menu
-
-##
-# @function     startPiece
-# @purpose      Starts a piece on the board
-# @param        board - the board to put the pieces on
-# @param        p - the piece to start
-# @param        coords - the starting coordinate of the piece p
-def startPiece(board, p, coords):
-
-    # Move to starting position
-    p.shape = coords.copy()
-    board.placePiece(p)
-
-    # Remove the pieces spaces from the open list
-    for c in p.shape:
-        board.opens.remove(c)
-    
-
-##
-# @function     tryPlace
-# @purpose      Recursively places all the pieces on the board in every avaliable viable position
-# @param        pieces - the list of pieces that still need to be added
-# @param        opens - the list of open spots remaining on the board
-def tryPlace(pieces, opens):
-
-    # Next piece to place is the first piece in pieces
-    p = pieces[0]
-
-    # For each orientation
-    for j in range(p.flips):
-        for i in range(p.rots):
-
-            # Copy the opens to a local copy for the current piece
-            pc = opens.copy()
-            for c in pc:
-
-                # For each open spot, 
-                # 1 - move to the open spot,
-                # 2 - if that is a valid placement, place the piece, then tryPlace next piece
-                # 3 - remove the piece and try next spot
-
-                # Move to open and check placement
-                p.moveToOpen(c)
-                if(board.isValidPlacement(p)):
-                    board.placePiece(p)
-                    #If there are more pieces to place, place the next piece
-                    if(len(pieces) > 1):
-                        # Copy the open spaces minus the spaces being taken up by the current piece
-                        temp = opens.copy()
-                        for t in p.shape:
-                            temp.remove(t)
-                        # Place the next piece
-                        tryPlace(pieces[1:], temp)
-                    else:
-                        # Placed the last piece! Print the board
-                        print(board)
-
-                    # There aren't anymore solutions with this current placement, remove piece and try next                
-                    board.removePiece(p)
-
-            # Rotate the piece to try that solution
-            p.rotate90()
-        # Flip the piece to try that solution
-        p.flip()
-
-##
-# @function     Main
-if __name__ == "__main__":
-
-    # The game board
-    board = Board() 
-
-    # Initialize each piece, starting at [-1, -1]
-    # Pieces must start off the board, so that they can be moved to any position on the board 
-    purple = Piece('P', [[-1, -1], [0, -1], [1, -1], [2, -1]], 2, 1)
-    red = Piece('R', [[-1, -1], [0, -1], [1, -1], [-1, 0], [0, 0]], 4, 2)
-    lightpink = Piece('p', [[-1, -1], [-1, 0], [-1, 1], [0, 1], [-1, 2]], 4, 2)
-    white = Piece('W', [[-1, -1], [-1, 0], [0, -1]], 4, 1)
-    lightgreen = Piece('g', [[-1, -1], [0, -1], [-1, 0], [0, 0]], 1, 1)
-    lightblue = Piece('b', [[-1, -1], [0, -1], [1, -1], [1, 0], [1, 1]], 4, 1)
-    blue = Piece('B', [[-1, -1], [0, -1], [0, 0], [0, 1], [0, 2]], 4, 2)
-    silver = Piece('+', [[-1, -1], [-2, -1], [-1, -2], [-1, 0], [0, -1]], 1, 1)
-    yellow = Piece('Y', [[-1, -1], [0, -1], [1, -1], [1, 0], [-1, 0]], 4, 1)
-    green = Piece('G', [[-1, -1], [-1, 0], [-1, 1], [0, 1], [0, 2]], 4, 2)
-    pink = Piece('M', [[-1, -1], [0, -1], [0, 0], [1, 0], [1, 1]], 4, 1)
-    orange = Piece('O', [[-1, -1], [0, -1], [0, 0], [0, 1]], 4, 2)
-
-    # Pieces arranged in order of size to place the larger pieces first
-    pieces = [silver, yellow, pink, green, lightpink, lightblue, red, blue, lightgreen, orange, purple, white]
-    # silver, yellow, pink, green, lightpink, lightblue, red, blue, lightgreen, orange, purple, white
-
-
-    # Start the Menu
-    menu = Menu(pieces)
-    starters = menu.run()
-    menu.clear_screen()
-
-    # Start all the pieces returned and then remove them from the pieces list
-    removals = []
-    for s in starters:
-        startPiece(board, pieces[s.index], s.piece.shape)
-        removals += [s.index]
-    
-    # Place all the remaining pieces!
-    needsplace = [pieces[i] for i in range(len(pieces)) if i not in removals]
-    tryPlace(needsplace, board.opens)
-        
\ No newline at end of file
+##
+# @mainpage     Kanoodle Solver
+# @author       Daniel Epstein
+# @date         August 20, 2023
+# @purpose      The game Kanoodle consists of placing colored pieces 
+#               on a rectangular board. This takes the starting position
+#               and finds all viable solutions (if one exists).               
+
+# Imports
+import argparse, contextlib, signal, sys
+from board import Board
+from catalog import loadCatalog, startPosition
+from checkpoint import SearchControl, readCheckpoint
+from database import SolutionDatabase
+from menu import Menu
+from output import FORMATS, SolutionWriter
+from cache import TranspositionCache
+from placements import PlacementTable
+from progress import ProgressReporter, estimate
+from regions import PruneStats
+from solver import solve, count, uniqueness
+from stats import Profiler, SolverStats
+import vectorized
+
+##
+# @function     startPiece
+# @purpose      Starts a piece on the board
+# @param        board - the board to put the pieces on
+# @param        p - the piece to start
+# @param        coords - the starting coordinate of the piece p
+def startPiece(board, p, coords):
+
+    # Move to starting position
+    board.apply(p.withShape(coords))
+
+
+##
+# @function     Main
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Finds every solution to a Kanoodle starting position")
+    parser.add_argument("--engine", choices=["grid", "bitboard", "numpy", "dlx"], default="bitboard",
+                        help="grid searches on the character board, bitboard searches on a single integer (default), "
+                        "numpy searches on the bitboard with NumPy finding the placements that fit, and the menu finds "
+                        "where pieces can go with it too, dlx solves it as an exact cover problem with Dancing Links")
+    parser.add_argument("--order", choices=["fixed", "cell", "constrained", "piece"], default="fixed",
+                        help="fixed places the pieces in a set order (default), cell fills the first open spot "
+                        "with any remaining piece, constrained fills the open spot with the fewest open neighbours, "
+                        "piece places the remaining piece with the fewest placements that still fit "
+                        "(cell, constrained and piece need the bitboard engine)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="the number of processes to solve with, 0 for one per core (default 1)")
+    parser.add_argument("--split-depth", type=int, default=2,
+                        help="the number of placements to make before handing the search to the workers (default 2)")
+    parser.add_argument("--chunksize", type=int, default=1,
+                        help="the number of subproblems to send a worker at a time (default 1)")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="stop after printing this many solutions")
+    parser.add_argument("--count", action="store_true",
+                        help="only print the number of solutions, which is much faster than printing them")
+    parser.add_argument("--unique", action="store_true",
+                        help="only print if there are 0, 1 or many solutions, stopping at the second solution")
+    parser.add_argument("--breakdown", action="store_true",
+                        help="with --count, also print how many solutions each placement of each piece is part of")
+    parser.add_argument("--symmetry", action="store_true",
+                        help="when the starting pieces look the same mirrored or turned around, only search one of "
+                        "each set of mirror image solutions and make the rest from it. With --order fixed the "
+                        "solutions come in the usual order but are all found before the first is printed, any other "
+                        "order or engine prints each one followed by its mirror images as they are found")
+    parser.add_argument("--no-expand", action="store_true",
+                        help="with --symmetry, only print one solution out of each set of mirror images")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="remember the solution count or dead end of up to this many filled boards, "
+                        "each one takes a few hundred bytes (default 0, no cache, bitboard engine only)")
+    parser.add_argument("--cache-stats", action="store_true",
+                        help="print the cache hits, misses and evictions when done")
+    parser.add_argument("--database", default=None,
+                        help="answer from a solution database written by database.py instead of searching")
+    parser.add_argument("--solver-stats", choices=["text", "json"], default=None,
+                        help="print the placements tried, rejected and made at each depth and for each piece, "
+                        "and the time spent checking placements, as a text table or JSON")
+    parser.add_argument("--profile", choices=["cprofile", "sample"], default=None,
+                        help="profile the search with cProfile, or by sampling what is running every 5 milliseconds")
+    parser.add_argument("--format", choices=FORMATS, default="grid",
+                        help="grid prints each solution as the colored board (default), line as one line of "
+                        "characters, binary as 4 bits per spot numbered by the order the pieces are placed in, "
+                        "see output.py")
+    parser.add_argument("--buffer-size", type=int, default=1 << 16,
+                        help="the number of bytes of solutions to save up before writing them (default 65536)")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="stop searching after this many seconds, saving a checkpoint if there is one")
+    parser.add_argument("--checkpoint", default=None,
+                        help="save where the search got to in this file every so often and when it stops, "
+                        "so it can be carried on with --resume")
+    parser.add_argument("--checkpoint-interval", type=float, default=60,
+                        help="the seconds between checkpoints (default 60)")
+    parser.add_argument("--resume", default=None,
+                        help="carry on the search saved in this checkpoint file instead of starting a new one from "
+                        "the menu, only handing back the solutions it hadn't yet. The checkpoint keeps being saved to "
+                        "the same file unless --checkpoint says otherwise")
+    parser.add_argument("--catalog", default=None,
+                        help="read the board size and pieces from this JSON file instead of using the Kanoodle ones, "
+                        "see catalog.py. A checkpoint has to be resumed with the same catalog")
+    parser.add_argument("--prune-stats", action="store_true",
+                        help="print how many placements the empty region check rejected when done")
+    parser.add_argument("--estimate", action="store_true",
+                        help="instead of searching, guess how many placements the search would make, how many "
+                        "solutions it would find from random walks down the search, and how long it would take from "
+                        "running it for half a second")
+    parser.add_argument("--probes", type=int, default=200,
+                        help="the number of random walks for --estimate, more is slower and closer (default 200)")
+    parser.add_argument("--progress", type=float, default=None,
+                        help="print how far the search has got to stderr every this many seconds: the branches of "
+                        "the first placement finished, placements a second and the time left")
+    args = parser.parse_args()
+    if(args.order != "fixed" and args.engine != "bitboard"):
+        parser.error("--order " + args.order + " needs --engine bitboard")
+    if(args.split_depth < 1):
+        parser.error("--split-depth has to be at least 1")
+    if(args.workers != 1 and args.engine == "dlx"):
+        parser.error("--engine dlx can only use one worker")
+    if(args.engine == "numpy" and not vectorized.AVAILABLE):
+        parser.error("--engine numpy needs numpy installed")
+    if(args.estimate and (args.database or args.engine == "dlx")):
+        parser.error("--estimate can't be used with --database or --engine dlx")
+    if(args.probes < 1):
+        parser.error("--probes has to be at least 1")
+    if(args.progress is not None and (args.unique or args.database or args.engine == "dlx")):
+        parser.error("--progress can't be used with --unique, --database or --engine dlx")
+    if(args.unique and (args.count or args.breakdown)):
+        parser.error("--unique can't be used with --count or --breakdown")
+    if(args.database and args.breakdown):
+        parser.error("--breakdown can't be answered from --database")
+    if((args.deadline is not None or args.checkpoint or args.resume) and (args.count or args.unique or args.database)):
+        parser.error("--deadline, --checkpoint and --resume only work when searching for solutions")
+    try:
+        rows, cols, pieces = loadCatalog(args.catalog)
+    except (OSError, ValueError) as e:
+        parser.error("--catalog: " + str(e))
+    if(args.format == "binary" and len(pieces) > 15):
+        parser.error("--format binary can only number 15 pieces")
+    resume = None
+    if(args.resume):
+        try:
+            resume = readCheckpoint(args.resume)
+        except (OSError, ValueError) as e:
+            parser.error("--resume: " + str(e))
+    stats = PruneStats() if args.prune_stats else None
+    cache = TranspositionCache(args.cache_size) if args.cache_size > 0 else None
+    solverStats = SolverStats() if args.solver_stats else None
+    progress = ProgressReporter(args.progress) if args.progress is not None else None
+
+    # The game board
+    board = Board(rows, cols)
+
+    # Every piece, in the order they are placed
+    colors = [p.color for p in pieces]
+
+    # Every orientation and position of every piece, found once
+    table = PlacementTable(pieces, rows, cols)
+
+    if(resume):
+        # The checkpoint has the starting pieces, so there is no need for the Menu
+        try:
+            board, needsplace = startPosition(resume["settings"]["start"], pieces, table)
+        except ValueError as e:
+            sys.exit(args.resume + ": " + str(e))
+    else:
+        # Start the Menu
+        menu = Menu(pieces, table, args.engine == "numpy")
+        starters = menu.run()
+        menu.clear_screen()
+
+        # Start all the pieces returned and then remove them from the pieces list
+        removals = []
+        for s in starters:
+            startPiece(board, pieces[s.index], s.piece.shape)
+            removals += [s.index]
+
+        # Place all the remaining pieces!
+        needsplace = [pieces[i] for i in range(len(pieces)) if i not in removals]
+
+    # A stopped search saves its checkpoint on the way out, so being told to quit stops it instead of killing it
+    control = None
+    if(args.deadline is not None or args.checkpoint or resume):
+        control = SearchControl(args.deadline, args.checkpoint or args.resume, args.checkpoint_interval, resume)
+        signal.signal(signal.SIGTERM, lambda signum, frame: control.cancel())
+        signal.signal(signal.SIGINT, lambda signum, frame: control.cancel())
+
+    # Only profile when asked, since tracing every call slows the search down a lot
+    profiler = Profiler(args.profile) if args.profile else contextlib.nullcontext()
+    with profiler:
+        if(args.database):
+            # Every solution is already in the database, so there is nothing to search
+            db = SolutionDatabase(args.database, pieces, table)
+            try:
+                if(args.count):
+                    print(db.count(board))
+                elif(args.unique):
+                    n = db.count(board)
+                    print("many" if n > 1 else n)
+                else:
+                    with SolutionWriter(sys.stdout.buffer, args.format, colors, args.buffer_size) as writer:
+                        for s in db.solve(board, args.limit):
+                            writer.write(s)
+            except ValueError as e:
+                sys.exit(str(e))
+            finally:
+                db.close()
+        elif(args.estimate):
+            print(estimate(board, needsplace, table, args.engine, args.order, args.probes))
+        elif(args.unique):
+            print(uniqueness(board, needsplace, table, args.engine, args.order, args.workers, args.split_depth,
+                             cache, solverStats))
+        elif(args.count):
+            breakdown = {} if args.breakdown else None
+            print(count(board, needsplace, table, args.engine, args.order, stats, breakdown,
+                        args.workers, args.split_depth, args.chunksize, args.symmetry, cache, solverStats,
+                        progress))
+            if(breakdown):
+                for key in sorted(breakdown, key=lambda k: (k[0], -breakdown[k], k[1])):
+                    print(key[0], " ".join(str(list(c)) for c in key[1]) + ":", breakdown[key])
+        else:
+            with SolutionWriter(sys.stdout.buffer, args.format, colors, args.buffer_size) as writer:
+                if(control):
+                    # Every solution before a checkpoint has to be written out before it is saved
+                    control.flush = writer.flush
+                try:
+                    for s in solve(board, needsplace, table, args.engine, args.order, args.limit, stats=stats,
+                                   workers=args.workers, depth=args.split_depth, chunksize=args.chunksize,
+                                   symmetry=args.symmetry, expand=not args.no_expand, cache=cache,
+                                   solverStats=solverStats, control=control, progress=progress):
+                        writer.write(s)
+                except ValueError as e:
+                    sys.exit(str(e))
+
+    if(stats):
+        print(stats, file=sys.stderr)
+    if(cache and args.cache_stats):
+        print(cache.stats, file=sys.stderr)
+    if(solverStats):
+        print(solverStats.toJSON() if args.solver_stats == "json" else solverStats, file=sys.stderr)
+    if(args.profile):
+        print(profiler.report(), file=sys.stderr)
+    if(control and control.reason):
+        sys.exit("search stopped: " + control.reason + (", carry on with --resume " + control.checkpoint
+                                                        if control.checkpoint else ""))
@@ -1,339 +1,490 @@
-##
-# @file         Menu.py
-# @author       Daniel Epstein
-# @date         September 1, 2023
-# @purpose      A class that represents the UI for the Kanoodle Solver
-
-# Imports
-from board import Board
-from piece import Piece
-import os, keyboard
-import copy
-
-# Keyboard Options for selecting a piece
-pieceOptions = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=']
-
-# Class that holds the return information for the pieces that the user is starting with
-class Starter:
-    def __init__(self, piece, index):
-        self.piece = piece
-        self.index = index
-    
-class Menu:
-    def __init__(self, pieces):
-        self.board = Board()
-        self.pieces = pieces
-        self.starters = []
-
-    ##
-    # @function     clear_screen
-    # @purpose      Clears the console
-    def clear_screen(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
-
-    ##
-    # @function     print
-    # @purpose      prints the menu
-    def print(self):
-        self.clear_screen()
-        print(self.board)
-        print("Options:")
-        print("[P] - New Piece")
-        print("[F] - Flip Piece")
-        print("[R] - Rotate Piece")
-        print("[D] - Delete Piece")
-        print()
-        print("[UP] - Move Piece Up")
-        print("[LEFT] - Move Piece Left")
-        print("[DOWN] - Move Piece Down")
-        print("[RIGHT] - Move Piece Right")
-        print()
-        print("[Q] - Solve")
-        print()
-
-    # @function     printPieces
-    # @purpose      prints the pieces menu
-    # @param        pieces - the list of pieces to print
-    def printPieces(self, pieces):
-        c = 0
-        for p in pieces:
-            option = ""
-            s = ""
-            match p.color:
-                case 'P':   
-                    s="\033[0;35m"
-                    option="Purple"
-                case 'R':
-                    s="\033[0;31m"
-                    option="Red"
-                case '+':
-                    s="\033[0;37m"
-                    option="Silver"
-                case 'W':
-                    s="\033[1;37m"
-                    option="White"
-                case 'p':
-                    s="\033[1m"
-                    option="Light Pink"
-                case 'b':
-                    s="\033[1;34m"
-                    option="Light Blue"
-                case 'B':
-                    s="\033[0;34m"
-                    option="Blue"
-                case 'g':
-                    s="\033[1;32m"
-                    option="Light Green"
-                case 'G':
-                    s="\033[0;32m"
-                    option="Green"
-                case 'Y':
-                    s="\033[1;33m"
-                    option="Yellow"
-                case 'O':
-                    s="\033[0;31m"
-                    option="Orange"
-                case 'M':
-                    s="\033[1;35m"
-                    option="Magenta"
-                case _:
-                    s="\033[1;30m"
-            print("[", pieceOptions[c], "] - " + s + option + "\033[0m")
-            c += 1
-    
-    # @function     selectPiece
-    # @purpose      adds a hotkey for each selectable piece
-    def selectPiece(self):
-        self.clear_screen()
-        self.printPieces(self.pieces)
-        for key in pieceOptions:
-            keyboard.add_hotkey(key, lambda key=key: self.addPiece(copy.deepcopy(self.pieces[pieceOptions.index(key)]), pieceOptions.index(key)))
-    
-    # @function     addPiece
-    # @purpose      Adds a selected piece to the next open spot on the board
-    # @param        p - the piece to add
-    # @param        i - the index of the piece in pieces
-    def addPiece(self, p, i):
-        s = Starter(p, i)
-        self.starters = [s] + self.starters
-        opens = self.board.opens.copy()
-        index = 0
-        rots = 0
-        flips = 0
-        while(True):
-            self.starters[0].piece.moveToOpen(opens[index])
-            if(self.board.isValidPlacement(self.starters[0].piece)):
-                break
-            index += 1
-
-            if(index == len(opens)):
-                if(rots != self.starters[0].piece.rots):
-                    self.starters[0].piece.rotate90()
-                    rots+=1
-                elif(flips != self.starters[0].piece.flips):
-                    rots = 0
-                    self.starters[0].piece.flip()
-                    flips+=1
-                else:
-                    break
-                index = 0
-                self.starters[0].piece.moveToOpen([-1, -1])
-                opens = self.board.opens.copy()
-
-        
-        if(self.board.isValidPlacement(self.starters[0].piece)):
-            self.board.placePiece(self.starters[0].piece)
-            for c in self.starters[0].piece.shape:
-                self.board.opens.remove(c)
-        else:
-            self.starters.pop(0)
-            self.board.opens.sort()
-        
-        for key in pieceOptions:
-            keyboard.remove_hotkey(key)
-
-        self.clear_screen()
-        self.print()
-
-    # @function     removeLastPiece
-    # @purpose      removes the last piece added to the board
-    def removeLastPiece(self):
-        if(len(self.starters) <= 0): return
-        lp = self.starters[0].piece
-        self.board.removePiece(lp)
-        for c in lp.shape:
-            self.board.opens.append(c)
-        self.board.opens.sort()
-        self.starters.pop(0)
-        self.print()
-
-    # @function     moveLeft
-    # @purpose      moves the last piece added to the board left
-    def moveLeft(self):
-        if(len(self.starters) <= 0): return
-        p = self.starters[0].piece
-        self.board.removePiece(p)
-        for c in p.shape:
-            if(c not in self.board.opens): self.board.opens.append(c)
-        self.board.opens.sort()
-        opts = self.board.opens.copy()
-        nmi = opts.index(p.shape[0])
-        while(True):
-            x = copy.deepcopy(p)
-            nmi -= 1
-            if(nmi < 0): nmi = len(opts) - 1
-            x.moveToOpen(opts[nmi])
-            if(self.board.isValidPlacement(x)):
-                p.shape = x.shape.copy()
-                p.moveToOpen(opts[nmi])
-                self.board.placePiece(p)
-                for c in p.shape:
-                    self.board.opens.remove(c)
-                break
-        self.print()
-
-    # @function     moveRight
-    # @purpose      moves the last piece added to the board right
-    def moveRight(self):
-        if(len(self.starters) <= 0): return
-        p = self.starters[0].piece
-        self.board.removePiece(p)
-        for c in p.shape:
-            if(c not in self.board.opens): self.board.opens.append(c)
-        self.board.opens.sort()
-        opts = self.board.opens.copy()
-        nmi = opts.index(p.shape[0])
-        while(True):
-            x = copy.deepcopy(p)
-            nmi += 1
-            if(nmi >= len(opts)): nmi = 0
-            x.moveToOpen(opts[nmi])
-            if(self.board.isValidPlacement(x)):
-                p.shape = x.shape.copy()
-                p.moveToOpen(opts[nmi])
-                self.board.placePiece(p)
-                for c in p.shape:
-                    self.board.opens.remove(c)
-                break
-        self.print()
-
-    # @function     moveDown
-    # @purpose      moves the last piece added to the board down 
-    def moveDown(self):
-        if(len(self.starters) <= 0): return
-        p = self.starters[0].piece
-        self.board.removePiece(p)
-        for c in p.shape:
-            if(c not in self.board.opens): self.board.opens.append(c)
-        self.board.opens.sort()
-        x = copy.deepcopy(p)
-        while(True):
-            nm = [0, x.shape[0][1]] if (x.shape[0][0] + 1 )> 4  else [x.shape[0][0] + 1, x.shape[0][1]]
-            x.moveToOpen(nm)
-            if(nm == p.shape[0]):
-                break
-            if(self.board.isValidPlacement(x)):
-                p.shape = x.shape.copy()
-                p.moveToOpen(nm)
-                self.board.placePiece(p)
-                for c in p.shape:
-                    self.board.opens.remove(c)
-                break
-        self.print()
-
-    # @function     moveUp
-    # @purpose      moves the last piece added to the board left
-    def moveUp(self):
-        if(len(self.starters) <= 0): return
-        p = self.starters[0].piece
-        self.board.removePiece(p)
-        for c in p.shape:
-            if(c not in self.board.opens): self.board.opens.append(c)
-        self.board.opens.sort()
-        x = copy.deepcopy(p)
-        while(True):
-            nm = [4, x.shape[0][1]] if (x.shape[0][0] - 1 ) < 0  else [x.shape[0][0] - 1, x.shape[0][1]]
-            x.moveToOpen(nm)
-            if(nm == p.shape[0]):
-                break
-            if(self.board.isValidPlacement(x)):
-                p.shape = x.shape.copy()
-                p.moveToOpen(nm)
-                self.board.placePiece(p)
-                for c in p.shape:
-                    self.board.opens.remove(c)
-                break
-        self.print()
-
-    # @function     rotateLast
-    # @purpose      rotates the last piece added to the board 90 degrees
-    def rotateLast(self):
-        if(len(self.starters) <= 0): return
-        p = self.starters[0].piece
-        self.board.removePiece(p)
-        for c in p.shape:
-            if(c not in self.board.opens): self.board.opens.append(c)
-        self.board.opens.sort()
-        opts = self.board.opens.copy()
-        nmi = 0
-        x = copy.deepcopy(p)
-        x.rotate90()
-        while(True):
-            x.moveToOpen(opts[nmi])
-            if(self.board.isValidPlacement(x)):
-                p.shape = x.shape.copy()
-                p.moveToOpen(opts[nmi])
-                self.board.placePiece(p)
-                for c in p.shape:
-                    self.board.opens.remove(c)
-                break
-            nmi += 1
-        self.print()
-    
-    # @function     flipLast
-    # @purpose      flips the last piece added to the board
-    def flipLast(self):
-        if(len(self.starters) <= 0): return
-        p = self.starters[0].piece
-        self.board.removePiece(p)
-        for c in p.shape:
-            if(c not in self.board.opens): self.board.opens.append(c)
-        self.board.opens.sort()
-        opts = self.board.opens.copy()
-        nmi = 0
-        x = copy.deepcopy(p)
-        x.flip()
-        while(True):
-            x.moveToOpen(opts[nmi])
-            if(self.board.isValidPlacement(x)):
-                p.shape = x.shape.copy()
-                p.moveToOpen(opts[nmi])
-                self.board.placePiece(p)
-                for c in p.shape:
-                    self.board.opens.remove(c)
-                break
-            nmi += 1
-        self.print()
-
-    # @function     startListeners
-    # @purpose      Adds hotkeys for all of the menu options
-    def startListeners(self):
-        keyboard.add_hotkey('d', self.removeLastPiece)
-        keyboard.add_hotkey('p', self.selectPiece)
-        keyboard.add_hotkey('r', self.rotateLast)
-        keyboard.add_hotkey('f', self.flipLast)
-        keyboard.add_hotkey('left', self.moveLeft)
-        keyboard.add_hotkey('right', self.moveRight)
-        keyboard.add_hotkey('down', self.moveDown)
-        keyboard.add_hotkey('up', self.moveUp)
-
-    # @function     run
-    # @purpose      Runs the menu until the user hits "q" to solve
-    # @return       the pieces to start the solver with
-    def run(self):
-        self.startListeners()
-        self.print()
-        keyboard.wait('q')
-        return self.starters
-
-
+##
+# @file         Menu.py
+# @author       Daniel Epstein
+# @date         September 1, 2023
+# @purpose      A class that represents the UI for the Kanoodle Solver
+
+# Imports
+from board import Board
+from bitboard import BitBoard
+from cache import TranspositionCache
+from checkpoint import SearchControl
+from piece import Piece, normalize
+from placements import PlacementTable
+from regions import RegionCheck
+from solver import solve
+import vectorized
+import bisect, os, threading, time, keyboard
+
+# Keyboard Options for selecting a piece
+pieceOptions = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '0', '-', '=']
+
+# Class that holds the return information for the pieces that the user is starting with
+class Starter:
+    def __init__(self, piece, index):
+        self.piece = piece
+        self.index = index
+    
+class PlacementIndex():
+
+    ##
+    # @function     init
+    # @purpose      PlacementIndex constructor. Finds the valid spots of a piece on a board the first time
+    #               each orientation is asked for, so moving a piece doesn't check every spot on every key press
+    # @param        self - the PlacementIndex instance
+    # @param        board - the Board without the piece being moved on it, which has to stay that way
+    # @param        fitter - the FitTable to find the placements that fit with, or None to try every open spot
+    # @param        check - the RegionCheck for the pieces left to place besides the one being moved, or None to
+    #               only reject regions smaller than 3 spots
+    def __init__(self, board, fitter=None, check=None):
+        self.board = board
+        self.fitter = fitter
+        self.check = check
+        # The spots of an orientation relative to its first spot, to the sorted list and set of valid first spots
+        self.spots = {}
+        # Piece color to which of its placements fit on the board, found for every piece at once when first needed
+        self.fits = None
+
+    ##
+    # @function     find
+    # @purpose      Finds the valid first spots of a piece's orientation, once
+    # @param        self - the PlacementIndex instance
+    # @param        p - the piece
+    # @return       the sorted list and the set of first spots where the piece is valid
+    def find(self, p):
+        key = tuple((c[0] - p.shape[0][0], c[1] - p.shape[0][1]) for c in p.shape)
+        if(key not in self.spots):
+            if(self.fitter is not None and p.color in self.fitter.index):
+                anchors = self.fitAnchors(p)
+            else:
+                anchors = [o for o in sorted(self.board.opens)
+                           if self.board.isValidPlacement(p.moveToOpen(o), self.check)]
+            self.spots[key] = (anchors, set(anchors))
+        return self.spots[key]
+
+    ##
+    # @function     fitAnchors
+    # @purpose      Finds the valid first spots of a piece's orientation from the placements the FitTable says fit,
+    #               so only those need their empty regions checked
+    # @param        self - the PlacementIndex instance
+    # @param        p - the piece
+    # @return       the sorted list of first spots where the piece is valid
+    def fitAnchors(self, p):
+        if(self.fits is None):
+            self.fits = self.fitter.validity(BitBoard.fromBoard(self.board).filled)
+        shape = normalize(p.shape)
+        i = p.orientations.index(shape)
+        # The first spot of the piece is this far from the first spot of its normalized shape
+        dr = p.shape[0][0] - min(c[0] for c in p.shape) - shape[0][0]
+        dc = p.shape[0][1] - min(c[1] for c in p.shape) - shape[0][1]
+        fits = self.fits[p.color] & (self.fitter.orientation[p.color] == i)
+        anchors = [(pl.shape[0][0] + dr, pl.shape[0][1] + dc) for pl in self.fitter.placements[p.color][fits]
+                   if self.board.openSpotForEachPiece(pl, self.check)]
+        return sorted(anchors)
+
+    ##
+    # @function     anchors
+    # @purpose      The first spots where a piece can go in its orientation, in the order of the board's open spots
+    # @param        self - the PlacementIndex instance
+    # @param        p - the piece
+    def anchors(self, p):
+        return self.find(p)[0]
+
+    ##
+    # @function     valid
+    # @purpose      The set of first spots where a piece can go in its orientation
+    # @param        self - the PlacementIndex instance
+    # @param        p - the piece
+    def valid(self, p):
+        return self.find(p)[1]
+
+class BackgroundCount():
+
+    ##
+    # @function     init
+    # @purpose      BackgroundCount constructor. Counts the solutions of the position on the Menu's board on a thread
+    #               of its own, starting over whenever the position changes
+    # @param        self - the BackgroundCount instance
+    # @param        table - the PlacementTable of every piece
+    # @param        changed - a function to call from the counting thread when the status changes
+    # @param        cacheSize - the most entries for the TranspositionCache every count shares
+    def __init__(self, table, changed, cacheSize=100000):
+        self.table = table
+        self.changed = changed
+        # Moving a piece around leaves most of the board the same, so the dead ends found stay useful
+        self.cache = TranspositionCache(cacheSize)
+        self.status = ""
+        self.key = None
+        self.control = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    ##
+    # @function     restart
+    # @purpose      Stops counting the last position and starts counting a new one, unless it is the same
+    # @param        self - the BackgroundCount instance
+    # @param        starters - the pieces on the board, each where it is
+    # @param        pieces - the pieces left to place
+    def restart(self, starters, pieces):
+        board = Board(self.table.rows, self.table.cols)
+        for p in starters:
+            board.apply(p)
+        key = "".join("".join(row) for row in board.board)
+        if(key == self.key):
+            return
+        self.stop()
+        self.key = key
+        if(not starters):
+            # Every solution there is, which would take far too long to be any help
+            self.status = ""
+            return
+        self.status = "counting..."
+        self.control = SearchControl()
+        self.thread = threading.Thread(target=self.count, args=(board, pieces, self.control), daemon=True)
+        self.thread.start()
+
+    ##
+    # @function     stop
+    # @purpose      Cancels the count that is running and waits for it, which takes no longer than one placement
+    # @param        self - the BackgroundCount instance
+    def stop(self):
+        if(self.thread is not None):
+            with self.lock:
+                self.control.cancel()
+            self.thread.join()
+            self.thread = None
+        self.key = None
+
+    ##
+    # @function     show
+    # @purpose      Changes the status, unless the count it is from has been cancelled
+    # @param        self - the BackgroundCount instance
+    # @param        control - the SearchControl of the count
+    # @param        status - the new status
+    def show(self, control, status):
+        with self.lock:
+            if(control.reason is not None):
+                return
+            self.status = status
+        self.changed()
+
+    ##
+    # @function     count
+    # @purpose      Counts the solutions of a position, run on the counting thread
+    # @param        self - the BackgroundCount instance
+    # @param        board - the Board holding the pieces on the Menu's board, its own copy
+    # @param        pieces - the pieces left to place
+    # @param        control - the SearchControl to cancel the count with
+    def count(self, board, pieces, control):
+        found = 0
+        shown = time.monotonic()
+        # The piece order finds the solutions and the dead ends the soonest
+        for s in solve(board, pieces, self.table, "bitboard", "piece", cache=self.cache, control=control):
+            found += 1
+            if(time.monotonic() - shown >= 0.5):
+                self.show(control, "counting... " + str(found) + " so far")
+                shown = time.monotonic()
+        if(found == 0):
+            self.show(control, "unsolvable")
+        else:
+            self.show(control, str(found) + (" solution" if found == 1 else " solutions"))
+
+class Menu:
+    def __init__(self, pieces, table=None, fitNumpy=False):
+        self.board = Board(table.rows, table.cols) if table else Board()
+        self.pieces = pieces
+        self.starters = []
+        # Where the last piece added can go, built when the other pieces on the board change
+        self.index = None
+        # When asked for, NumPy finds the placements that fit for every orientation at once
+        self.fitter = vectorized.FitTable(table) if table and fitNumpy and vectorized.AVAILABLE else None
+        # The number of solutions of the position so far, counted while the pieces are being placed
+        self.counter = BackgroundCount(table or PlacementTable(pieces), self.refresh)
+        # Held while printing, since the counter prints from its own thread
+        self.screen = threading.RLock()
+        # True while the list of pieces is showing instead of the board
+        self.choosing = False
+
+    ##
+    # @function     clear_screen
+    # @purpose      Clears the console
+    def clear_screen(self):
+        os.system('cls' if os.name == 'nt' else 'clear')
+
+    ##
+    # @function     print
+    # @purpose      prints the menu
+    def print(self):
+        with self.screen:
+            self.printMenu()
+
+    # @function     printMenu
+    # @purpose      prints the board, the solutions it has and the options
+    def printMenu(self):
+        self.clear_screen()
+        print(self.board)
+        if(self.counter.status):
+            print("Solutions: " + self.counter.status)
+            print()
+        print("Options:")
+        print("[P] - New Piece")
+        print("[F] - Flip Piece")
+        print("[R] - Rotate Piece")
+        print("[D] - Delete Piece")
+        print()
+        print("[UP] - Move Piece Up")
+        print("[LEFT] - Move Piece Left")
+        print("[DOWN] - Move Piece Down")
+        print("[RIGHT] - Move Piece Right")
+        print()
+        print("[Q] - Solve")
+        print()
+
+    # @function     printPieces
+    # @purpose      prints the pieces menu
+    # @param        pieces - the list of pieces to print
+    def printPieces(self, pieces):
+        c = 0
+        for p in pieces:
+            option = ""
+            s = ""
+            match p.color:
+                case 'P':   
+                    s="\033[0;35m"
+                    option="Purple"
+                case 'R':
+                    s="\033[0;31m"
+                    option="Red"
+                case '+':
+                    s="\033[0;37m"
+                    option="Silver"
+                case 'W':
+                    s="\033[1;37m"
+                    option="White"
+                case 'p':
+                    s="\033[1m"
+                    option="Light Pink"
+                case 'b':
+                    s="\033[1;34m"
+                    option="Light Blue"
+                case 'B':
+                    s="\033[0;34m"
+                    option="Blue"
+                case 'g':
+                    s="\033[1;32m"
+                    option="Light Green"
+                case 'G':
+                    s="\033[0;32m"
+                    option="Green"
+                case 'Y':
+                    s="\033[1;33m"
+                    option="Yellow"
+                case 'O':
+                    s="\033[0;31m"
+                    option="Orange"
+                case 'M':
+                    s="\033[1;35m"
+                    option="Magenta"
+                case _:
+                    s="\033[1;30m"
+                    option=p.color
+            print("[", pieceOptions[c], "] - " + s + option + "\033[0m")
+            c += 1
+    
+    # @function     selectPiece
+    # @purpose      adds a hotkey for each selectable piece
+    def selectPiece(self):
+        self.choosing = True
+        self.clear_screen()
+        # A catalog can have more pieces than there are keys, only the first ones can start on the board
+        self.printPieces(self.pieces[:len(pieceOptions)])
+        for key in self.keys():
+            keyboard.add_hotkey(key, lambda key=key: self.addPiece(self.pieces[pieceOptions.index(key)], pieceOptions.index(key)))
+    
+    # @function     keys
+    # @purpose      The keys for selecting each piece there is a key for
+    def keys(self):
+        return pieceOptions[:len(self.pieces)]
+
+    # @function     addPiece
+    # @purpose      Adds a selected piece to the next open spot on the board
+    # @param        p - the piece to add
+    # @param        i - the index of the piece in pieces
+    def addPiece(self, p, i):
+        # The board the new piece is checked against is the one it will be moved around on, so its index is kept
+        index = PlacementIndex(self.board, self.fitter, self.regionCheck(i))
+        placed = False
+        for flips in range(p.flips + 1):
+            for rots in range(p.rots + 1):
+                anchors = index.anchors(p)
+                if(anchors):
+                    placed = True
+                    break
+                if(rots < p.rots):
+                    p = p.rotate90()
+            if(placed):
+                break
+            p = p.flip()
+
+        if(placed):
+            p = p.moveToOpen(anchors[0])
+            self.starters = [Starter(p, i)] + self.starters
+            self.index = index
+            self.board.apply(p)
+
+        for key in self.keys():
+            keyboard.remove_hotkey(key)
+
+        self.choosing = False
+        self.recount()
+        self.clear_screen()
+        self.print()
+
+    # @function     removeLastPiece
+    # @purpose      removes the last piece added to the board
+    def removeLastPiece(self):
+        if(len(self.starters) <= 0): return
+        # The last piece added is always the last one put on the board
+        self.board.undo()
+        self.starters.pop(0)
+        # The piece that is now last was added to a different board
+        self.index = None
+        self.recount()
+        self.print()
+
+    # @function     liftLast
+    # @purpose      Takes the last piece added off the board, so the places it could go can be looked up
+    # @return       the piece
+    def liftLast(self):
+        p = self.board.undo()
+        if(self.index is None):
+            self.index = PlacementIndex(self.board, self.fitter, self.regionCheck(self.starters[0].index))
+        return p
+
+    # @function     regionCheck
+    # @purpose      The RegionCheck for the pieces that aren't on the board, besides the one being moved
+    # @param        i - the index in pieces of the piece being moved
+    def regionCheck(self, i):
+        starters = set(s.index for s in self.starters)
+        return RegionCheck([len(self.pieces[j].shape) for j in range(len(self.pieces))
+                            if j != i and j not in starters])
+
+    # @function     dropLast
+    # @purpose      Puts the last piece added back on the board
+    # @param        p - the piece, moved to where it goes
+    def dropLast(self, p):
+        self.starters[0].piece = p
+        self.board.apply(p)
+        self.recount()
+
+    # @function     recount
+    # @purpose      Starts counting the solutions of the position on the board, stopping the count of the last one
+    def recount(self):
+        starters = set(s.index for s in self.starters)
+        self.counter.restart([s.piece for s in reversed(self.starters)],
+                             [self.pieces[i] for i in range(len(self.pieces)) if i not in starters])
+
+    # @function     refresh
+    # @purpose      Prints the menu again when the count changes, unless the list of pieces is showing
+    def refresh(self):
+        with self.screen:
+            if(not self.choosing):
+                self.printMenu()
+
+    # @function     moveLeft
+    # @purpose      moves the last piece added to the board left
+    def moveLeft(self):
+        if(len(self.starters) <= 0): return
+        p = self.liftLast()
+        anchors = self.index.anchors(p)
+        if(anchors):
+            # The valid spot before this one, wrapping around to the last one
+            p = p.moveToOpen(anchors[bisect.bisect_left(anchors, p.shape[0]) - 1])
+        self.dropLast(p)
+        self.print()
+
+    # @function     moveRight
+    # @purpose      moves the last piece added to the board right
+    def moveRight(self):
+        if(len(self.starters) <= 0): return
+        p = self.liftLast()
+        anchors = self.index.anchors(p)
+        if(anchors):
+            # The valid spot after this one, wrapping around to the first one
+            nmi = bisect.bisect_right(anchors, p.shape[0])
+            p = p.moveToOpen(anchors[nmi if nmi < len(anchors) else 0])
+        self.dropLast(p)
+        self.print()
+
+    # @function     moveVertical
+    # @purpose      moves the last piece added to the board to the next valid row in its column
+    # @param        step - 1 to move down, -1 to move up, wrapping around the board
+    def moveVertical(self, step):
+        if(len(self.starters) <= 0): return
+        p = self.liftLast()
+        valid = self.index.valid(p)
+        rows = len(self.board.board)
+        for i in range(1, rows):
+            nm = ((p.shape[0][0] + step * i) % rows, p.shape[0][1])
+            if(nm in valid):
+                p = p.moveToOpen(nm)
+                break
+        self.dropLast(p)
+        self.print()
+
+    # @function     moveDown
+    # @purpose      moves the last piece added to the board down 
+    def moveDown(self):
+        self.moveVertical(1)
+
+    # @function     moveUp
+    # @purpose      moves the last piece added to the board up
+    def moveUp(self):
+        self.moveVertical(-1)
+
+    # @function     turnLast
+    # @purpose      Puts the last piece added in a new orientation at the first spot it is valid in
+    # @param        turn - the function that turns the piece, such as Piece.rotate90
+    def turnLast(self, turn):
+        if(len(self.starters) <= 0): return
+        p = self.liftLast()
+        x = turn(p)
+        anchors = self.index.anchors(x)
+        # Stay as it was when the new orientation doesn't fit anywhere
+        self.dropLast(x.moveToOpen(anchors[0]) if anchors else p)
+        self.print()
+
+    # @function     rotateLast
+    # @purpose      rotates the last piece added to the board 90 degrees
+    def rotateLast(self):
+        self.turnLast(Piece.rotate90)
+    
+    # @function     flipLast
+    # @purpose      flips the last piece added to the board
+    def flipLast(self):
+        self.turnLast(Piece.flip)
+
+    # @function     startListeners
+    # @purpose      Adds hotkeys for all of the menu options
+    def startListeners(self):
+        keyboard.add_hotkey('d', self.removeLastPiece)
+        keyboard.add_hotkey('p', self.selectPiece)
+        keyboard.add_hotkey('r', self.rotateLast)
+        keyboard.add_hotkey('f', self.flipLast)
+        keyboard.add_hotkey('left', self.moveLeft)
+        keyboard.add_hotkey('right', self.moveRight)
+        keyboard.add_hotkey('down', self.moveDown)
+        keyboard.add_hotkey('up', self.moveUp)
+
+    # @function     run
+    # @purpose      Runs the menu until the user hits "q" to solve
+    # @return       the pieces to start the solver with
+    def run(self):
+        self.startListeners()
+        self.print()
+        keyboard.wait('q')
+        # The solver takes over from here
+        self.counter.stop()
+        return self.starters
+
+
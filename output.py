@@ -0,0 +1,158 @@
+##
+# @file         Output.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Writes solutions out in one of a few formats, saving up the output and writing it in large
+#               blocks instead of printing each solution on its own
+#
+#               Formats:
+#                 grid        the colored board, the same as printing a Solution
+#                 line        one line of rows * cols characters per solution, row by row
+#                 binary      rows * cols / 2 bytes per solution (rounded up), two spots per byte with the first
+#                             spot in the high 4 bits. Each spot is 0 when empty, otherwise 1 + the number of
+#                             the piece covering it in the list of colors written with
+
+# Imports
+from board import cellText
+
+FORMATS = ["grid", "line", "binary"]
+
+##
+# @function     unpackRecord
+# @purpose      Turns one binary record back into the characters of the board
+# @param        record - the bytes of the record
+# @param        colors - the piece colors, in the same order the record was written with
+# @param        size - the number of spots on the board
+# @return       the string of size characters, row by row, with X for empty spots
+def unpackRecord(record, colors, size):
+    spots = []
+    for b in record:
+        spots.append(b >> 4)
+        spots.append(b & 15)
+    return "".join(colors[n - 1] if n else "X" for n in spots[:size])
+
+class SolutionWriter():
+
+    ##
+    # @function     init
+    # @purpose      SolutionWriter constructor
+    # @param        self - the SolutionWriter instance
+    # @param        out - the binary file to write to, such as sys.stdout.buffer
+    # @param        format - one of FORMATS
+    # @param        colors - the piece colors, in the order they are numbered in the binary format
+    # @param        bufferSize - the number of bytes to save up before writing them
+    def __init__(self, out, format="grid", colors=None, bufferSize=1 << 16):
+        if(format not in FORMATS):
+            raise ValueError("unknown format " + repr(format))
+        if(format == "binary" and not colors):
+            raise ValueError("the binary format needs the list of piece colors")
+        if(format == "binary" and len(colors) > 15):
+            raise ValueError("the binary format can only number 15 pieces")
+        self.out = out
+        self.format = format
+        self.bufferSize = bufferSize
+        self.parts = []
+        self.buffered = 0
+        self.written = 0
+
+        # The bytes written for each character on the board, found once instead of for every spot.
+        # The line format writes the characters as they are, so it needs no table
+        if(format == "grid"):
+            self.spotBytes = [cellText(chr(b)).encode() for b in range(128)]
+        elif(format == "binary"):
+            # Translation tables from a character to its number in the high and the low 4 bits of a byte
+            high = bytearray(256)
+            low = bytearray(256)
+            for i in range(len(colors)):
+                high[ord(colors[i])] = (i + 1) << 4
+                low[ord(colors[i])] = i + 1
+            self.high = bytes(high)
+            self.low = bytes(low)
+
+        # The starting board is the same for every solution of a search, so its characters are kept
+        self.start = None
+        self.startSpots = None
+
+    ##
+    # @function     spots
+    # @purpose      The characters of every spot of a solution, row by row
+    # @param        self - the SolutionWriter instance
+    # @param        s - the Solution
+    # @return       the bytearray of characters
+    def spots(self, s):
+        if(s.start is not self.start):
+            self.start = s.start
+            self.cols = len(s.start.board[0])
+            self.startSpots = bytearray("".join("".join(row) for row in s.start.board), "ascii")
+        spots = self.startSpots[:]
+        cols = self.cols
+        for pl in s.placements:
+            code = ord(pl.color)
+            for r, c in pl.shape:
+                spots[r * cols + c] = code
+        return spots
+
+    ##
+    # @function     render
+    # @purpose      The bytes written for one solution
+    # @param        self - the SolutionWriter instance
+    # @param        s - the Solution
+    def render(self, s):
+        spots = self.spots(s)
+        if(self.format == "line"):
+            spots.append(10)
+            return bytes(spots)
+        if(self.format == "binary"):
+            if(len(spots) % 2):
+                spots.append(0)
+            # The high and low halves don't overlap, so ORing them as numbers joins each pair of spots
+            size = len(spots) // 2
+            return (int.from_bytes(spots[0::2].translate(self.high), "big")
+                    | int.from_bytes(spots[1::2].translate(self.low), "big")).to_bytes(size, "big")
+
+        # The grid ends each row with a new line, and the board with a blank line like print does
+        parts = []
+        for r in range(0, len(spots), self.cols):
+            parts.extend([self.spotBytes[b] for b in spots[r:r + self.cols]])
+            parts.append(b"\n")
+        parts.append(b"\n")
+        return b"".join(parts)
+
+    ##
+    # @function     write
+    # @purpose      Writes out a solution, once enough output has been saved up
+    # @param        self - the SolutionWriter instance
+    # @param        s - the Solution
+    def write(self, s):
+        data = self.render(s)
+        self.parts.append(data)
+        self.buffered += len(data)
+        self.written += 1
+        if(self.buffered >= self.bufferSize):
+            self.flush()
+
+    ##
+    # @function     flush
+    # @purpose      Writes out everything saved up so far
+    # @param        self - the SolutionWriter instance
+    def flush(self):
+        if(self.parts):
+            self.out.write(b"".join(self.parts))
+            self.parts = []
+            self.buffered = 0
+        self.out.flush()
+
+    ##
+    # @function     enter
+    # @purpose      Lets the writer be used in a with block, which flushes it at the end
+    # @param        self - the SolutionWriter instance
+    def __enter__(self):
+        return self
+
+    ##
+    # @function     exit
+    # @purpose      Writes out everything saved up, even when the search stopped with an error
+    # @param        self - the SolutionWriter instance
+    def __exit__(self, *exc):
+        self.flush()
+        return False
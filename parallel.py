@@ -0,0 +1,196 @@
+##
+# @file         Parallel.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Splits the search into independent subproblems after the first placements
+#               and solves them on a pool of processes, handing back the solutions in the
+#               same order a single process would
+
+# Imports
+import multiprocessing, os
+from cache import CacheStats, TranspositionCache
+from regions import PruneStats
+from stats import SolverStats
+import solver
+
+# The Solver each worker process builds once when it starts
+worker = None
+
+##
+# @function     startWorker
+# @purpose      Builds the worker process's Solver, only called by the process pool
+# @param        board - the Board holding the starting pieces
+# @param        table - the PlacementTable of every piece
+# @param        engine - the Solver engine to search with
+# @param        order - the Solver order to search in
+# @param        countStats - whether to count PruneStats
+# @param        cacheSize - the most entries for the worker's own TranspositionCache, None for no cache
+# @param        countSolverStats - whether to count SolverStats
+def startWorker(board, table, engine, order, countStats, cacheSize, countSolverStats):
+    global worker
+    cache = TranspositionCache(cacheSize) if cacheSize is not None else None
+    worker = solver.Solver(board, table, engine, order, PruneStats() if countStats else None, cache,
+                           SolverStats() if countSolverStats else None)
+
+##
+# @function     takeCacheStats
+# @purpose      Hands back the worker's cache counts since the last call, so each one is only added once
+# @return       the CacheStats, or None if the worker has no cache
+def takeCacheStats():
+    if(worker.cache is None):
+        return None
+    counts = worker.cache.stats
+    worker.cache.stats = CacheStats()
+    return counts
+
+##
+# @function     solvePart
+# @purpose      Solves one subproblem in a worker process
+# @param        part - the (placements, remaining pieces) to solve
+# @return       the list of placements for each solution, and the PruneStats, CacheStats and SolverStats
+#               counted for it
+def solvePart(part):
+    if(worker.stats):
+        worker.stats = PruneStats()
+    found = [s.placements for s in worker.search(part[1], part[0])]
+    return found, worker.stats, takeCacheStats(), worker.solverStats and worker.solverStats.take()
+
+##
+# @function     countPart
+# @purpose      Counts the solutions of one subproblem in a worker process
+# @param        part - the (placements, remaining pieces) to count, and whether to build a breakdown
+# @return       the number of solutions, the breakdown dictionary (or None), and the PruneStats, CacheStats
+#               and SolverStats counted for it
+def countPart(part):
+    if(worker.stats):
+        worker.stats = PruneStats()
+    breakdown = {} if part[2] else None
+    n = worker.count(part[1], part[0], breakdown)
+    return n, breakdown, worker.stats, takeCacheStats(), worker.solverStats and worker.solverStats.take()
+
+##
+# @function     solveParallel
+# @purpose      Finds every solution for the remaining pieces using a pool of processes
+# @param        board - the Board holding the starting pieces
+# @param        table - the PlacementTable of every piece
+# @param        pieces - the list of pieces that still need to be added
+# @param        engine - "grid", "bitboard" or "numpy", Dancing Links can't be split
+# @param        order - the order to search in, see Solver
+# @param        workers - the number of processes, None or 0 for one per core
+# @param        depth - the number of placements to make before splitting the search (1 or 2 is usually enough)
+# @param        chunksize - the number of subproblems to send a worker at a time
+# @param        stats - the PruneStats to add the workers' counts to, or None to not count
+# @param        cache - the TranspositionCache to add the workers' counts to, or None. Each worker keeps its own
+#               cache of the same size, since entries can't be shared between processes
+# @param        solverStats - the SolverStats to add the workers' counts to, or None to not count
+# @param        control - the SearchControl to stop the search with and resume from, or None. The frontier is
+#               kept as the subproblem the search is on, see checkpoint.py
+# @param        progress - the ProgressReporter to count the finished subproblems in, or None
+# @return       a generator of Solutions, stopping it early stops the workers
+def solveParallel(board, table, pieces, engine="bitboard", order="fixed", workers=None, depth=2, chunksize=1,
+                  stats=None, cache=None, solverStats=None, control=None, progress=None):
+    if(engine == "dlx"):
+        raise ValueError("the dlx engine can't be split into subproblems")
+    if(depth < 1):
+        raise ValueError("the search has to be split after at least 1 placement")
+    if(not workers):
+        workers = os.cpu_count()
+
+    # Only the first levels of the search are run here, the rest is left to the workers
+    splitter = solver.Solver(board, table, engine, order, stats, solverStats=solverStats)
+    parts = splitter.split(pieces, depth)
+
+    # The subproblems are always split the same way, so resuming skips the ones that were done
+    first, skip = 0, 0
+    if(control is not None):
+        if(control.frontier is None):
+            control.frontier = {"part": 0, "skip": 0}
+        if("part" not in control.frontier):
+            raise ValueError("the checkpoint is for a search with one worker")
+        first, skip = control.frontier["part"], control.frontier["skip"]
+    if(progress is not None):
+        progress.begin(len(parts), None, first)
+
+    with multiprocessing.Pool(workers, startWorker, (board, table, engine, order, stats is not None,
+                                                     cache.maxEntries if cache else None,
+                                                     solverStats is not None)) as pool:
+        # imap hands back results in the order of parts, which is the order of the single process search
+        results = pool.imap(solvePart, parts[first:], chunksize)
+        i = first
+        while(True):
+            try:
+                # With a control, wake up now and then to see if the search has to stop
+                found, counts, cacheCounts, searchCounts = results.next(None if control is None else 0.1)
+            except multiprocessing.TimeoutError:
+                if(control.poll()):
+                    return
+                if(control.saveDue):
+                    control.save()
+                continue
+            except StopIteration:
+                break
+            if(stats):
+                stats.add(counts)
+            if(cache):
+                cache.stats.add(cacheCounts)
+            if(solverStats):
+                solverStats.add(searchCounts)
+            for j in range(skip if i == first else 0, len(found)):
+                if(control is not None):
+                    control.passed({"part": i, "skip": j + 1})
+                yield splitter.solution(found[j])
+            i += 1
+            if(progress is not None):
+                progress.finish()
+            if(control is not None):
+                control.frontier = {"part": i, "skip": 0}
+
+##
+# @function     countParallel
+# @purpose      Counts every solution for the remaining pieces using a pool of processes
+# @param        board - the Board holding the starting pieces
+# @param        table - the PlacementTable of every piece
+# @param        pieces - the list of pieces that still need to be added
+# @param        engine - "grid", "bitboard" or "numpy", Dancing Links can't be split
+# @param        order - the order to search in, see Solver
+# @param        workers - the number of processes, None or 0 for one per core
+# @param        depth - the number of placements to make before splitting the search
+# @param        chunksize - the number of subproblems to send a worker at a time
+# @param        stats - the PruneStats to add the workers' counts to, or None to not count
+# @param        breakdown - the dictionary to add the workers' placement counts to, or None
+# @param        cache - the TranspositionCache to add the workers' counts to, or None, see solveParallel
+# @param        solverStats - the SolverStats to add the workers' counts to, or None to not count
+# @param        progress - the ProgressReporter to count the finished subproblems in, or None
+# @return       the number of solutions
+def countParallel(board, table, pieces, engine="bitboard", order="fixed", workers=None, depth=2, chunksize=1,
+                  stats=None, breakdown=None, cache=None, solverStats=None, progress=None):
+    if(engine == "dlx"):
+        raise ValueError("the dlx engine can't be split into subproblems")
+    if(depth < 1):
+        raise ValueError("the search has to be split after at least 1 placement")
+    if(not workers):
+        workers = os.cpu_count()
+
+    parts = solver.Solver(board, table, engine, order, stats, solverStats=solverStats).split(pieces, depth)
+    parts = [(part[0], part[1], breakdown is not None) for part in parts]
+    if(progress is not None):
+        progress.begin(len(parts))
+
+    total = 0
+    with multiprocessing.Pool(workers, startWorker, (board, table, engine, order, stats is not None,
+                                                     cache.maxEntries if cache else None,
+                                                     solverStats is not None)) as pool:
+        for n, counts, partStats, cacheCounts, searchCounts in pool.imap_unordered(countPart, parts, chunksize):
+            total += n
+            if(progress is not None):
+                progress.finish()
+            if(breakdown is not None):
+                for key in counts:
+                    breakdown[key] = breakdown.get(key, 0) + counts[key]
+            if(stats):
+                stats.add(partStats)
+            if(cache):
+                cache.stats.add(cacheCounts)
+            if(solverStats):
+                solverStats.add(searchCounts)
+    return total
@@ -1,53 +1,112 @@
-##
-# @file         Piece.py
-# @author       Daniel Epstein
-# @date         August 20, 2023
-# @purpose      A class that represents a kanoodle piece   
-
-class Piece():
-    ##
-    # @function     init
-    # @purpose      Piece constructor. Creates an instance of a Piece
-    # @param        self - the Piece instance
-    # @param        color - the character to display, generally is the first letter of the color
-    # @param        shape - the coordinates of the spaces taken up by the piece
-    # @param        rots - the number of different rotations that a piece has
-    def __init__(self, color, shape, rots, flips):
-        self.color = color
-        self.shape = shape 
-        self.rots = rots
-        self.flips = flips
-    
-    ##
-    # @function     moveToOpen
-    # @purpose      moves the piece to a given open spot 
-    # @param        self - the Piece instance
-    # @param        open - the open space to move the first shape spot to
-    def moveToOpen(self, open):
-        # Find the change from the old first spot to the open space
-        deltaX = open[1] - self.shape[0][1]
-        deltaY = open[0] - self.shape[0][0]
-
-        # Apply that change to each subsequent spot in shape
-        for i in range(len(self.shape)):
-            self.shape[i][1] = self.shape[i][1]+deltaX
-            self.shape[i][0] = self.shape[i][0]+deltaY
-    
-    ##
-    # @function     rotate90
-    # @purpose      Rotates the piece by 90 degrees to the right
-    # @param        self - the Piece instance
-    def rotate90(self):
-        for i in range(len(self.shape)):
-            temp = self.shape[i][0]
-            self.shape[i][0] = self.shape[i][1]
-            self.shape[i][1] = -1 * temp
-    
-
-    ##
-    # @function     flip
-    # @purpose      Flips any non-symmetrical piece
-    # @param        self - the Piece instance
-    def flip(self):
-        for i in range(len(self.shape)):
-            self.shape[i][1] = self.shape[i][1] * -1
\ No newline at end of file
+##
+# @file         Piece.py
+# @author       Daniel Epstein
+# @date         August 20, 2023
+# @purpose      A class that represents a kanoodle piece
+
+##
+# @function     normalize
+# @purpose      Moves a shape so its top-most row and left-most column are 0
+# @param        shape - the coordinates of the spaces taken up by the shape
+# @return       the sorted tuple of (row, column) tuples for the shape
+def normalize(shape):
+    minR = min(c[0] for c in shape)
+    minC = min(c[1] for c in shape)
+    return tuple(sorted((c[0] - minR, c[1] - minC) for c in shape))
+
+##
+# @function     findOrientations
+# @purpose      Lists the distinct orientations of a shape
+# @param        shape - the coordinates of the spaces taken up by the shape
+# @param        rots - the number of different rotations that the shape has
+# @param        flips - the number of different flips that the shape has
+# @return       the tuple of normalized shapes, in the order rotate90 and flip visit them
+def findOrientations(shape, rots, flips):
+    # Keep only the shapes that have not been seen yet (symmetrical pieces repeat themselves)
+    found = []
+    for j in range(flips):
+        for i in range(rots):
+            n = normalize(shape)
+            if(n not in found):
+                found.append(n)
+            shape = [(c[1], -1 * c[0]) for c in shape]
+        shape = [(c[0], -1 * c[1]) for c in shape]
+    return tuple(found)
+
+class Piece():
+    __slots__ = ('color', 'shape', 'rots', 'flips', 'orientations')
+
+    ##
+    # @function     init
+    # @purpose      Piece constructor. Creates an instance of a Piece, which can't be changed once it is made,
+    #               moving, rotating or flipping a piece makes a new one
+    # @param        self - the Piece instance
+    # @param        color - the character to display, generally is the first letter of the color
+    # @param        shape - the coordinates of the spaces taken up by the piece, the first one is the spot
+    #               moveToOpen moves
+    # @param        rots - the number of different rotations that a piece has
+    # @param        flips - the number of different flips that a piece has
+    # @param        orientations - the normalized shapes of the piece, None to find them
+    def __init__(self, color, shape, rots, flips, orientations=None):
+        shape = tuple((c[0], c[1]) for c in shape)
+        if(orientations is None):
+            orientations = findOrientations(shape, rots, flips)
+        object.__setattr__(self, 'color', color)
+        object.__setattr__(self, 'shape', shape)
+        object.__setattr__(self, 'rots', rots)
+        object.__setattr__(self, 'flips', flips)
+        object.__setattr__(self, 'orientations', orientations)
+
+    ##
+    # @function     setattr
+    # @purpose      Stops a piece from being changed, since pieces are shared by the Menu, the solver and its workers
+    # @param        self - the Piece instance
+    def __setattr__(self, name, value):
+        raise AttributeError("a Piece can't be changed, make a new one with withShape")
+
+    ##
+    # @function     reduce
+    # @purpose      How to copy or pickle a piece, the default sets each slot which setattr won't allow
+    # @param        self - the Piece instance
+    def __reduce__(self):
+        return (Piece, (self.color, self.shape, self.rots, self.flips, self.orientations))
+
+    ##
+    # @function     withShape
+    # @purpose      Makes the same piece covering other spots
+    # @param        self - the Piece instance
+    # @param        shape - the coordinates of the spaces taken up by the new piece
+    # @return       the new Piece, sharing this one's orientations
+    def withShape(self, shape):
+        return Piece(self.color, shape, self.rots, self.flips, self.orientations)
+
+    ##
+    # @function     moveToOpen
+    # @purpose      moves the piece to a given open spot
+    # @param        self - the Piece instance
+    # @param        open - the open space to move the first shape spot to
+    # @return       the moved Piece
+    def moveToOpen(self, open):
+        # Find the change from the old first spot to the open space
+        deltaX = open[1] - self.shape[0][1]
+        deltaY = open[0] - self.shape[0][0]
+
+        # Apply that change to each spot in shape
+        return self.withShape([(c[0] + deltaY, c[1] + deltaX) for c in self.shape])
+
+    ##
+    # @function     rotate90
+    # @purpose      Rotates the piece by 90 degrees to the right
+    # @param        self - the Piece instance
+    # @return       the rotated Piece
+    def rotate90(self):
+        return self.withShape([(c[1], -1 * c[0]) for c in self.shape])
+
+
+    ##
+    # @function     flip
+    # @purpose      Flips any non-symmetrical piece
+    # @param        self - the Piece instance
+    # @return       the flipped Piece
+    def flip(self):
+        return self.withShape([(c[0], -1 * c[1]) for c in self.shape])
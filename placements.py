@@ -0,0 +1,108 @@
+##
+# @file         Placements.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      A table of every distinct orientation of every piece and every
+#               position that orientation can take on the board, built once at startup
+
+# Imports
+import copy
+
+class Placement():
+    __slots__ = ('color', 'shape', 'mask')
+
+    ##
+    # @function     init
+    # @purpose      Placement constructor. A piece fixed at one orientation and position on the board
+    # @param        self - the Placement instance
+    # @param        color - the character of the piece being placed
+    # @param        shape - the tuple of (row, column) coordinates the piece covers
+    # @param        mask - the bitmask of the covered spots, bit r * cols + c for spot [r, c]
+    def __init__(self, color, shape, mask):
+        self.color = color
+        self.shape = shape
+        self.mask = mask
+
+class PlacementTable():
+
+    ##
+    # @function     init
+    # @purpose      PlacementTable constructor. Finds every legal on-board position of every
+    #               orientation of every piece
+    # @param        self - the PlacementTable instance
+    # @param        pieces - the list of pieces to build the table for
+    # @param        rows - the number of rows on the board
+    # @param        cols - the number of columns on the board
+    def __init__(self, pieces, rows=5, cols=11):
+        self.rows = rows
+        self.cols = cols
+        self.orientations = {}
+        self.placements = {}
+        self.covering = {}
+        self.byMask = {}
+        # The (color, kept masks) when only some placements of a piece are kept, see restricted
+        self.restriction = None
+        for p in pieces:
+            self.orientations[p.color] = p.orientations
+            self.placements[p.color] = []
+            self.covering[p.color] = [[] for i in range(rows * cols)]
+            self.byMask[p.color] = {}
+            for o in self.orientations[p.color]:
+                height = 1 + max(c[0] for c in o)
+                width = 1 + max(c[1] for c in o)
+                # Slide the orientation over the board in row major order
+                for r in range(rows - height + 1):
+                    for c in range(cols - width + 1):
+                        shape = tuple((s[0] + r, s[1] + c) for s in o)
+                        pl = Placement(p.color, shape, self.maskOf(shape))
+                        self.placements[p.color].append(pl)
+                        self.byMask[p.color][pl.mask] = pl
+                        # Index the placement under every spot it covers
+                        for s in shape:
+                            self.covering[p.color][s[0] * cols + s[1]].append(pl)
+
+    ##
+    # @function     maskOf
+    # @purpose      Converts a list of board coordinates to a bitmask
+    # @param        self - the PlacementTable instance
+    # @param        shape - the coordinates to convert
+    # @return       the bitmask with bit r * cols + c set for each coordinate [r, c]
+    def maskOf(self, shape):
+        mask = 0
+        for c in shape:
+            mask |= 1 << (c[0] * self.cols + c[1])
+        return mask
+
+    ##
+    # @function     restricted
+    # @purpose      Makes a copy of the table where one piece only has some of its placements
+    # @param        self - the PlacementTable instance
+    # @param        color - the character of the piece to restrict
+    # @param        keep - the set of masks of the placements to keep for that piece
+    # @return       the new PlacementTable, sharing every other piece's placements with this one
+    def restricted(self, color, keep):
+        table = copy.copy(self)
+        table.placements = dict(self.placements)
+        table.covering = dict(self.covering)
+        table.byMask = dict(self.byMask)
+        table.placements[color] = [pl for pl in self.placements[color] if pl.mask in keep]
+        table.covering[color] = [[pl for pl in spot if pl.mask in keep] for spot in self.covering[color]]
+        table.byMask[color] = {m: pl for m, pl in self.byMask[color].items() if m in keep}
+        table.restriction = (color, frozenset(keep))
+        return table
+
+    ##
+    # @function     shuffled
+    # @purpose      Makes a copy of the table with the placements of every piece in a random order, so the search
+    #               finds the solutions in a random order too
+    # @param        self - the PlacementTable instance
+    # @param        rng - the random.Random to shuffle with
+    # @return       the new PlacementTable, sharing the placements with this one
+    def shuffled(self, rng):
+        table = copy.copy(self)
+        table.placements = {}
+        table.covering = {}
+        for color in self.placements:
+            table.placements[color] = rng.sample(self.placements[color], len(self.placements[color]))
+            table.covering[color] = [rng.sample(spot, len(spot)) for spot in self.covering[color]]
+        return table
@@ -0,0 +1,271 @@
+##
+# @file         Progress.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Guesses how big a search will be before running it, and reports how far a long search has got
+#               while it runs.
+#
+#               The guess follows Knuth's estimate of a backtracking tree: walk from the root to a leaf, picking
+#               one of the placements that pass at random at each level, and multiply together the number that
+#               passed on the way down. The running products add up to a fair guess of the number of nodes, and
+#               the average over many walks settles towards the real size. A walk checks every placement at
+#               each level it passes through, which costs far more than the search spends on a node, so the time
+#               comes from running the real search for a moment and seeing how many nodes a second it gets through
+
+# Imports
+import math, random, sys, threading, time
+from checkpoint import SearchControl
+from placements import PlacementTable
+from solver import Solver
+
+class TreeEstimate():
+
+    ##
+    # @function     init
+    # @purpose      TreeEstimate constructor. The guessed size of a search
+    # @param        self - the TreeEstimate instance
+    # @param        probes - the number of random walks the guess is from
+    # @param        nodes - the guessed number of placements the search makes
+    # @param        solutions - the guessed number of solutions
+    # @param        error - the standard error of nodes
+    # @param        seconds - the guessed seconds for one process to run the search
+    def __init__(self, probes, nodes, solutions, error, seconds):
+        self.probes = probes
+        self.nodes = nodes
+        self.solutions = solutions
+        self.error = error
+        self.seconds = seconds
+
+    ##
+    # @function     toDict
+    # @purpose      The estimate as a dictionary, for writing out as JSON
+    # @param        self - the TreeEstimate instance
+    def toDict(self):
+        return {"probes": self.probes, "nodes": round(self.nodes), "solutions": round(self.solutions, 1),
+                "error": round(self.error), "seconds": round(self.seconds, 3)}
+
+    ##
+    # @function     str
+    # @purpose      String version of the estimate so it can be printed
+    # @param        self - the TreeEstimate instance
+    def __str__(self):
+        percent = 100 * self.error / self.nodes if self.nodes else 0
+        return ("Estimated nodes:     " + format(self.nodes, ".0f") + " (+/- " + format(percent, ".0f") + "%)\n"
+                + "Estimated solutions: " + format(self.solutions, ".1f") + "\n"
+                + "Estimated time:      " + format(self.seconds, ".2f") + " s\n"
+                + "Random probes:       " + str(self.probes))
+
+##
+# @function     estimate
+# @purpose      Guesses the size of the search for the pieces left to place on a board with random walks down it
+# @param        board - the Board holding the starting pieces
+# @param        pieces - the list of pieces that still need to be added
+# @param        table - the PlacementTable of every piece, built from pieces if None
+# @param        engine - the engine the search would use, see Solver. Dancing Links searches a different tree
+#               and can't be estimated
+# @param        order - the order the search would use, see Solver
+# @param        probes - the number of random walks to make, the error shrinks with the square root of it
+# @param        seed - the seed for picking the placements, None for a different guess each time
+# @param        calibrate - the seconds to run the real search for to time its nodes
+# @return       the TreeEstimate
+def estimate(board, pieces, table=None, engine="bitboard", order="fixed", probes=200, seed=None, calibrate=0.5):
+    if(engine == "dlx"):
+        raise ValueError("the dlx engine's search can't be estimated")
+    if(table is None):
+        table = PlacementTable(pieces, board.rows, board.cols)
+    solver = Solver(board, table, engine, order)
+    bits = solver.bits
+    startFilled = bits.filled
+    rng = random.Random(seed)
+
+    nodes = 0.0
+    squares = 0.0
+    solutions = 0.0
+    for i in range(probes):
+        # Each placement that passed at a level stands for as many nodes as there were choices above it
+        weight = 1
+        total = 0
+        left = pieces
+        while(left):
+            choices = solver.branches(left)
+            if(not choices):
+                break
+            weight *= len(choices)
+            total += weight
+            pl, left = rng.choice(choices)
+            bits.place(pl.mask)
+        else:
+            solutions += weight
+        bits.reset(startFilled)
+        nodes += total
+        squares += total * total
+
+    mean = nodes / probes if probes else 0.0
+    error = math.sqrt(max(0.0, squares / probes - mean * mean) / probes) if probes > 1 else mean
+    return TreeEstimate(probes, mean, solutions / probes if probes else 0.0, error,
+                        searchSeconds(board, pieces, table, engine, order, mean, calibrate))
+
+##
+# @function     searchSeconds
+# @purpose      Guesses how long a search takes by running it until a deadline and timing the nodes it made
+# @param        board - the Board holding the starting pieces
+# @param        pieces - the list of pieces that still need to be added
+# @param        table - the PlacementTable of every piece
+# @param        engine - the engine the search would use, see Solver
+# @param        order - the order the search would use, see Solver
+# @param        nodes - the guessed number of placements the search makes
+# @param        calibrate - the seconds to run the search for
+# @return       the guessed seconds, or the real ones when the search finished before the deadline
+def searchSeconds(board, pieces, table, engine, order, nodes, calibrate):
+    control = SearchControl(calibrate)
+    counter = ProgressReporter(calibrate + 1, lambda snap: None)
+    solver = Solver(board, table, engine, order, control=control, progress=counter)
+    start = time.perf_counter()
+    try:
+        for s in solver.search(pieces):
+            pass
+    finally:
+        counter.end()
+    seconds = time.perf_counter() - start
+    if(control.reason is None or not counter.nodes):
+        return seconds
+    return nodes * seconds / counter.nodes
+
+class ProgressReporter():
+
+    ##
+    # @function     init
+    # @purpose      ProgressReporter constructor. Handed to solve or count to report on the search every so often
+    #               from a thread of its own
+    # @param        self - the ProgressReporter instance
+    # @param        interval - the seconds between reports
+    # @param        callback - a function to call with the dictionary from snapshot for each report, or None to
+    #               print them to out
+    # @param        out - the file to print the reports to, None for stderr
+    # @param        guess - a TreeEstimate of the search, to work out the time left from the nodes left, or None
+    #               to work it out from the share of the first level's branches that are done
+    def __init__(self, interval=5.0, callback=None, out=None, guess=None):
+        self.interval = interval
+        self.callback = callback
+        self.out = out
+        self.guess = guess
+        self.branches = 0           # the number of branches at the first level, or subproblems when parallel
+        self.done = 0               # the branches finished
+        self.skipped = 0            # the branches finished before a resumed search started
+        self.rootPieces = None      # the number of pieces left at the first level
+        self.nodes = None           # placements made, None when the search isn't done in this process
+        self.solutions = 0
+        self.started = None
+        self.thread = None
+        self.stopping = threading.Event()
+
+    ##
+    # @function     begin
+    # @purpose      Starts reporting on a search
+    # @param        self - the ProgressReporter instance
+    # @param        branches - the number of branches at the first level of the search, or of subproblems
+    # @param        rootPieces - the number of pieces left at the first level, or None when the workers search
+    #               the subproblems and only finish is called
+    # @param        skipped - the branches at the first level a resumed search skips, as they were already done
+    def begin(self, branches, rootPieces=None, skipped=0):
+        self.branches = branches
+        self.done = skipped
+        self.skipped = skipped
+        self.rootPieces = rootPieces
+        self.nodes = None if rootPieces is None else 0
+        self.solutions = 0
+        self.started = time.monotonic()
+        if(self.thread is None):
+            self.stopping.clear()
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    ##
+    # @function     placed
+    # @purpose      Counts a placement the search made, only called by the Solver
+    # @param        self - the ProgressReporter instance
+    # @param        remaining - the number of pieces that were left before it
+    def placed(self, remaining):
+        self.nodes += 1
+        # A new branch at the first level means the one before it is finished
+        if(remaining == self.rootPieces):
+            self.done += 1
+
+    ##
+    # @function     finish
+    # @purpose      Counts a subproblem the workers finished
+    # @param        self - the ProgressReporter instance
+    def finish(self):
+        self.done += 1
+
+    ##
+    # @function     solved
+    # @purpose      Counts a solution handed back
+    # @param        self - the ProgressReporter instance
+    def solved(self):
+        self.solutions += 1
+
+    ##
+    # @function     end
+    # @purpose      Stops reporting and makes a last report, calling it again does nothing
+    # @param        self - the ProgressReporter instance
+    def end(self):
+        if(self.thread is None):
+            return
+        self.stopping.set()
+        self.thread.join()
+        self.thread = None
+        self.report()
+
+    ##
+    # @function     run
+    # @purpose      Reports every interval until end is called, run on the reporting thread
+    # @param        self - the ProgressReporter instance
+    def run(self):
+        while(not self.stopping.wait(self.interval)):
+            self.report()
+
+    ##
+    # @function     snapshot
+    # @purpose      Works out how far the search has got
+    # @param        self - the ProgressReporter instance
+    # @return       the dictionary of "fraction" of the first level's branches done, "done" and "branches",
+    #               "nodes", "nodesPerSecond", "solutions", "elapsed" seconds and "eta" seconds left, where nodes and
+    #               nodesPerSecond are None when the workers count them and eta is None until there is something
+    #               to go on
+    def snapshot(self):
+        elapsed = time.monotonic() - self.started
+        finished = self.stopping.is_set()
+        nodes = self.nodes
+        # Only the branches before the current one are done, until the search has finished
+        done = self.branches if finished else max(0, self.done - (1 if self.rootPieces is not None else 0))
+        fraction = done / self.branches if self.branches else 1.0
+        rate = nodes / elapsed if nodes is not None and elapsed > 0 else None
+
+        eta = None
+        if(finished):
+            eta = 0.0
+        elif(self.guess is not None and rate):
+            eta = max(0.0, self.guess.nodes - nodes) / rate
+        elif(done > self.skipped):
+            # Only the branches finished since the search started took up the time so far
+            eta = elapsed * (self.branches - done) / (done - self.skipped)
+        return {"fraction": fraction, "done": done, "branches": self.branches, "nodes": nodes,
+                "nodesPerSecond": rate, "solutions": self.solutions, "elapsed": elapsed, "eta": eta}
+
+    ##
+    # @function     report
+    # @purpose      Hands the snapshot to the callback, or prints it
+    # @param        self - the ProgressReporter instance
+    def report(self):
+        snap = self.snapshot()
+        if(self.callback is not None):
+            self.callback(snap)
+            return
+        line = (format(100 * snap["fraction"], ".1f") + "% (" + str(snap["done"]) + "/" + str(snap["branches"])
+                + " branches)")
+        if(snap["nodes"] is not None):
+            line += ", " + str(snap["nodes"]) + " nodes, " + format(snap["nodesPerSecond"] or 0, ".0f") + " nodes/s"
+        line += ", " + str(snap["solutions"]) + " solutions, " + format(snap["elapsed"], ".1f") + " s"
+        line += ", ETA " + ("?" if snap["eta"] is None else format(snap["eta"], ".1f") + " s")
+        print(line, file=self.out or sys.stderr, flush=True)
@@ -0,0 +1,229 @@
+##
+# @file         Puzzles.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Makes puzzles that have exactly one solution. Each one starts from a random full board and takes
+#               the pieces off one at a time in a random order, putting a piece back whenever the board without
+#               it would have more than one solution. Taking pieces off only ever adds solutions, so once every
+#               piece has been tried no single piece left on the board can be taken off.
+#
+#               Puzzles are made on a pool of processes, each from its own seed, and written out in the order of
+#               their seeds as JSON lines of
+#                 {"seed": n, "position": {color: [[row, column], ...], ...}, "pieces": starting pieces,
+#                  "solution": [row of characters, ...], "checks": uniqueness checks made, "seconds": s}
+#               The position is what batch.py and the service read
+
+# Imports
+import argparse, json, multiprocessing, os, random, sys, time
+from collections import deque
+from board import Board
+from cache import TranspositionCache
+from catalog import loadCatalog, startPosition
+from placements import PlacementTable
+from solver import solve, uniqueness
+import vectorized
+
+# The PuzzleMaker each worker process builds once when it starts
+worker = None
+
+class PuzzleMaker():
+
+    ##
+    # @function     init
+    # @purpose      PuzzleMaker constructor. Builds the pieces and placement table once for every puzzle it makes
+    # @param        self - the PuzzleMaker instance
+    # @param        engine - the Solver engine to check uniqueness with
+    # @param        order - the Solver order to check uniqueness with
+    # @param        cacheSize - the most entries for the TranspositionCache shared by every check, 0 for no cache
+    # @param        catalog - the catalog file of the board size and pieces, None for the Kanoodle ones
+    def __init__(self, engine="bitboard", order="constrained", cacheSize=0, catalog=None):
+        self.rows, self.cols, self.pieces = loadCatalog(catalog)
+        self.table = PlacementTable(self.pieces, self.rows, self.cols)
+        self.engine = engine
+        self.order = order
+        self.cache = TranspositionCache(cacheSize) if cacheSize > 0 else None
+
+    ##
+    # @function     randomSolution
+    # @purpose      Finds a random full board, by searching an empty board with the placements in a random order
+    # @param        self - the PuzzleMaker instance
+    # @param        rng - the random.Random to pick with
+    # @return       the Solution
+    def randomSolution(self, rng):
+        # Filling the most constrained spot first finds a first solution much sooner than any other order
+        for s in solve(Board(self.rows, self.cols), self.pieces, self.table.shuffled(rng), "bitboard", "constrained",
+                       first=True):
+            return s
+        raise ValueError("the pieces can't fill the board")
+
+    ##
+    # @function     make
+    # @purpose      Makes one puzzle
+    # @param        self - the PuzzleMaker instance
+    # @param        seed - the seed for the random full board and the order the pieces are taken off in
+    # @return       the dictionary written out for the puzzle, see the top of the file
+    def make(self, seed):
+        start = time.perf_counter()
+        rng = random.Random(seed)
+        s = self.randomSolution(rng)
+        position = {}
+        for color in s.cells:
+            position[color] = [list(c) for c in s.cells[color]]
+
+        checks = 0
+        for color in rng.sample(sorted(position), len(position)):
+            trial = dict(position)
+            del trial[color]
+            board, needsplace = startPosition(trial, self.pieces, self.table)
+            checks += 1
+            if(uniqueness(board, needsplace, self.table, self.engine, self.order, cache=self.cache) == 1):
+                position = trial
+        return {"seed": seed, "position": position, "pieces": len(position),
+                "solution": ["".join(row) for row in s.toBoard().board], "checks": checks,
+                "seconds": round(time.perf_counter() - start, 6)}
+
+##
+# @function     startWorker
+# @purpose      Builds the worker process's PuzzleMaker, only called by the process pool
+# @param        settings - the arguments for the PuzzleMaker
+def startWorker(settings):
+    global worker
+    worker = PuzzleMaker(*settings)
+
+##
+# @function     makeOne
+# @purpose      Makes one puzzle in a worker process
+# @param        seed - the seed of the puzzle
+# @return       the dictionary of the puzzle
+def makeOne(seed):
+    return worker.make(seed)
+
+class PuzzleCounts():
+
+    ##
+    # @function     init
+    # @purpose      PuzzleCounts constructor. Counts the puzzles made, to report how fast they are coming
+    # @param        self - the PuzzleCounts instance
+    def __init__(self):
+        self.started = time.monotonic()
+        self.written = 0            # puzzles written out
+        self.tried = 0              # puzzles made, written or not
+        self.duplicates = 0         # puzzles the same as one already written
+        self.tooMany = 0            # puzzles with more starting pieces than were wanted
+        self.checks = 0             # uniqueness checks made
+
+    ##
+    # @function     str
+    # @purpose      String version of the counts so they can be printed
+    # @param        self - the PuzzleCounts instance
+    def __str__(self):
+        seconds = time.monotonic() - self.started
+        perMinute = 60 * self.written / seconds if seconds else 0
+        return (str(self.written) + " puzzles in " + format(seconds, ".1f") + " s, " + format(perMinute, ".1f")
+                + " per minute (" + str(self.tried) + " made, " + str(self.duplicates) + " duplicates, "
+                + str(self.tooMany) + " with too many pieces, " + str(self.checks) + " uniqueness checks)")
+
+##
+# @function     makePuzzles
+# @purpose      Makes puzzles and writes them out as they are ready, in the order of their seeds
+# @param        outfile - the file to write a JSON line to for each puzzle
+# @param        settings - the arguments for each PuzzleMaker
+# @param        wanted - the number of puzzles to write
+# @param        seed - the seed of the first puzzle, the next ones count up from it
+# @param        workers - the number of processes, 0 for one per core
+# @param        maxPieces - the most starting pieces a puzzle can have to be written, None for any number
+# @param        report - the file to write the counts to every so often, or None
+# @param        every - the seconds between reports
+# @return       the PuzzleCounts
+def makePuzzles(outfile, settings, wanted, seed=0, workers=1, maxPieces=None, report=None, every=10.0):
+    if(not workers):
+        workers = os.cpu_count()
+    counts = PuzzleCounts()
+    seen = set()
+    nextReport = time.monotonic() + every
+
+    if(workers == 1):
+        # Not worth starting another process for
+        startWorker(settings)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, startWorker, (settings,))
+    # Only a few puzzles are asked for ahead, since it isn't known how many seeds it will take
+    pending = deque()
+    try:
+        while(counts.written < wanted):
+            while(pool and len(pending) < 2 * workers):
+                pending.append(pool.apply_async(makeOne, (seed,)))
+                seed += 1
+            if(pool):
+                puzzle = pending.popleft().get()
+            else:
+                puzzle = makeOne(seed)
+                seed += 1
+
+            counts.tried += 1
+            counts.checks += puzzle["checks"]
+            key = json.dumps(puzzle["position"], sort_keys=True)
+            if(key in seen):
+                counts.duplicates += 1
+            elif(maxPieces is not None and puzzle["pieces"] > maxPieces):
+                counts.tooMany += 1
+            else:
+                seen.add(key)
+                outfile.write(json.dumps(puzzle) + "\n")
+                outfile.flush()
+                counts.written += 1
+
+            if(report and time.monotonic() >= nextReport):
+                print(counts, file=report)
+                nextReport = time.monotonic() + every
+    finally:
+        if(pool):
+            pool.terminate()
+    return counts
+
+##
+# @function     Main
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Makes Kanoodle puzzles with exactly one solution")
+    parser.add_argument("count", type=int,
+                        help="the number of puzzles to make")
+    parser.add_argument("--output", default="-",
+                        help="the file to write a JSON line to for each puzzle (default - for stdout)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="the seed of the first puzzle, the same seed always makes the same puzzles (default 0)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="the number of processes to make puzzles with, 0 for one per core (default 0)")
+    parser.add_argument("--max-pieces", type=int, default=None,
+                        help="only write puzzles with at most this many starting pieces, fewer is harder")
+    parser.add_argument("--engine", choices=["grid", "bitboard", "numpy", "dlx"], default="bitboard",
+                        help="the engine to check uniqueness with, see main.py (default bitboard)")
+    parser.add_argument("--order", choices=["fixed", "cell", "constrained", "piece"], default="constrained",
+                        help="the order to check uniqueness in, see main.py (default constrained)")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="the most entries for each worker's cache, shared by every check it makes "
+                        "(default 0, no cache, bitboard engine only)")
+    parser.add_argument("--catalog", default=None,
+                        help="read the board size and pieces from this JSON file, see catalog.py")
+    parser.add_argument("--report-every", type=float, default=10,
+                        help="the seconds between printing how many puzzles a minute are being made (default 10)")
+    args = parser.parse_args()
+    if(args.order != "fixed" and args.engine != "bitboard"):
+        parser.error("--order " + args.order + " needs --engine bitboard")
+    if(args.engine == "numpy" and not vectorized.AVAILABLE):
+        parser.error("--engine numpy needs numpy installed")
+    try:
+        loadCatalog(args.catalog)
+    except (OSError, ValueError) as e:
+        parser.error("--catalog: " + str(e))
+
+    settings = (args.engine, args.order, args.cache_size, args.catalog)
+    outfile = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        counts = makePuzzles(outfile, settings, args.count, args.seed, args.workers, args.max_pieces, sys.stderr,
+                             args.report_every)
+    finally:
+        if(outfile is not sys.stdout):
+            outfile.close()
+    print(counts, file=sys.stderr)
@@ -0,0 +1,86 @@
+##
+# @file         Regions.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Decides whether the pieces that are left could still fill an empty region of the board
+
+class PruneStats():
+
+    ##
+    # @function     init
+    # @purpose      PruneStats constructor. Counts how often the region check cuts off the search
+    # @param        self - the PruneStats instance
+    def __init__(self):
+        self.placements = 0     # placements whose empty regions were labelled
+        self.regions = 0        # empty regions labelled
+        self.tooSmall = 0       # placements rejected for a region smaller than the smallest piece left
+        self.noSum = 0          # placements rejected for a region no pieces left add up to
+
+    ##
+    # @function     pruned
+    # @purpose      The number of placements rejected by the region check
+    # @param        self - the PruneStats instance
+    def pruned(self):
+        return self.tooSmall + self.noSum
+
+    ##
+    # @function     add
+    # @purpose      Adds the counts from another PruneStats, such as one from a worker process
+    # @param        self - the PruneStats instance
+    # @param        other - the PruneStats to add
+    def add(self, other):
+        self.placements += other.placements
+        self.regions += other.regions
+        self.tooSmall += other.tooSmall
+        self.noSum += other.noSum
+
+    ##
+    # @function     str
+    # @purpose      String version of the statistics so they can be printed
+    # @param        self - the PruneStats instance
+    def __str__(self):
+        percent = 100 * self.pruned() / self.placements if self.placements else 0
+        return ("Placements checked: " + str(self.placements) + "\n"
+                + "Regions labelled:   " + str(self.regions) + "\n"
+                + "Pruned too small:   " + str(self.tooSmall) + "\n"
+                + "Pruned no sum:      " + str(self.noSum) + "\n"
+                + "Pruned total:       " + str(self.pruned()) + " (" + format(percent, ".1f") + "%)")
+
+class RegionCheck():
+
+    ##
+    # @function     init
+    # @purpose      RegionCheck constructor. Finds every region size the remaining pieces can fill
+    # @param        self - the RegionCheck instance
+    # @param        sizes - the number of spots in each piece still to be placed, None if it is not known
+    #               which pieces are left (any region of at least 3 spots is then allowed)
+    # @param        stats - the PruneStats to count in, or None to not count
+    def __init__(self, sizes=None, stats=None):
+        self.stats = stats
+        if(sizes is None):
+            self.smallest = 3
+            self.sums = None
+        else:
+            # Bit n of sums is set when some of the remaining pieces add up to exactly n spots
+            self.smallest = min(sizes) if len(sizes) > 0 else 0
+            self.sums = 1
+            for s in sizes:
+                self.sums |= self.sums << s
+
+    ##
+    # @function     canFill
+    # @purpose      Checks if the remaining pieces could exactly fill an empty region
+    # @param        self - the RegionCheck instance
+    # @param        size - the number of spots in the region
+    def canFill(self, size):
+        if(self.stats):
+            self.stats.regions += 1
+        if(size < self.smallest):
+            if(self.stats):
+                self.stats.tooSmall += 1
+            return False
+        if(self.sums is not None and not (self.sums >> size) & 1):
+            if(self.stats):
+                self.stats.noSum += 1
+            return False
+        return True
@@ -0,0 +1,467 @@
+##
+# @file         Service.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Keeps the solver running as a local HTTP service, so tools that ask it about starting positions
+#               don't each start a process and build the pieces and placement tables again. Positions are
+#               solved on a pool of worker processes that are already set up, and answers are cached under the
+#               position's smallest mirror image, so asking again or asking about a mirror image doesn't search
+#
+#               Requests and answers are JSON objects:
+#                 POST /count     {"position": {color: [[row, column], ...], ...}}
+#                                 -> {"count": n, "cached": true or false}
+#                 POST /solve     {"position": ..., "limit": most solutions (default 1), "count": true to count too}
+#                                 -> {"solutions": [[row of characters, ...], ...], "cached": true or false}
+#                 GET  /metrics   the numbers of requests, the cache hits and misses, and the latency and
+#                                 throughput of the requests
+#                 GET  /health    {"ok": true}
+#               Anything that goes wrong is answered with {"error": message}. The status is 400 for a bad request,
+#               404 for an unknown path, 413 for a request that is too big, 500 when the search fails, 503 when
+#               too many requests are already being answered, and 504 when the search takes longer than the
+#               search timeout, which stops it so the worker can take the next query. The solutions of a mirror
+#               image of a position that was searched are the mirror images of that position's solutions, so with
+#               a limit they can be different ones than searching for the position itself would find first
+
+# Imports
+import argparse, http.server, json, multiprocessing, os, signal, sys, threading, time
+from collections import deque
+import batch
+from cache import TranspositionCache
+from catalog import loadCatalog, startPosition
+from placements import PlacementTable
+import vectorized
+
+# The most bytes of JSON a request can send
+MAX_BODY = 1 << 16
+
+# The paths that ask about a position
+QUERIES = ["/count", "/solve"]
+
+# The extra seconds to wait for a worker to answer after its search should have been stopped
+GRACE = 5.0
+
+class QueryFailed(Exception):
+
+    ##
+    # @function     init
+    # @purpose      QueryFailed constructor. Raised when a query can't be answered through no fault of the request
+    # @param        self - the QueryFailed instance
+    # @param        status - the HTTP status to answer with
+    # @param        message - what went wrong
+    def __init__(self, status, message):
+        Exception.__init__(self, message)
+        self.status = status
+
+# Raised in a worker process by stopSearch when the query's time is up
+class SearchTimeout(Exception):
+    pass
+
+##
+# @function     stopSearch
+# @purpose      Stops the search in a worker process when its time is up, only called by the SIGALRM timer
+# @param        signum - the signal number
+# @param        frame - the frame the search was in
+def stopSearch(signum, frame):
+    raise SearchTimeout("the search took longer than the search timeout")
+
+##
+# @function     runQuery
+# @purpose      Answers one position in a worker process, which has a BatchWorker from batch.startWorker
+# @param        query - the (position, wantCount, limit) to answer, see BatchWorker.answer
+# @param        timeout - the most seconds to search for, None for no limit. Only stopped where there is a
+#               SIGALRM timer, elsewhere the service still answers 504 but the worker finishes the search
+# @return       the dictionary of results, or of the "error" and, when it isn't the request's fault, the "status"
+def runQuery(query, timeout=None):
+    timed = timeout is not None and hasattr(signal, "setitimer")
+    if(timed):
+        signal.signal(signal.SIGALRM, stopSearch)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return batch.worker.answer(*query)
+    except SearchTimeout as e:
+        return {"error": str(e), "status": 504}
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": "the search failed: " + repr(e), "status": 500}
+    finally:
+        if(timed):
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+class ServiceMetrics():
+
+    ##
+    # @function     init
+    # @purpose      ServiceMetrics constructor. Counts the requests the service answers and how long they take
+    # @param        self - the ServiceMetrics instance
+    # @param        window - the number of the latest requests to work out the latencies from
+    def __init__(self, window=1024):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.requests = {}          # path to the number of requests for it
+        self.statuses = {}          # status to the number of answers with it
+        self.answered = 0           # queries answered, from the cache or not
+        self.searched = 0           # queries sent to the workers
+        self.coalesced = 0          # queries that waited for the same query already being searched
+        self.rejected = 0           # queries turned away because too many were being answered
+        self.inFlight = 0           # queries being answered right now
+        # The (time it finished, seconds it took) of the latest queries
+        self.latencies = deque(maxlen=window)
+
+    ##
+    # @function     record
+    # @purpose      Counts a request once it is answered
+    # @param        self - the ServiceMetrics instance
+    # @param        path - the path asked for
+    # @param        status - the HTTP status answered with
+    # @param        seconds - how long it took to answer, None to not count it as a query
+    def record(self, path, status, seconds=None):
+        with self.lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            self.statuses[str(status)] = self.statuses.get(str(status), 0) + 1
+            if(seconds is not None):
+                self.answered += 1
+                self.latencies.append((time.monotonic(), seconds))
+
+    ##
+    # @function     add
+    # @purpose      Adds to one of the counts
+    # @param        self - the ServiceMetrics instance
+    # @param        name - the name of the count, such as "searched"
+    # @param        n - the amount to add
+    def add(self, name, n=1):
+        with self.lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    ##
+    # @function     toDict
+    # @purpose      The metrics as a dictionary, ready to be written as JSON
+    # @param        self - the ServiceMetrics instance
+    # @param        cache - the CacheStats of the service's cache
+    # @param        entries - the number of entries in the cache
+    def toDict(self, cache, entries):
+        with self.lock:
+            now = time.monotonic()
+            uptime = now - self.started
+            seconds = sorted(s for t, s in self.latencies)
+            recent = sum(1 for t, s in self.latencies if now - t <= 60)
+            latency = {"window": len(seconds)}
+            if(seconds):
+                latency["mean"] = sum(seconds) / len(seconds)
+                for name, q in [("p50", 0.5), ("p95", 0.95), ("p99", 0.99)]:
+                    latency[name] = seconds[min(len(seconds) - 1, int(q * len(seconds)))]
+                latency["max"] = seconds[-1]
+            return {"uptime": uptime, "requests": dict(self.requests), "statuses": dict(self.statuses),
+                    "answered": self.answered, "searched": self.searched, "coalesced": self.coalesced,
+                    "rejected": self.rejected, "inFlight": self.inFlight, "latencySeconds": latency,
+                    "throughput": {"perSecond": self.answered / uptime if uptime else 0,
+                                   "lastMinutePerSecond": recent / min(60, uptime) if uptime else 0},
+                    "cache": {"entries": entries, "hits": cache.hits, "misses": cache.misses,
+                              "stores": cache.stores, "evictions": cache.evictions}}
+
+class SolverService():
+
+    ##
+    # @function     init
+    # @purpose      SolverService constructor. Starts the worker processes
+    # @param        self - the SolverService instance
+    # @param        settings - the arguments for each worker's BatchWorker, see batch.py
+    # @param        workers - the number of worker processes, 0 for one per core
+    # @param        maxConcurrent - the most queries to answer at once, None for twice the number of workers
+    # @param        queueTimeout - the seconds a query waits for its turn before it is turned away
+    # @param        cacheEntries - the most answers to cache
+    # @param        maxLimit - the most solutions one query can ask for
+    # @param        searchTimeout - the most seconds a query can search for, None for no limit
+    def __init__(self, settings, workers=0, maxConcurrent=None, queueTimeout=5.0, cacheEntries=100000,
+                 maxLimit=1000, searchTimeout=30.0):
+        rows, cols, self.pieces = loadCatalog(settings[6])
+        self.rows = rows
+        self.cols = cols
+        self.table = PlacementTable(self.pieces, rows, cols)
+        self.symmetries = self.findSymmetries()
+
+        if(not workers):
+            workers = os.cpu_count()
+        self.pool = multiprocessing.Pool(workers, batch.startWorker, (settings,))
+        self.slots = threading.BoundedSemaphore(maxConcurrent or 2 * workers)
+        self.queueTimeout = queueTimeout
+        self.maxLimit = maxLimit
+        self.searchTimeout = searchTimeout
+
+        # The cache and the queries being searched are shared by every request thread
+        self.lock = threading.Lock()
+        self.cache = TranspositionCache(cacheEntries)
+        self.pending = {}
+        self.metrics = ServiceMetrics()
+
+    ##
+    # @function     close
+    # @purpose      Stops the worker processes
+    # @param        self - the SolverService instance
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+    ##
+    # @function     moveSpot
+    # @purpose      Moves a spot by a symmetry
+    # @param        self - the SolverService instance
+    # @param        g - the symmetry, (mirror the rows, mirror the columns)
+    # @param        r - the row of the spot
+    # @param        c - the column of the spot
+    # @return       the moved (row, column)
+    def moveSpot(self, g, r, c):
+        return (self.rows - 1 - r if g[0] else r, self.cols - 1 - c if g[1] else c)
+
+    ##
+    # @function     findSymmetries
+    # @purpose      Finds the symmetries of the board that move every placement of every piece on to another
+    #               placement, so they move every solution on to another solution. With the Kanoodle pieces
+    #               that is all of them, a catalog can have pieces that can't be flipped
+    # @param        self - the SolverService instance
+    # @return       the list of symmetries, starting with the one that leaves everything where it is
+    def findSymmetries(self):
+        found = [(False, False)]
+        for g in [(True, False), (False, True), (True, True)]:
+            if(all(self.table.maskOf([self.moveSpot(g, r, c) for r, c in pl.shape]) in self.table.byMask[color]
+                   for color in self.table.placements for pl in self.table.placements[color])):
+                found.append(g)
+        return found
+
+    ##
+    # @function     canonical
+    # @purpose      Turns a position into the smallest of its mirror images, which is what the cache is keyed on
+    # @param        self - the SolverService instance
+    # @param        position - the dictionary of piece color to the [row, column] spots it starts on
+    # @return       the symmetry that turns it, and the turned position as a sorted tuple of (color, spots)
+    def canonical(self, position):
+        best = None
+        for g in self.symmetries:
+            moved = tuple(sorted((color, tuple(sorted(self.moveSpot(g, r, c) for r, c in position[color])))
+                                 for color in position))
+            if(best is None or moved < best[1]):
+                best = (g, moved)
+        return best
+
+    ##
+    # @function     moveSolution
+    # @purpose      Moves a solution by a symmetry
+    # @param        self - the SolverService instance
+    # @param        g - the symmetry
+    # @param        rows - the rows of characters of the solution
+    # @return       the list of moved rows
+    def moveSolution(self, g, rows):
+        if(g[0]):
+            rows = rows[::-1]
+        return [row[::-1] for row in rows] if g[1] else list(rows)
+
+    ##
+    # @function     answer
+    # @purpose      Answers a position from the cache, or from the workers if no one has asked it yet. When the
+    #               same query is already being searched, it waits for that search instead of starting another
+    # @param        self - the SolverService instance
+    # @param        position - the dictionary of piece color to the [row, column] spots it starts on
+    # @param        wantCount - True to count every solution
+    # @param        limit - the most solutions to find, 0 for none
+    # @return       the dictionary of results
+    def answer(self, position, wantCount, limit):
+        # Checking the position here keeps bad ones out of the cache and the workers
+        startPosition(position, self.pieces, self.table)
+        g, moved = self.canonical(position)
+        key = (moved, wantCount, limit)
+
+        searching = False
+        with self.lock:
+            result = self.cache.get(key)
+            if(result is None):
+                pending = self.pending.get(key)
+                if(pending is None):
+                    query = ({color: [list(c) for c in cells] for color, cells in moved}, wantCount, limit)
+                    pending = self.pool.apply_async(runQuery, (query, self.searchTimeout))
+                    self.pending[key] = pending
+                    searching = True
+        cached = result is not None
+        if(not cached):
+            self.metrics.add("searched" if searching else "coalesced")
+            try:
+                # The worker stops the search itself, this is in case it can't
+                result = pending.get(None if self.searchTimeout is None else self.searchTimeout + GRACE)
+            except multiprocessing.TimeoutError:
+                raise QueryFailed(504, "the search took longer than the search timeout")
+            except Exception as e:
+                raise QueryFailed(500, "the search failed: " + repr(e))
+            finally:
+                if(searching):
+                    with self.lock:
+                        del self.pending[key]
+                        if(result is not None and "error" not in result):
+                            self.cache.put(key, result)
+        if("error" in result):
+            if("status" in result):
+                raise QueryFailed(result["status"], result["error"])
+            raise ValueError(result["error"])
+
+        answer = {}
+        if("count" in result):
+            answer["count"] = result["count"]
+        if("solutions" in result):
+            answer["solutions"] = [self.moveSolution(g, rows) for rows in result["solutions"]]
+        answer["cached"] = cached
+        return answer
+
+    ##
+    # @function     handle
+    # @purpose      Answers one POST request
+    # @param        self - the SolverService instance
+    # @param        path - the path asked for
+    # @param        data - the bytes of the request, None if there were too many
+    # @return       the HTTP status and the dictionary to answer with
+    def handle(self, path, data):
+        if(path not in QUERIES):
+            return 404, {"error": "unknown path " + path}
+        if(data is None):
+            return 413, {"error": "the request is over " + str(MAX_BODY) + " bytes"}
+        try:
+            body = json.loads(data)
+        except ValueError:
+            return 400, {"error": "the request is not JSON"}
+        if(not isinstance(body, dict) or "position" not in body):
+            return 400, {"error": "the request must be an object with a position"}
+        if(path == "/count"):
+            wantCount, limit = True, 0
+        else:
+            wantCount, limit = bool(body.get("count", False)), body.get("limit", 1)
+            if(not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= self.maxLimit):
+                return 400, {"error": "the limit must be from 1 to " + str(self.maxLimit)}
+
+        if(not self.slots.acquire(timeout=self.queueTimeout)):
+            self.metrics.add("rejected")
+            return 503, {"error": "the service is busy, try again later"}
+        self.metrics.add("inFlight")
+        try:
+            return 200, self.answer(body["position"], wantCount, limit)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except QueryFailed as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": "the query failed: " + repr(e)}
+        finally:
+            self.metrics.add("inFlight", -1)
+            self.slots.release()
+
+class ServiceHandler(http.server.BaseHTTPRequestHandler):
+
+    ##
+    # @function     do_GET
+    # @purpose      Answers the metrics and health checks
+    # @param        self - the ServiceHandler instance
+    def do_GET(self):
+        service = self.server.service
+        if(self.path == "/metrics"):
+            with service.lock:
+                entries = len(service.cache.entries)
+            status, body = 200, service.metrics.toDict(service.cache.stats, entries)
+        elif(self.path == "/health"):
+            status, body = 200, {"ok": True}
+        else:
+            status, body = 404, {"error": "unknown path " + self.path}
+        self.reply(status, body)
+        service.metrics.record(self.path, status)
+
+    ##
+    # @function     do_POST
+    # @purpose      Answers a query about a position
+    # @param        self - the ServiceHandler instance
+    def do_POST(self):
+        start = time.perf_counter()
+        length = int(self.headers.get("Content-Length") or 0)
+        if(length > MAX_BODY):
+            # The rest of the request is never read, so the connection can't be used again
+            self.close_connection = True
+            data = None
+        else:
+            data = self.rfile.read(length)
+        status, body = self.server.service.handle(self.path, data)
+        self.reply(status, body)
+        self.server.service.metrics.record(self.path, status,
+                                           time.perf_counter() - start if self.path in QUERIES else None)
+
+    ##
+    # @function     reply
+    # @purpose      Writes the answer to a request
+    # @param        self - the ServiceHandler instance
+    # @param        status - the HTTP status
+    # @param        body - the dictionary to write as JSON
+    def reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    ##
+    # @function     log_message
+    # @purpose      Keeps quiet about each request, the metrics count them instead
+    # @param        self - the ServiceHandler instance
+    def log_message(self, format, *args):
+        pass
+
+##
+# @function     Main
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Answers Kanoodle starting positions over HTTP on localhost")
+    parser.add_argument("--port", type=int, default=8765,
+                        help="the port to listen on (default 8765)")
+    parser.add_argument("--engine", choices=["grid", "bitboard", "numpy", "dlx"], default="bitboard",
+                        help="the engine to search with, see main.py (default bitboard)")
+    parser.add_argument("--order", choices=["fixed", "cell", "constrained", "piece"], default="constrained",
+                        help="the order to search in, see main.py (default constrained)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="the number of worker processes, 0 for one per core (default 0)")
+    parser.add_argument("--max-concurrent", type=int, default=None,
+                        help="the most requests to answer at once, the rest wait (default twice the workers)")
+    parser.add_argument("--queue-timeout", type=float, default=5,
+                        help="the seconds a request waits to be answered before it is turned away with a 503 "
+                        "(default 5)")
+    parser.add_argument("--search-timeout", type=float, default=30,
+                        help="the most seconds a query can search for before it is stopped and answered with a 504, "
+                        "0 for no limit (default 30)")
+    parser.add_argument("--cache-entries", type=int, default=100000,
+                        help="the most answers to remember (default 100000)")
+    parser.add_argument("--max-limit", type=int, default=1000,
+                        help="the most solutions a request can ask for (default 1000)")
+    parser.add_argument("--symmetry", action="store_true",
+                        help="count using the symmetries of each starting position, see main.py")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="the most entries for each worker's search cache (default 0, no cache)")
+    parser.add_argument("--catalog", default=None,
+                        help="read the board size and pieces from this JSON file, see catalog.py")
+    args = parser.parse_args()
+    if(args.order != "fixed" and args.engine != "bitboard"):
+        parser.error("--order " + args.order + " needs --engine bitboard")
+    if(args.engine == "numpy" and not vectorized.AVAILABLE):
+        parser.error("--engine numpy needs numpy installed")
+    try:
+        loadCatalog(args.catalog)
+    except (OSError, ValueError) as e:
+        parser.error("--catalog: " + str(e))
+
+    settings = (args.engine, args.order, True, True, args.symmetry, args.cache_size, args.catalog)
+    service = SolverService(settings, args.workers, args.max_concurrent, args.queue_timeout, args.cache_entries,
+                            args.max_limit, args.search_timeout or None)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", args.port), ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    # Being told to quit stops the server the same way as Ctrl-C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print("listening on http://127.0.0.1:" + str(args.port), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
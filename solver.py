@@ -0,0 +1,942 @@
+##
+# @file         Solver.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      The search for every way to place the remaining pieces on a board.
+#               Everything the search needs is kept on the Solver instead of in globals,
+#               and solutions are handed back one at a time as they are found
+
+# Imports
+from board import Board
+from bitboard import BitBoard
+from checkpoint import SearchStopped
+import dlx
+import parallel
+import vectorized
+from placements import PlacementTable
+from regions import RegionCheck
+from stats import CountingBitBoard, CountingBoard
+from symmetry import Symmetry
+
+##
+# @function     tally
+# @purpose      Adds to the number of solutions a placement is part of
+# @param        breakdown - the dictionary of (color, shape) to number of solutions
+# @param        pl - the placement
+# @param        n - the number of solutions to add
+def tally(breakdown, pl, n):
+    key = (pl.color, pl.shape)
+    breakdown[key] = breakdown.get(key, 0) + n
+
+class Solution():
+
+    ##
+    # @function     init
+    # @purpose      Solution constructor. One way to fill the board
+    # @param        self - the Solution instance
+    # @param        start - the Board holding only the starting pieces
+    # @param        startCells - the dictionary of starting piece color to the spots it covers
+    # @param        placements - the placements that finish the board
+    def __init__(self, start, startCells, placements):
+        self.start = start
+        self.startCells = startCells
+        self.placements = tuple(placements)
+
+        # Piece color to the (row, column) spots it covers, for every piece on the board
+        self.cells = dict(startCells)
+        for pl in self.placements:
+            self.cells[pl.color] = pl.shape
+
+    ##
+    # @function     withPlacements
+    # @purpose      Makes a Solution with the same starting pieces but different placements
+    # @param        self - the Solution instance
+    # @param        placements - the placements that finish the board
+    def withPlacements(self, placements):
+        return Solution(self.start, self.startCells, placements)
+
+    ##
+    # @function     toBoard
+    # @purpose      Builds the character Board for the solution, only needed to print it
+    # @param        self - the Solution instance
+    # @return       a new Board with every piece placed
+    def toBoard(self):
+        solved = Board(self.start.rows, self.start.cols)
+        solved.board = [row.copy() for row in self.start.board]
+        for pl in self.placements:
+            solved.placePiece(pl)
+        return solved
+
+    ##
+    # @function     str
+    # @purpose      String version of the solution so it can be printed
+    # @param        self - the Solution instance
+    def __str__(self):
+        return str(self.toBoard())
+
+class Solver():
+
+    ##
+    # @function     init
+    # @purpose      Solver constructor. Creates a Solver for a board holding the starting pieces
+    # @param        self - the Solver instance
+    # @param        board - the Board holding the starting pieces
+    # @param        table - the PlacementTable of every piece
+    # @param        engine - "grid" to search on the character board, "bitboard" to search on a single integer,
+    #               "numpy" to search on the bitboard with NumPy finding the placements of each piece that fit
+    #               or "dlx" to solve it as an exact cover problem with Dancing Links
+    # @param        order - "fixed" to place the pieces in the order given, "cell" to fill the first open spot,
+    #               "constrained" to fill the open spot with the fewest open neighbours or "piece" to place the
+    #               remaining piece with the fewest placements that still fit (bitboard only)
+    # @param        stats - the PruneStats to count in, or None to not count
+    # @param        cache - the TranspositionCache to remember solution counts and dead ends in, or None.
+    #               Only the bitboard engine uses it, and it can be shared by Solvers for different
+    #               starting positions as long as they use the same pieces
+    # @param        solverStats - the SolverStats to count the search's checks in, or None to not count.
+    #               The grid and bitboard engines are counted, Dancing Links makes no placement checks
+    # @param        control - the SearchControl to stop the search with and save its frontier to, or None.
+    #               The grid and bitboard engines check it at every placement, Dancing Links can't be stopped
+    # @param        progress - the ProgressReporter to count the placements made in, or None. Dancing Links makes
+    #               no placements to count
+    def __init__(self, board, table, engine="bitboard", order="fixed", stats=None, cache=None, solverStats=None,
+                 control=None, progress=None):
+        self.board = board
+        self.table = table
+        self.engine = engine
+        self.order = order
+        self.stats = stats
+        self.cache = cache
+        self.bits = BitBoard.fromBoard(board)
+        self.fitter = vectorized.FitTable(table) if engine == "numpy" else None
+
+        # Counting is done by boards standing in for the real ones, so the search itself is the same either way
+        self.solverStats = solverStats
+        if(solverStats is not None):
+            self.board = CountingBoard(board, solverStats)
+            self.bits = CountingBitBoard(self.bits, solverStats)
+
+        # The number of solutions made, so the search can tell when a subtree was a dead end
+        self.found = 0
+
+        # A copy of the starting pieces for the solutions to be built from,
+        # since the search writes on board when the engine is grid
+        self.start = Board(board.rows, board.cols)
+        self.start.board = [row.copy() for row in board.board]
+        self.startCells = {}
+        for r in range(len(board.board)):
+            for c in range(len(board.board[r])):
+                if(not board.isEmptySpot(r, c)):
+                    self.startCells[board.board[r][c]] = self.startCells.get(board.board[r][c], ()) + ((r, c),)
+
+        # When splitAt is more than 0, the search stops after that many placements and
+        # saves each (placements, remaining pieces) it reaches in subproblems instead
+        self.splitAt = 0
+        self.subproblems = []
+
+        # While resuming, the (placements, after) frontier to skip ahead to, see checkpoint.py
+        self.control = control
+        self.resume = None
+        self.base = 0
+
+        # Counts the placements made and the branches of the first level finished, see progress.py
+        self.progress = progress
+
+    ##
+    # @function     search
+    # @purpose      Finds every solution for the remaining pieces
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        placed - placements to make before searching, on top of the starting pieces
+    # @param        resume - the frontier of a checkpoint to carry on from, see checkpoint.py, or None
+    # @return       a generator of Solutions, the board is put back the way it was when it is finished or closed
+    def search(self, pieces, placed=(), resume=None):
+        placed = list(placed)
+        startFilled = self.bits.filled
+        startDepth = len(self.board.journal)
+        for pl in placed:
+            self.board.apply(pl)
+            self.bits.place(pl.mask)
+        self.base = len(placed)
+        if(resume and resume["path"]):
+            try:
+                self.resume = ([self.table.byMask[color][mask] for color, mask in resume["path"]], resume["after"])
+            except KeyError:
+                raise ValueError("the checkpoint has a placement that isn't in the table")
+        if(self.progress is not None and self.engine != "dlx" and not self.splitAt):
+            branches = [pl for pl, rest in self.branches(pieces)]
+            # A resumed search never makes the placements of the first level's branches before the path's
+            skipped = 0
+            if(self.resume is not None and self.resume[0][0] in branches):
+                path, after = self.resume
+                skipped = branches.index(path[0]) + (1 if after and len(path) == 1 else 0)
+            self.progress.begin(len(branches), len(pieces), skipped)
+
+        try:
+            if(len(pieces) == 0):
+                found = iter([self.solution(placed)])
+            elif(self.engine == "grid"):
+                found = self.tryPlace(pieces, placed)
+            elif(self.engine == "dlx"):
+                found = self.tryPlaceDLX(pieces, placed)
+            elif(self.order == "piece"):
+                found = self.tryPlacePieces(pieces, placed, self.fitting(pieces))
+            elif(self.order != "fixed"):
+                found = self.tryPlaceCells(pieces, placed)
+            else:
+                found = self.tryPlaceBits(pieces, placed)
+
+            if(self.control is None):
+                yield from found
+            else:
+                for s in found:
+                    self.control.passed(self.frontier(s.placements, True))
+                    yield s
+        except SearchStopped as e:
+            self.control.frontier = e.frontier
+        finally:
+            # If the search was stopped early, the pieces it was in the middle of are still on the board
+            self.board.undoTo(startDepth)
+            self.bits.reset(startFilled)
+
+    ##
+    # @function     frontier
+    # @purpose      Makes the frontier to save in a checkpoint, see checkpoint.py
+    # @param        self - the Solver instance
+    # @param        placed - the placements on the stack
+    # @param        after - True if the solution or subtree at the end of placed is done
+    def frontier(self, placed, after):
+        return {"path": [[pl.color, pl.mask] for pl in placed[self.base:]], "after": after}
+
+    ##
+    # @function     resumeFrom
+    # @purpose      Finds where to start trying placements when resuming from a checkpoint
+    # @param        self - the Solver instance
+    # @param        placed - the placements made so far
+    # @param        candidates - the list of placements that would be tried
+    # @return       the index in candidates to start at
+    def resumeFrom(self, placed, candidates):
+        path, after = self.resume
+        d = len(placed) - self.base
+        # Only the subtree on the path is skipped into, once the search is anywhere else it is past the path
+        # and everything is searched like normal
+        if(d >= len(path) or placed[self.base:] != path[:d]):
+            self.resume = None
+            return 0
+        if(path[d] not in candidates):
+            return 0
+        if(d == len(path) - 1):
+            self.resume = None
+            return candidates.index(path[d]) + (1 if after else 0)
+        return candidates.index(path[d])
+
+    ##
+    # @function     checkIn
+    # @purpose      Asks the SearchControl if the search has to stop, and saves a checkpoint when it is time,
+    #               just before a placement is made
+    # @param        self - the Solver instance
+    # @param        placed - the placements made so far
+    # @param        pl - the placement about to be made
+    def checkIn(self, placed, pl):
+        # Still skipping ahead to where a checkpoint left off, stopping now would lose track of it
+        if(self.resume is not None):
+            return
+        if(self.control.check()):
+            raise SearchStopped(self.frontier(placed + [pl], False))
+        if(self.control.saveDue):
+            self.control.save(self.frontier(placed + [pl], False))
+
+    ##
+    # @function     split
+    # @purpose      Runs the first levels of the search and returns where it got to instead of finishing it
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        depth - the number of placements to make before stopping, at least 1
+    # @return       the list of (placements, remaining pieces), in the order the full search would reach them
+    def split(self, pieces, depth):
+        if(depth < 1):
+            raise ValueError("the search has to be split after at least 1 placement")
+        if(not pieces):
+            # The board is already full, which is one subproblem with nothing left to place
+            return [([], pieces)]
+        self.splitAt = min(depth, len(pieces))
+        self.subproblems = []
+        for s in self.search(pieces):
+            pass
+        self.splitAt = 0
+        return self.subproblems
+
+    ##
+    # @function     count
+    # @purpose      Counts the solutions for the remaining pieces without building any of them
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        placed - placements to make before counting, on top of the starting pieces
+    # @param        breakdown - a dictionary to add the number of solutions each (color, shape) placement
+    #               is part of to, or None
+    # @return       the number of solutions
+    def count(self, pieces, placed=(), breakdown=None):
+        if(self.engine == "grid"):
+            # The grid engine has no counting search of its own, so count the solutions it finds
+            n = 0
+            for s in self.search(pieces, placed):
+                n += 1
+                if(breakdown is not None):
+                    for pl in s.placements:
+                        tally(breakdown, pl, 1)
+            return n
+
+        startFilled = self.bits.filled
+        for pl in placed:
+            self.bits.place(pl.mask)
+        if(self.progress is not None and self.engine != "dlx"):
+            self.progress.begin(len(self.branches(pieces)), len(pieces))
+        try:
+            if(len(pieces) == 0):
+                n = 1
+            elif(self.engine == "dlx"):
+                links = dlx.fromBoard(self.bits, pieces, self.table)
+                n = links.count(None if breakdown is None else lambda pl, k: tally(breakdown, pl, k))
+            elif(self.order == "piece"):
+                n = self.countPieces(pieces, breakdown, self.fitting(pieces))
+            elif(self.order != "fixed"):
+                n = self.countCells(pieces, breakdown)
+            else:
+                n = self.countBits(pieces, breakdown)
+        finally:
+            self.bits.reset(startFilled)
+
+        if(breakdown is not None and n):
+            for pl in placed:
+                tally(breakdown, pl, n)
+        return n
+
+    ##
+    # @function     cacheKey
+    # @purpose      The key to look up the filled spots and remaining pieces in the cache with
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @return       the (filled mask, remaining piece colors, table restriction) tuple
+    def cacheKey(self, pieces):
+        # Placing pieces never changes the order of the ones left, so their colors always join the same way
+        return (self.bits.filled, "".join(p.color for p in pieces), self.table.restriction)
+
+    ##
+    # @function     countLast
+    # @purpose      Counts the ways to finish the board with one piece left, which is at most one
+    # @param        self - the Solver instance
+    # @param        p - the last piece
+    # @param        breakdown - the dictionary of placement counts, or None
+    # @return       1 if the piece exactly fills the open spots, otherwise 0
+    def countLast(self, p, breakdown):
+        pl = self.table.byMask[p.color].get(self.bits.full & ~self.bits.filled)
+        if(pl is None):
+            return 0
+        if(breakdown is not None):
+            tally(breakdown, pl, 1)
+        return 1
+
+    ##
+    # @function     countBits
+    # @purpose      Recursively counts the solutions on the bitboard, placing the pieces in order
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        breakdown - the dictionary of placement counts, or None
+    # @return       the number of solutions
+    def countBits(self, pieces, breakdown):
+        if(len(pieces) == 1):
+            return self.countLast(pieces[0], breakdown)
+        # A cached count can't say which placements its solutions used, so it is no use to a breakdown
+        cache = self.cache if breakdown is None else None
+        if(cache):
+            key = self.cacheKey(pieces)
+            total = cache.get(key)
+            if(total is not None):
+                return total
+        bits = self.bits
+        p = pieces[0]
+        check = RegionCheck([len(q.shape) for q in pieces[1:]], self.stats)
+
+        total = 0
+        for pl in self.candidates(p):
+            if(bits.isValidPlacement(pl, check)):
+                if(self.progress is not None):
+                    self.progress.placed(len(pieces))
+                bits.place(pl.mask)
+                n = self.countBits(pieces[1:], breakdown)
+                bits.remove(pl.mask)
+                # Every solution under this placement uses it
+                if(n and breakdown is not None):
+                    tally(breakdown, pl, n)
+                total += n
+        if(cache):
+            cache.put(key, total)
+        return total
+
+    ##
+    # @function     countPieces
+    # @purpose      Recursively counts the solutions on the bitboard, placing the piece with the fewest placements
+    #               left first
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        breakdown - the dictionary of placement counts, or None
+    # @param        live - the dictionary of piece color to the list of its placements that fit, see fitting
+    # @return       the number of solutions
+    def countPieces(self, pieces, breakdown, live):
+        if(len(pieces) == 1):
+            return self.countLast(pieces[0], breakdown)
+        cache = self.cache if breakdown is None else None
+        if(cache):
+            key = self.cacheKey(pieces)
+            total = cache.get(key)
+            if(total is not None):
+                return total
+        bits = self.bits
+        i = self.fewestPlacements(pieces, live)
+        p = pieces[i]
+        rest = pieces[:i] + pieces[i + 1:]
+        check = RegionCheck([len(q.shape) for q in rest], self.stats)
+
+        total = 0
+        for pl in live[p.color]:
+            if(bits.isValidPlacement(pl, check)):
+                if(self.progress is not None):
+                    self.progress.placed(len(pieces))
+                bits.place(pl.mask)
+                n = self.countPieces(rest, breakdown, self.narrow(rest, live, pl.mask))
+                bits.remove(pl.mask)
+                if(n and breakdown is not None):
+                    tally(breakdown, pl, n)
+                total += n
+        if(cache):
+            cache.put(key, total)
+        return total
+
+    ##
+    # @function     countCells
+    # @purpose      Recursively counts the solutions on the bitboard, filling one open spot at a time
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        breakdown - the dictionary of placement counts, or None
+    # @return       the number of solutions
+    def countCells(self, pieces, breakdown):
+        if(len(pieces) == 1):
+            return self.countLast(pieces[0], breakdown)
+        cache = self.cache if breakdown is None else None
+        if(cache):
+            key = self.cacheKey(pieces)
+            total = cache.get(key)
+            if(total is not None):
+                return total
+        bits = self.bits
+        spot = bits.firstOpen() if self.order == "cell" else bits.mostConstrained()
+
+        total = 0
+        checks = {}
+        for i in range(len(pieces)):
+            p = pieces[i]
+            rest = pieces[:i] + pieces[i + 1:]
+            if(len(p.shape) not in checks):
+                checks[len(p.shape)] = RegionCheck([len(q.shape) for q in rest], self.stats)
+            check = checks[len(p.shape)]
+
+            for pl in self.table.covering[p.color][spot]:
+                if(bits.isValidPlacement(pl, check)):
+                    if(self.progress is not None):
+                        self.progress.placed(len(pieces))
+                    bits.place(pl.mask)
+                    n = self.countCells(rest, breakdown)
+                    bits.remove(pl.mask)
+                    if(n and breakdown is not None):
+                        tally(breakdown, pl, n)
+                    total += n
+        if(cache):
+            cache.put(key, total)
+        return total
+
+    ##
+    # @function     solution
+    # @purpose      Makes the Solution for the current placements
+    # @param        self - the Solver instance
+    # @param        placed - the placements added to the starting pieces
+    def solution(self, placed):
+        self.found += 1
+        return Solution(self.start, self.startCells, placed)
+
+    ##
+    # @function     tryPlace
+    # @purpose      Recursively places all the pieces on the board in every avaliable viable position
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        placed - the placements made so far
+    # @return       a generator of Solutions
+    def tryPlace(self, pieces, placed):
+
+        # Next piece to place is the first piece in pieces
+        p = pieces[0]
+
+        # The region sizes the pieces after this one could still fill
+        check = RegionCheck([len(q.shape) for q in pieces[1:]], self.stats)
+
+        # For each precomputed orientation and position of the piece,
+        # 1 - if that is a valid placement, place the piece, then tryPlace next piece
+        # 2 - remove the piece and try next placement
+        candidates = self.table.placements[p.color]
+        if(self.resume is not None):
+            candidates = candidates[self.resumeFrom(placed, candidates):]
+        for pl in candidates:
+            if(self.board.isValidPlacement(pl, check)):
+                if(self.control is not None):
+                    self.checkIn(placed, pl)
+                if(self.progress is not None):
+                    self.progress.placed(len(pieces))
+                self.board.apply(pl)
+                placed.append(pl)
+                if(len(placed) == self.splitAt):
+                    self.subproblems.append((list(placed), pieces[1:]))
+                #If there are more pieces to place, place the next piece
+                elif(len(pieces) > 1):
+                    yield from self.tryPlace(pieces[1:], placed)
+                else:
+                    # Placed the last piece! Hand back the solution
+                    yield self.solution(placed)
+
+                # There aren't anymore solutions with this current placement, remove piece and try next
+                placed.pop()
+                self.board.undo()
+
+    ##
+    # @function     isDeadEnd
+    # @purpose      Checks the cache for the filled spots and remaining pieces having no solutions
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    def isDeadEnd(self, pieces):
+        return self.cache is not None and self.cache.get(self.cacheKey(pieces)) == 0
+
+    ##
+    # @function     markDeadEnd
+    # @purpose      Remembers the filled spots and remaining pieces as a dead end if no solutions were found from them
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        found - the number of solutions made before searching from here
+    # @param        resumed - True if the search was skipping ahead to a checkpoint when it got here
+    def markDeadEnd(self, pieces, found, resumed):
+        # When splitting, the subproblems were saved instead of searched so nothing is known about them, and
+        # when resuming, the placements before the checkpoint's were skipped so its solutions weren't all counted
+        if(self.cache is not None and self.found == found and not self.splitAt and not resumed):
+            self.cache.put(self.cacheKey(pieces), 0)
+
+    ##
+    # @function     tryPlaceBits
+    # @purpose      Recursively places all the pieces on the bitboard in every avaliable viable position
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        placed - the placements made so far
+    # @return       a generator of Solutions
+    def tryPlaceBits(self, pieces, placed):
+        bits = self.bits
+        if(self.isDeadEnd(pieces)):
+            return
+        found = self.found
+        resumed = self.resume is not None
+
+        # Next piece to place is the first piece in pieces
+        p = pieces[0]
+        check = RegionCheck([len(q.shape) for q in pieces[1:]], self.stats)
+
+        candidates = self.candidates(p)
+        if(self.resume is not None):
+            candidates = candidates[self.resumeFrom(placed, candidates):]
+        for pl in candidates:
+            if(bits.isValidPlacement(pl, check)):
+                if(self.control is not None):
+                    self.checkIn(placed, pl)
+                if(self.progress is not None):
+                    self.progress.placed(len(pieces))
+                bits.place(pl.mask)
+                placed.append(pl)
+                if(len(placed) == self.splitAt):
+                    self.subproblems.append((list(placed), pieces[1:]))
+                elif(len(pieces) > 1):
+                    yield from self.tryPlaceBits(pieces[1:], placed)
+                else:
+                    yield self.solution(placed)
+                placed.pop()
+                bits.remove(pl.mask)
+        self.markDeadEnd(pieces, found, resumed)
+
+    ##
+    # @function     candidates
+    # @purpose      The placements of a piece to try on the bitboard, only the ones that fit when there is a FitTable
+    # @param        self - the Solver instance
+    # @param        p - the piece to place
+    # @return       the list of placements, in the order of the PlacementTable
+    def candidates(self, p):
+        if(self.fitter is None):
+            return self.table.placements[p.color]
+        return self.fitter.fitting(self.bits.filled, p.color)
+
+    ##
+    # @function     branches
+    # @purpose      Finds the placements the search would make next from the bitboard, without making them. The grid
+    #               engine makes the same ones in the fixed order, Dancing Links searches a different tree
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @return       the list of (placement, pieces left after it), in the order the search would make them
+    def branches(self, pieces):
+        if(not pieces):
+            return []
+        if(self.engine == "grid" or self.order == "fixed"):
+            choices = [(pieces[0], pieces[1:], self.candidates(pieces[0]))]
+        elif(self.order == "piece"):
+            live = self.fitting(pieces)
+            i = self.fewestPlacements(pieces, live)
+            choices = [(pieces[i], pieces[:i] + pieces[i + 1:], live[pieces[i].color])]
+        else:
+            spot = self.bits.firstOpen() if self.order == "cell" else self.bits.mostConstrained()
+            choices = [(pieces[i], pieces[:i] + pieces[i + 1:], self.table.covering[pieces[i].color][spot])
+                       for i in range(len(pieces))]
+
+        found = []
+        for p, rest, candidates in choices:
+            check = RegionCheck([len(q.shape) for q in rest])
+            for pl in candidates:
+                # Checked as a plain BitBoard, so looking ahead isn't counted in any SolverStats
+                if(BitBoard.isValidPlacement(self.bits, pl, check)):
+                    found.append((pl, rest))
+        return found
+
+    ##
+    # @function     tryPlaceCells
+    # @purpose      Recursively fills one open spot on the bitboard with every remaining piece that covers it,
+    #               so each solution is only found once no matter what order the pieces go in
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        placed - the placements made so far
+    # @return       a generator of Solutions
+    def tryPlaceCells(self, pieces, placed):
+        bits = self.bits
+        if(self.isDeadEnd(pieces)):
+            return
+        found = self.found
+        resumed = self.resume is not None
+
+        # Every solution has to cover this spot with one of the remaining pieces
+        spot = bits.firstOpen() if self.order == "cell" else bits.mostConstrained()
+
+        # When resuming, skip the pieces before the one on the path
+        first = 0
+        if(self.resume is not None):
+            path = self.resume[0]
+            d = len(placed) - self.base
+            if(d < len(path) and placed[self.base:] == path[:d]):
+                first = next((i for i in range(len(pieces)) if pieces[i].color == path[d].color), 0)
+
+        # Pieces of the same size leave the same region sizes to fill, so share their checks
+        checks = {}
+        for i in range(first, len(pieces)):
+            p = pieces[i]
+            rest = pieces[:i] + pieces[i + 1:]
+            if(len(p.shape) not in checks):
+                checks[len(p.shape)] = RegionCheck([len(q.shape) for q in rest], self.stats)
+            check = checks[len(p.shape)]
+
+            candidates = self.table.covering[p.color][spot]
+            if(self.resume is not None):
+                candidates = candidates[self.resumeFrom(placed, candidates):]
+            for pl in candidates:
+                if(bits.isValidPlacement(pl, check)):
+                    if(self.control is not None):
+                        self.checkIn(placed, pl)
+                    if(self.progress is not None):
+                        self.progress.placed(len(pieces))
+                    bits.place(pl.mask)
+                    placed.append(pl)
+                    if(len(placed) == self.splitAt):
+                        self.subproblems.append((list(placed), rest))
+                    elif(len(rest) > 0):
+                        yield from self.tryPlaceCells(rest, placed)
+                    else:
+                        yield self.solution(placed)
+                    placed.pop()
+                    bits.remove(pl.mask)
+        self.markDeadEnd(pieces, found, resumed)
+
+    ##
+    # @function     fitting
+    # @purpose      Finds the placements of each piece that fit on the bitboard, for the "piece" order to start from
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @return       the dictionary of piece color to the list of its placements that fit, in the order of the table
+    def fitting(self, pieces):
+        live = {}
+        for p in pieces:
+            live[p.color] = [pl for pl in self.table.placements[p.color] if self.bits.fits(pl.mask)]
+        return live
+
+    ##
+    # @function     narrow
+    # @purpose      Keeps the placements that still fit once a placement is made, so the lists only ever shrink
+    #               as the search goes down instead of being found again from every placement in the table
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces left after the placement
+    # @param        live - the dictionary of piece color to the list of its placements that fit before it
+    # @param        mask - the bitmask of the placement
+    # @return       the new dictionary of piece color to the list of its placements that fit
+    def narrow(self, pieces, live, mask):
+        left = {}
+        for p in pieces:
+            left[p.color] = [pl for pl in live[p.color] if not pl.mask & mask]
+        return left
+
+    ##
+    # @function     fewestPlacements
+    # @purpose      Picks the piece with the fewest placements that fit, the first one on a tie. Searching it
+    #               first branches the least, and a piece with none left ends the search right away
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        live - the dictionary of piece color to the list of its placements that fit
+    # @return       the index of the piece in pieces
+    def fewestPlacements(self, pieces, live):
+        best = 0
+        for i in range(1, len(pieces)):
+            if(len(live[pieces[i].color]) < len(live[pieces[best].color])):
+                best = i
+        return best
+
+    ##
+    # @function     tryPlacePieces
+    # @purpose      Recursively places the remaining piece with the fewest placements that still fit,
+    #               keeping each piece's list of placements that fit as pieces are placed
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        placed - the placements made so far
+    # @param        live - the dictionary of piece color to the list of its placements that fit
+    # @return       a generator of Solutions
+    def tryPlacePieces(self, pieces, placed, live):
+        bits = self.bits
+        if(self.isDeadEnd(pieces)):
+            return
+        found = self.found
+        resumed = self.resume is not None
+
+        i = self.fewestPlacements(pieces, live)
+        p = pieces[i]
+        rest = pieces[:i] + pieces[i + 1:]
+        check = RegionCheck([len(q.shape) for q in rest], self.stats)
+
+        # The piece picked only depends on the placements made, so resuming picks the same one as the path did
+        candidates = live[p.color]
+        if(self.resume is not None):
+            candidates = candidates[self.resumeFrom(placed, candidates):]
+        for pl in candidates:
+            if(bits.isValidPlacement(pl, check)):
+                if(self.control is not None):
+                    self.checkIn(placed, pl)
+                if(self.progress is not None):
+                    self.progress.placed(len(pieces))
+                bits.place(pl.mask)
+                placed.append(pl)
+                if(len(placed) == self.splitAt):
+                    self.subproblems.append((list(placed), rest))
+                elif(len(rest) > 0):
+                    yield from self.tryPlacePieces(rest, placed, self.narrow(rest, live, pl.mask))
+                else:
+                    yield self.solution(placed)
+                placed.pop()
+                bits.remove(pl.mask)
+        self.markDeadEnd(pieces, found, resumed)
+
+    ##
+    # @function     tryPlaceDLX
+    # @purpose      Places all the pieces on the bitboard by solving the exact cover problem with Dancing Links
+    # @param        self - the Solver instance
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        placed - the placements made before the search, added to each solution
+    # @return       a generator of Solutions
+    def tryPlaceDLX(self, pieces, placed):
+        links = dlx.fromBoard(self.bits, pieces, self.table)
+        for rows in links.search():
+            yield self.solution(placed + rows)
+
+##
+# @function     solve
+# @purpose      Finds the solutions for the pieces left to place on a board, one at a time as they are found
+# @param        board - the Board holding the starting pieces
+# @param        pieces - the list of pieces that still need to be added
+# @param        table - the PlacementTable of every piece, built from pieces if None
+# @param        engine - the engine to search with, see Solver
+# @param        order - the order to search in, see Solver
+# @param        limit - the most solutions to find, None for all of them
+# @param        first - True to stop after the first solution
+# @param        callback - a function to call with each Solution as it is found
+# @param        stats - the PruneStats to count in, or None to not count
+# @param        workers - the number of processes to search with, more than 1 uses parallel.solveParallel
+# @param        depth - the number of placements to make before splitting the search between workers
+# @param        chunksize - the number of subproblems to send a worker at a time
+# @param        symmetry - True to only search one of each set of solutions that are mirror images of each other
+#               when the starting position is symmetric
+# @param        expand - with symmetry, True to hand back every mirror image too, False for one of each. In the
+#               fixed order they come in the order the search without symmetry finds them, which means every
+#               solution is found and kept before the first is handed back, so a limit saves no searching. Any other
+#               order or Dancing Links hands back each solution followed by its mirror images as they are found
+# @param        cache - the TranspositionCache to skip known dead ends with, or None
+# @param        solverStats - the SolverStats to count the search in and time it with, or None
+# @param        control - the SearchControl to stop the search with, save checkpoints with and resume from, or None.
+#               Checkpoints can't be used with the dlx engine or with expanded symmetry, which hand back solutions
+#               in a different order than they are searched in
+# @param        progress - the ProgressReporter to report how far the search has got with, or None
+# @return       a generator of Solutions, stopping it early stops the search
+def solve(board, pieces, table=None, engine="bitboard", order="fixed", limit=None, first=False, callback=None,
+          stats=None, workers=1, depth=2, chunksize=1, symmetry=False, expand=True, cache=None, solverStats=None,
+          control=None, progress=None):
+    if(table is None):
+        table = PlacementTable(pieces, board.rows, board.cols)
+    if(first):
+        limit = 1
+    if(limit is not None and limit <= 0):
+        return
+
+    sym = Symmetry(board, pieces, table) if symmetry else None
+    if(sym):
+        table = sym.reducedTable()
+    expanding = sym is not None and sym.reduces() and expand
+
+    if(control is not None):
+        if((control.checkpoint or control.resume) and (engine == "dlx" or expanding)):
+            raise ValueError("checkpoints can't be used with the dlx engine or with expanded symmetry")
+        control.begin(settings(board, pieces, engine, order, symmetry, workers, depth))
+        if(control.finished()):
+            return
+
+    if(solverStats):
+        solverStats.begin()
+    if(workers == 1):
+        search = Solver(board, table, engine, order, stats, cache, solverStats, control, progress).search(
+            pieces, resume=control and control.frontier)
+    else:
+        search = parallel.solveParallel(board, table, pieces, engine, order, workers, depth, chunksize, stats,
+                                        cache, solverStats, control, progress)
+    # Only the fixed order's solutions can be put back in the order the full search would find them
+    ordered = engine != "dlx" and (engine == "grid" or order == "fixed")
+    solutions = sym.expand(search, ordered) if expanding else search
+
+    found = 0
+    finished = False
+    try:
+        for s in solutions:
+            if(callback):
+                callback(s)
+            if(progress is not None):
+                progress.solved()
+            yield s
+            found += 1
+            if(limit is not None and found >= limit):
+                break
+            if(control is not None):
+                if(control.poll()):
+                    break
+                if(control.saveDue):
+                    control.save()
+        else:
+            finished = control is not None and control.reason is None
+    finally:
+        solutions.close()
+        search.close()
+        if(solverStats):
+            solverStats.end()
+        if(progress is not None):
+            progress.end()
+        if(control is not None):
+            if(finished):
+                control.frontier = {"done": True}
+            control.save()
+
+##
+# @function     settings
+# @purpose      Describes a search for a checkpoint, everything that changes the order the solutions are found in
+# @param        board - the Board holding the starting pieces
+# @param        pieces - the list of pieces that still need to be added
+# @param        engine - the engine to search with, see Solver
+# @param        order - the order to search in, see Solver
+# @param        symmetry - whether the search uses the symmetries of the starting position
+# @param        workers - the number of processes to search with
+# @param        depth - the number of placements made before splitting the search between workers
+# @return       the dictionary, in the form it is saved in
+def settings(board, pieces, engine, order, symmetry, workers, depth):
+    start = {}
+    for r in range(len(board.board)):
+        for c in range(len(board.board[r])):
+            if(not board.isEmptySpot(r, c)):
+                start[board.board[r][c]] = start.get(board.board[r][c], []) + [[r, c]]
+    return {"size": [board.rows, board.cols], "start": start, "pieces": [p.color for p in pieces], "engine": engine,
+            "order": order, "symmetry": symmetry, "split": depth if workers != 1 else None}
+
+##
+# @function     count
+# @purpose      Counts the solutions for the pieces left to place on a board without building any of them
+# @param        board - the Board holding the starting pieces
+# @param        pieces - the list of pieces that still need to be added
+# @param        table - the PlacementTable of every piece, built from pieces if None
+# @param        engine - the engine to search with, see Solver
+# @param        order - the order to search in, see Solver
+# @param        stats - the PruneStats to count in, or None to not count
+# @param        breakdown - a dictionary to add the number of solutions each (color, shape) placement
+#               is part of to, or None
+# @param        workers - the number of processes to search with, more than 1 uses parallel.countParallel
+# @param        depth - the number of placements to make before splitting the search between workers
+# @param        chunksize - the number of subproblems to send a worker at a time
+# @param        symmetry - True to only count one of each set of solutions that are mirror images of each other
+#               and multiply by the number of images, when the starting position is symmetric
+# @param        cache - the TranspositionCache to remember subtree counts in, or None. It isn't used for a breakdown
+# @param        solverStats - the SolverStats to count the search in and time it with, or None
+# @param        progress - the ProgressReporter to report how far the search has got with, or None
+# @return       the number of solutions
+def count(board, pieces, table=None, engine="bitboard", order="fixed", stats=None, breakdown=None,
+          workers=1, depth=2, chunksize=1, symmetry=False, cache=None, solverStats=None, progress=None):
+    if(table is None):
+        table = PlacementTable(pieces, board.rows, board.cols)
+    if(solverStats):
+        solverStats.begin()
+    try:
+        sym = Symmetry(board, pieces, table) if symmetry else None
+        if(sym and sym.reduces()):
+            reduced = None if breakdown is None else {}
+            n = count(board, pieces, sym.reducedTable(), engine, order, stats, reduced, workers, depth, chunksize,
+                      cache=cache, solverStats=solverStats, progress=progress)
+            if(breakdown is not None):
+                sym.expandBreakdown(reduced, breakdown)
+            # Exactly one mirror image of each solution has the picked piece in a kept placement
+            return n * len(sym.group)
+
+        if(workers == 1):
+            return Solver(board, table, engine, order, stats, cache, solverStats,
+                          progress=progress).count(pieces, breakdown=breakdown)
+        return parallel.countParallel(board, table, pieces, engine, order, workers, depth, chunksize, stats,
+                                      breakdown, cache, solverStats, progress)
+    finally:
+        if(solverStats):
+            solverStats.end()
+        if(progress is not None):
+            progress.end()
+
+##
+# @function     uniqueness
+# @purpose      Finds out if a position has no solution, exactly one, or more than one, stopping the search as soon
+#               as it finds a second solution instead of finding them all
+# @param        board - the Board holding the starting pieces
+# @param        pieces - the list of pieces that still need to be added
+# @param        table - the PlacementTable of every piece, built from pieces if None
+# @param        engine - the engine to search with, see Solver
+# @param        order - the order to search in, see Solver
+# @param        workers - the number of processes to search with
+# @param        depth - the number of placements to make before splitting the search between workers
+# @param        cache - the TranspositionCache to skip known dead ends with, or None
+# @param        solverStats - the SolverStats to count the search in and time it with, or None
+# @return       0, 1 or "many"
+def uniqueness(board, pieces, table=None, engine="bitboard", order="fixed", workers=1, depth=2, cache=None,
+               solverStats=None):
+    found = 0
+    for s in solve(board, pieces, table, engine, order, limit=2, workers=workers, depth=depth, cache=cache,
+                   solverStats=solverStats):
+        found += 1
+    return "many" if found > 1 else found
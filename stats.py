@@ -0,0 +1,323 @@
+##
+# @file         Stats.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Counts what the search does at each depth and for each piece, and times the placement
+#               checks. The counting is done by boards that stand in for the Solver's own, so a Solver
+#               without a SolverStats runs exactly the same code as before and pays nothing for it
+
+# Imports
+import cProfile, io, json, pstats, sys, threading, time
+from bitboard import BitBoard
+from board import Board
+
+# Positions in each list of counts
+TRIED = 0           # placements checked
+NOT_FIT = 1         # placements that were off the board or on a filled spot
+ISOLATED = 2        # placements that fit but left a region the remaining pieces can't fill
+NODES = 3           # placements that passed and were placed
+
+class SolverStats():
+
+    ##
+    # @function     init
+    # @purpose      SolverStats constructor. Starts every count at 0
+    # @param        self - the SolverStats instance
+    def __init__(self):
+        self.depth = {}             # depth (1 for the first piece placed) to the list of counts
+        self.piece = {}             # piece color to the list of counts
+        self.maxDepth = 0           # the most pieces on the board at once, not counting starting pieces
+        self.checkSeconds = 0.0     # time spent checking placements
+        self.seconds = 0.0          # time from begin to end
+        self.started = None
+
+    ##
+    # @function     record
+    # @purpose      Counts the result of checking one placement
+    # @param        self - the SolverStats instance
+    # @param        depth - the depth of the piece being placed
+    # @param        color - the piece's color
+    # @param        result - NOT_FIT, ISOLATED or NODES when it passed
+    def record(self, depth, color, result):
+        if(depth not in self.depth):
+            self.depth[depth] = [0, 0, 0, 0]
+        if(color not in self.piece):
+            self.piece[color] = [0, 0, 0, 0]
+        self.depth[depth][TRIED] += 1
+        self.depth[depth][result] += 1
+        self.piece[color][TRIED] += 1
+        self.piece[color][result] += 1
+        if(result == NODES and depth > self.maxDepth):
+            self.maxDepth = depth
+
+    ##
+    # @function     begin
+    # @purpose      Starts timing the whole run
+    # @param        self - the SolverStats instance
+    def begin(self):
+        self.started = time.perf_counter()
+
+    ##
+    # @function     end
+    # @purpose      Stops timing the whole run
+    # @param        self - the SolverStats instance
+    def end(self):
+        if(self.started is not None):
+            self.seconds += time.perf_counter() - self.started
+            self.started = None
+
+    ##
+    # @function     add
+    # @purpose      Adds the counts from another SolverStats, such as one from a worker process
+    # @param        self - the SolverStats instance
+    # @param        other - the SolverStats to add
+    def add(self, other):
+        for mine, theirs in ((self.depth, other.depth), (self.piece, other.piece)):
+            for key in theirs:
+                if(key not in mine):
+                    mine[key] = [0, 0, 0, 0]
+                for i in range(4):
+                    mine[key][i] += theirs[key][i]
+        self.maxDepth = max(self.maxDepth, other.maxDepth)
+        self.checkSeconds += other.checkSeconds
+
+    ##
+    # @function     take
+    # @purpose      Hands over the counts so far and starts again from 0, so each count is only added once
+    # @param        self - the SolverStats instance
+    # @return       a new SolverStats holding the counts
+    def take(self):
+        counts = SolverStats()
+        counts.depth, self.depth = self.depth, {}
+        counts.piece, self.piece = self.piece, {}
+        counts.maxDepth, self.maxDepth = self.maxDepth, 0
+        counts.checkSeconds, self.checkSeconds = self.checkSeconds, 0.0
+        return counts
+
+    ##
+    # @function     toDict
+    # @purpose      The statistics as plain dictionaries and lists, ready to be written as JSON
+    # @param        self - the SolverStats instance
+    def toDict(self):
+        names = ["tried", "notFit", "isolated", "nodes"]
+        return {"depth": {str(d): dict(zip(names, self.depth[d])) for d in sorted(self.depth)},
+                "piece": {c: dict(zip(names, self.piece[c])) for c in sorted(self.piece)},
+                "maxDepth": self.maxDepth,
+                "checkSeconds": self.checkSeconds,
+                "seconds": self.seconds}
+
+    ##
+    # @function     toJSON
+    # @purpose      The statistics as a JSON string
+    # @param        self - the SolverStats instance
+    def toJSON(self):
+        return json.dumps(self.toDict(), indent=1)
+
+    ##
+    # @function     str
+    # @purpose      The statistics as text tables so they can be printed
+    # @param        self - the SolverStats instance
+    def __str__(self):
+        lines = []
+        for title, counts in (("Depth", self.depth), ("Piece", self.piece)):
+            lines.append(title.ljust(8) + "Tried".rjust(12) + "Not fit".rjust(12) + "Isolated".rjust(12)
+                         + "Nodes".rjust(12))
+            for key in sorted(counts):
+                lines.append(str(key).ljust(8) + "".join(str(n).rjust(12) for n in counts[key]))
+            lines.append("")
+        lines.append("Deepest:            " + str(self.maxDepth))
+        lines.append("Checking time:      " + format(self.checkSeconds, ".3f") + "s")
+        lines.append("Total time:         " + format(self.seconds, ".3f") + "s")
+        return "\n".join(lines)
+
+class CountingBitBoard(BitBoard):
+
+    ##
+    # @function     init
+    # @purpose      CountingBitBoard constructor. Takes over a BitBoard and counts every check made on it
+    # @param        self - the CountingBitBoard instance
+    # @param        bits - the BitBoard to take over
+    # @param        stats - the SolverStats to count in
+    def __init__(self, bits, stats):
+        self.__dict__.update(bits.__dict__)
+        self.solverStats = stats
+        # The masks placed so far, the length is the depth
+        self.placedMasks = []
+
+    ##
+    # @function     isValidPlacement
+    # @purpose      Checks a placement like BitBoard does, counting and timing the check
+    # @param        self - the CountingBitBoard instance
+    # @param        placement - the placement to check
+    # @param        check - the RegionCheck for the pieces left after this one
+    def isValidPlacement(self, placement, check=None):
+        start = time.perf_counter()
+        if(not self.fits(placement.mask)):
+            result = NOT_FIT
+        elif(not self.openSpotForEachPiece(placement.mask, check)):
+            result = ISOLATED
+        else:
+            result = NODES
+        self.solverStats.checkSeconds += time.perf_counter() - start
+        self.solverStats.record(len(self.placedMasks) + 1, placement.color, result)
+        return result == NODES
+
+    ##
+    # @function     place
+    # @purpose      Fills the spots of a placement, one level deeper
+    # @param        self - the CountingBitBoard instance
+    # @param        mask - the bitmask of the placement
+    def place(self, mask):
+        BitBoard.place(self, mask)
+        self.placedMasks.append(mask)
+
+    ##
+    # @function     remove
+    # @purpose      Empties the spots of a placement, one level back up
+    # @param        self - the CountingBitBoard instance
+    # @param        mask - the bitmask of the placement
+    def remove(self, mask):
+        BitBoard.remove(self, mask)
+        self.placedMasks.pop()
+
+    ##
+    # @function     reset
+    # @purpose      Puts the filled spots back, forgetting the placements that were taken off with them
+    # @param        self - the CountingBitBoard instance
+    # @param        filled - the mask of filled spots to go back to
+    def reset(self, filled):
+        BitBoard.reset(self, filled)
+        while(self.placedMasks and self.placedMasks[-1] & ~filled):
+            self.placedMasks.pop()
+
+class CountingBoard(Board):
+
+    ##
+    # @function     init
+    # @purpose      CountingBoard constructor. Shares the grid of a Board and counts every check made on it
+    # @param        self - the CountingBoard instance
+    # @param        board - the Board to share the grid of
+    # @param        stats - the SolverStats to count in
+    def __init__(self, board, stats):
+        self.rows = board.rows
+        self.cols = board.cols
+        self.board = board.board
+        self.opens = board.opens
+        self.journal = board.journal
+        self.solverStats = stats
+        self.placed = 0
+
+    ##
+    # @function     isValidPlacement
+    # @purpose      Checks a placement like Board does, counting and timing the check
+    # @param        self - the CountingBoard instance
+    # @param        piece - the piece to check the placement of
+    # @param        check - the RegionCheck for the pieces left after this one
+    def isValidPlacement(self, piece, check=None):
+        start = time.perf_counter()
+        if(not self.fits(piece)):
+            result = NOT_FIT
+        elif(not self.openSpotForEachPiece(piece, check)):
+            result = ISOLATED
+        else:
+            result = NODES
+        self.solverStats.checkSeconds += time.perf_counter() - start
+        self.solverStats.record(self.placed + 1, piece.color, result)
+        return result == NODES
+
+    ##
+    # @function     placePiece
+    # @purpose      Places a piece like Board does, one level deeper
+    # @param        self - the CountingBoard instance
+    # @param        piece - the piece to place
+    def placePiece(self, piece):
+        Board.placePiece(self, piece)
+        self.placed += 1
+
+    ##
+    # @function     removePiece
+    # @purpose      Removes a piece like Board does, one level back up
+    # @param        self - the CountingBoard instance
+    # @param        piece - the piece to remove
+    def removePiece(self, piece):
+        Board.removePiece(self, piece)
+        self.placed -= 1
+
+class Profiler():
+
+    ##
+    # @function     init
+    # @purpose      Profiler constructor. Profiles everything run inside a with block
+    # @param        self - the Profiler instance
+    # @param        mode - "cprofile" to trace every call, or "sample" to look at what is running every
+    #               interval seconds, which barely slows the search down. Python only switches threads every
+    #               5 milliseconds or so, so sampling any faster than that gains nothing
+    # @param        interval - the seconds between samples
+    def __init__(self, mode="cprofile", interval=0.005):
+        self.mode = mode
+        self.interval = interval
+        self.profile = None
+        self.samples = 0
+        self.own = {}           # function to samples where it was the one running
+        self.inside = {}        # function to samples where it was anywhere on the stack
+        self.stopped = threading.Event()
+
+    ##
+    # @function     enter
+    # @purpose      Starts profiling
+    # @param        self - the Profiler instance
+    def __enter__(self):
+        if(self.mode == "cprofile"):
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.target = threading.get_ident()
+            self.sampler = threading.Thread(target=self.sample, daemon=True)
+            self.sampler.start()
+        return self
+
+    ##
+    # @function     exit
+    # @purpose      Stops profiling
+    # @param        self - the Profiler instance
+    def __exit__(self, *exc):
+        if(self.profile):
+            self.profile.disable()
+        else:
+            self.stopped.set()
+            self.sampler.join()
+        return False
+
+    ##
+    # @function     sample
+    # @purpose      Looks at the profiled thread's stack until profiling stops, only run by the sampling thread
+    # @param        self - the Profiler instance
+    def sample(self):
+        while(not self.stopped.wait(self.interval)):
+            frame = sys._current_frames().get(self.target)
+            if(frame is None):
+                continue
+            self.samples += 1
+            self.own[frame.f_code.co_name] = self.own.get(frame.f_code.co_name, 0) + 1
+            seen = set()
+            while(frame is not None):
+                if(frame.f_code.co_name not in seen):
+                    seen.add(frame.f_code.co_name)
+                    self.inside[frame.f_code.co_name] = self.inside.get(frame.f_code.co_name, 0) + 1
+                frame = frame.f_back
+
+    ##
+    # @function     report
+    # @purpose      The profile as text
+    # @param        self - the Profiler instance
+    # @param        limit - the most functions to list
+    def report(self, limit=25):
+        if(self.profile):
+            out = io.StringIO()
+            pstats.Stats(self.profile, stream=out).sort_stats("cumulative").print_stats(limit)
+            return out.getvalue()
+        lines = ["Samples: " + str(self.samples),
+                 "Function".ljust(32) + "Running".rjust(10) + "On stack".rjust(10)]
+        for name in sorted(self.own, key=lambda n: -self.own[n])[:limit]:
+            lines.append(name.ljust(32) + str(self.own[name]).rjust(10) + str(self.inside.get(name, 0)).rjust(10))
+        return "\n".join(lines)
@@ -0,0 +1,190 @@
+##
+# @file         Symmetry.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Cuts the search down by the symmetries of the starting position. A 5x11 board
+#               can be mirrored top to bottom, mirrored left to right or turned 180 degrees, and
+#               when the starting pieces look the same after one of those, so does every solution
+
+class Symmetry():
+
+    ##
+    # @function     init
+    # @purpose      Symmetry constructor. Finds the symmetries of the starting position and
+    #               picks a piece to only search one placement of out of each set of mirror images
+    # @param        self - the Symmetry instance
+    # @param        board - the Board holding the starting pieces
+    # @param        pieces - the list of pieces that still need to be added
+    # @param        table - the PlacementTable of every piece
+    def __init__(self, board, pieces, table):
+        self.rows = len(board.board)
+        self.cols = len(board.board[0])
+        self.pieces = pieces
+        self.table = table
+
+        # Each symmetry is (mirror the rows, mirror the columns), both is a 180 degree turn.
+        # Every starting piece is a different color, so a symmetry of the characters on the board
+        # moves each starting piece on to itself. A catalog can have pieces that can't be flipped, and
+        # a mirror image of one of their placements isn't a placement, so those symmetries are left out
+        self.group = [(False, False)]
+        for g in [(True, False), (False, True), (True, True)]:
+            if(all(board.board[r][c] == board.board[self.moveRow(g, r)][self.moveCol(g, c)]
+                   for r in range(self.rows) for c in range(self.cols)) and self.movesPlacements(g)):
+                self.group.append(g)
+
+        # The piece to restrict and the placements of it to keep, None when there is nothing to cut
+        self.color = None
+        self.keep = None
+        if(len(self.group) > 1):
+            self.pickPiece()
+
+        # The position of each placement in the full table, to put expanded solutions back in order
+        self.index = {}
+        for p in pieces:
+            self.index[p.color] = {}
+            for i in range(len(table.placements[p.color])):
+                self.index[p.color][table.placements[p.color][i].mask] = i
+
+    ##
+    # @function     moveRow
+    # @purpose      Moves a row by a symmetry
+    # @param        self - the Symmetry instance
+    # @param        g - the symmetry
+    # @param        r - the row
+    def moveRow(self, g, r):
+        return self.rows - 1 - r if g[0] else r
+
+    ##
+    # @function     moveCol
+    # @purpose      Moves a column by a symmetry
+    # @param        self - the Symmetry instance
+    # @param        g - the symmetry
+    # @param        c - the column
+    def moveCol(self, g, c):
+        return self.cols - 1 - c if g[1] else c
+
+    ##
+    # @function     moveShape
+    # @purpose      Moves the spots of a shape by a symmetry
+    # @param        self - the Symmetry instance
+    # @param        g - the symmetry
+    # @param        shape - the (row, column) spots
+    # @return       the sorted tuple of moved spots
+    def moveShape(self, g, shape):
+        return tuple(sorted((self.moveRow(g, r), self.moveCol(g, c)) for r, c in shape))
+
+    ##
+    # @function     movesPlacements
+    # @purpose      Checks if a symmetry moves every placement of the remaining pieces on to another placement
+    # @param        self - the Symmetry instance
+    # @param        g - the symmetry
+    def movesPlacements(self, g):
+        return all(self.table.maskOf(self.moveShape(g, pl.shape)) in self.table.byMask[p.color]
+                   for p in self.pieces for pl in self.table.placements[p.color])
+
+    ##
+    # @function     movePlacement
+    # @purpose      Moves a placement by a symmetry
+    # @param        self - the Symmetry instance
+    # @param        g - the symmetry
+    # @param        pl - the placement
+    # @return       the placement from the full table that covers the moved spots
+    def movePlacement(self, g, pl):
+        return self.table.byMask[pl.color][self.table.maskOf(self.moveShape(g, pl.shape))]
+
+    ##
+    # @function     pickPiece
+    # @purpose      Picks the first remaining piece that no symmetry leaves in the same place, and keeps
+    #               the placement with the smallest mask out of each set of its mirror images. Every solution
+    #               then has exactly one mirror image with that piece in a kept placement
+    # @param        self - the Symmetry instance
+    def pickPiece(self):
+        for p in self.pieces:
+            keep = set()
+            for pl in self.table.placements[p.color]:
+                images = [self.movePlacement(g, pl).mask for g in self.group]
+                # A placement that is its own mirror image would need its solutions split up by hand
+                if(pl.mask in images[1:]):
+                    break
+                if(pl.mask == min(images)):
+                    keep.add(pl.mask)
+            else:
+                self.color = p.color
+                self.keep = keep
+                return
+
+    ##
+    # @function     reduces
+    # @purpose      Checks if the search can be cut down
+    # @param        self - the Symmetry instance
+    def reduces(self):
+        return self.color is not None
+
+    ##
+    # @function     reducedTable
+    # @purpose      The table to search with, only holding the kept placements of the picked piece
+    # @param        self - the Symmetry instance
+    # @return       the restricted PlacementTable, or the full one when the search can't be cut down
+    def reducedTable(self):
+        if(not self.reduces()):
+            return self.table
+        return self.table.restricted(self.color, self.keep)
+
+    ##
+    # @function     images
+    # @purpose      Makes every mirror image of a solution found with the reduced table
+    # @param        self - the Symmetry instance
+    # @param        s - the Solution
+    # @return       the list of Solutions, starting with s
+    def images(self, s):
+        if(not self.reduces()):
+            return [s]
+        return [s] + [s.withPlacements([self.movePlacement(g, pl) for pl in s.placements]) for g in self.group[1:]]
+
+    ##
+    # @function     key
+    # @purpose      Where a solution comes in the order the fixed order search finds them
+    # @param        self - the Symmetry instance
+    # @param        s - the Solution
+    # @return       the tuple of each piece's position in the table, in the order the pieces are placed
+    def key(self, s):
+        masks = {}
+        for pl in s.placements:
+            masks[pl.color] = pl.mask
+        return tuple(self.index[p.color][masks[p.color]] for p in self.pieces)
+
+    ##
+    # @function     expand
+    # @purpose      Turns the solutions found with the reduced table back in to every solution.
+    #               To put them in order they have to all be found and kept before the first can be
+    #               handed back, since a mirror image can come before the solution it was made from, so
+    #               a limit saves no searching. Only the fixed order can be put back in order, key doesn't
+    #               know the order any other search finds them in
+    # @param        self - the Symmetry instance
+    # @param        solutions - the Solutions found with the reduced table
+    # @param        ordered - True to hand them back in the order the fixed order search would find them,
+    #               False to hand back each one followed by its mirror images as soon as it is found
+    # @return       a generator of every Solution
+    def expand(self, solutions, ordered=True):
+        if(not ordered):
+            for s in solutions:
+                yield from self.images(s)
+            return
+        found = []
+        for s in solutions:
+            found += self.images(s)
+        found.sort(key=self.key)
+        yield from found
+
+    ##
+    # @function     expandBreakdown
+    # @purpose      Turns a breakdown counted with the reduced table in to the breakdown of every solution
+    # @param        self - the Symmetry instance
+    # @param        reduced - the dictionary of (color, shape) to number of solutions counted with the reduced table
+    # @param        breakdown - the dictionary to add the counts of every solution to
+    def expandBreakdown(self, reduced, breakdown):
+        group = self.group if self.reduces() else self.group[:1]
+        for key in reduced:
+            for g in group:
+                moved = (key[0], self.moveShape(g, key[1]))
+                breakdown[moved] = breakdown.get(moved, 0) + reduced[key]
@@ -0,0 +1,10 @@
+##
+# @file         Conftest.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Lets the tests import the solver's modules, which sit in the folder above
+
+# Imports
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
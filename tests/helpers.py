@@ -0,0 +1,36 @@
+##
+# @file         Helpers.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Starting positions and ways of comparing solutions shared by the tests
+
+# Imports
+import random
+from board import Board
+from catalog import loadCatalog, startPosition
+from placements import PlacementTable
+from solver import solve
+
+ROWS, COLS, PIECES = loadCatalog()
+TABLE = PlacementTable(PIECES, ROWS, COLS)
+
+##
+# @function     startFrom
+# @purpose      Makes a starting position by taking some pieces of a random full board
+# @param        seed - the seed for the full board and the pieces kept
+# @param        keep - the number of pieces to keep
+# @return       the Board and the pieces left to place
+def startFrom(seed, keep):
+    rng = random.Random(seed)
+    full = next(solve(Board(ROWS, COLS), PIECES, TABLE.shuffled(rng), "bitboard", "constrained", first=True))
+    position = {}
+    for color in rng.sample(sorted(full.cells), keep):
+        position[color] = [list(c) for c in full.cells[color]]
+    return startPosition(position, PIECES, TABLE)
+
+##
+# @function     key
+# @purpose      The placements of a solution, to compare solutions by
+# @param        s - the Solution
+def key(s):
+    return tuple((pl.color, pl.mask) for pl in s.placements)
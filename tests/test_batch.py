@@ -0,0 +1,18 @@
+##
+# @file         Test_batch.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Checks that a bad input line gets an error result instead of stopping the batch
+
+# Imports
+import json
+import pytest
+from batch import BatchWorker
+
+@pytest.mark.parametrize("spots", [[[None, 0], [1, 0], [2, 0], [3, 0]], [["a", 0], [1, 0], [2, 0], [3, 0]],
+                                   [[0.5, 0], [1, 0], [2, 0], [3, 0]], [[9, 0], [1, 0], [2, 0], [3, 0]]])
+def test_bad_spots(spots):
+    worker = BatchWorker(wantCount=False)
+    result = worker.run((1, json.dumps({"P": spots})))
+    assert "error" in result
+    assert result["line"] == 1
@@ -0,0 +1,43 @@
+##
+# @file         Test_checkpoint.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Checks that a search stopped at a checkpoint and carried on finds exactly the solutions of one run
+#               straight through, and reports its progress from where it left off
+
+# Imports
+import pytest
+from cache import TranspositionCache
+from checkpoint import SearchControl, readCheckpoint
+from helpers import TABLE, key, startFrom
+from progress import ProgressReporter
+from solver import solve
+
+@pytest.mark.parametrize("order", ["fixed", "constrained", "piece"])
+@pytest.mark.parametrize("seed", range(4))
+def test_resume_with_cache(tmp_path, order, seed):
+    board, pieces = startFrom(seed, 5)
+    full = [key(s) for s in solve(board, pieces, TABLE, "bitboard", order)]
+    path = str(tmp_path / "checkpoint.json")
+    for stop in range(1, min(len(full), 4)):
+        first = [key(s) for s in solve(board, pieces, TABLE, "bitboard", order, limit=stop,
+                                       control=SearchControl(checkpoint=path))]
+        # Skipping ahead to the checkpoint mustn't leave the cache thinking a subtree has no solutions
+        control = SearchControl(checkpoint=path, resume=readCheckpoint(path))
+        rest = [key(s) for s in solve(board, pieces, TABLE, "bitboard", order, cache=TranspositionCache(100000),
+                                      control=control)]
+        assert first + rest == full
+
+@pytest.mark.parametrize("order", ["fixed", "piece"])
+def test_resume_progress(tmp_path, order):
+    board, pieces = startFrom(5, 3)
+    path = str(tmp_path / "checkpoint.json")
+    for s in solve(board, pieces, TABLE, "bitboard", order, limit=100, control=SearchControl(checkpoint=path)):
+        pass
+    # The branches of the first level before the checkpoint's count as done, so every branch is done at the end
+    progress = ProgressReporter(60, lambda snap: None)
+    for s in solve(board, pieces, TABLE, "bitboard", order, control=SearchControl(resume=readCheckpoint(path)),
+                   progress=progress):
+        pass
+    assert progress.skipped > 0
+    assert progress.done == progress.branches
@@ -0,0 +1,30 @@
+##
+# @file         Test_menu.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Checks that the Menu finds the same spots for a piece with NumPy as it does by trying every open spot
+
+# Imports
+import pytest
+pytest.importorskip("numpy")
+pytest.importorskip("keyboard")
+from menu import PlacementIndex
+from regions import RegionCheck
+from vectorized import FitTable
+from helpers import TABLE, startFrom
+
+@pytest.mark.parametrize("seed, keep", [(0, 2), (1, 4), (2, 6), (3, 8), (4, 1)])
+def test_fit_anchors(seed, keep):
+    board, left = startFrom(seed, keep)
+    fitter = FitTable(TABLE)
+    for p in left:
+        check = RegionCheck([len(q.shape) for q in left if q is not p])
+        plain = PlacementIndex(board, None, check)
+        fast = PlacementIndex(board, fitter, check)
+        # Every orientation the Menu can turn the piece to, starting where the catalog puts it
+        for flips in range(p.flips):
+            for rots in range(p.rots):
+                assert fast.anchors(p) == plain.anchors(p)
+                assert fast.valid(p) == plain.valid(p)
+                p = p.rotate90()
+            p = p.flip()
@@ -0,0 +1,30 @@
+##
+# @file         Test_parallel.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Checks how the search is split between worker processes
+
+# Imports
+import pytest
+from helpers import TABLE, startFrom
+from solver import Solver, count, solve
+
+@pytest.mark.parametrize("depth", [0, -1])
+def test_split_depth_below_one(depth):
+    board, pieces = startFrom(0, 6)
+    with pytest.raises(ValueError):
+        count(board, pieces, TABLE, workers=2, depth=depth)
+    with pytest.raises(ValueError):
+        list(solve(board, pieces, TABLE, workers=2, depth=depth))
+    with pytest.raises(ValueError):
+        Solver(board, TABLE).split(pieces, depth)
+
+def test_split_full_board():
+    board, pieces = startFrom(0, 12)
+    assert pieces == []
+    assert count(board, pieces, TABLE, workers=2) == 1
+    assert len(list(solve(board, pieces, TABLE, workers=2))) == 1
+
+def test_parallel_matches_one_process():
+    board, pieces = startFrom(1, 5)
+    assert count(board, pieces, TABLE, workers=2, depth=1) == count(board, pieces, TABLE)
@@ -0,0 +1,23 @@
+##
+# @file         Test_service.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Checks that the service answers a bad starting position as a bad request
+
+# Imports
+import json
+import pytest
+from service import SolverService
+
+@pytest.fixture(scope="module")
+def service():
+    service = SolverService(("bitboard", "fixed", False, False, False, 0, None), workers=1)
+    yield service
+    service.close()
+
+@pytest.mark.parametrize("spots", [[[None, 0], [1, 0], [2, 0], [3, 0]], [["a", 0], [1, 0], [2, 0], [3, 0]],
+                                   [[0.5, 0], [1, 0], [2, 0], [3, 0]]])
+def test_bad_spots(service, spots):
+    status, answer = service.handle("/count", json.dumps({"position": {"P": spots}}).encode())
+    assert status == 400
+    assert "error" in answer
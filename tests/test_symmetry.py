@@ -0,0 +1,52 @@
+##
+# @file         Test_symmetry.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Checks that searching one of each set of mirror images and making the rest finds every solution
+
+# Imports
+import pytest
+from board import Board
+from catalog import parseCatalog
+from placements import PlacementTable
+from solver import count, solve
+from symmetry import Symmetry
+from helpers import key
+
+# A 4x5 board with a dozen solutions, empty so every symmetry of the board is one of the position
+CATALOG = {"rows": 4, "cols": 5, "pieces": [
+    {"color": "A", "shape": [[0, 0], [0, 1], [0, 2], [0, 3], [1, 3]]},
+    {"color": "b", "shape": [[0, 4], [1, 4], [2, 3], [2, 4], [3, 4]]},
+    {"color": "C", "shape": [[1, 0], [1, 1], [1, 2], [2, 0], [3, 0]], "rots": 4, "flips": 1},
+    {"color": "D", "shape": [[2, 1], [2, 2], [3, 1], [3, 2], [3, 3]]}]}
+ROWS, COLS, PIECES = parseCatalog(CATALOG)
+TABLE = PlacementTable(PIECES, ROWS, COLS)
+
+@pytest.mark.parametrize("engine, order", [("grid", "fixed"), ("bitboard", "fixed"), ("bitboard", "cell"),
+                                           ("bitboard", "constrained"), ("bitboard", "piece"), ("dlx", "fixed")])
+def test_expand(engine, order):
+    assert Symmetry(Board(ROWS, COLS), PIECES, TABLE).reduces()
+    full = [key(s) for s in solve(Board(ROWS, COLS), PIECES, TABLE, engine, order)]
+    expanded = [key(s) for s in solve(Board(ROWS, COLS), PIECES, TABLE, engine, order, symmetry=True)]
+    assert len(full) > 1
+    if(engine != "dlx" and order == "fixed"):
+        assert expanded == full
+    else:
+        # The pieces can be placed in a different order in each solution, so compare what they cover
+        assert sorted(sorted(k) for k in expanded) == sorted(sorted(k) for k in full)
+
+# L and J can't be flipped, so only turning the board 180 degrees moves their placements on to placements
+CHIRAL = {"rows": 2, "cols": 4, "pieces": [
+    {"color": "L", "shape": [[0, 0], [1, 0], [1, 1], [1, 2]], "rots": 4, "flips": 1},
+    {"color": "J", "shape": [[0, 1], [0, 2], [0, 3], [1, 3]], "rots": 4, "flips": 1}]}
+
+@pytest.mark.parametrize("engine, order", [("grid", "fixed"), ("bitboard", "fixed"), ("bitboard", "constrained"),
+                                           ("dlx", "fixed")])
+def test_no_flips(engine, order):
+    rows, cols, pieces = parseCatalog(CHIRAL)
+    table = PlacementTable(pieces, rows, cols)
+    assert Symmetry(Board(rows, cols), pieces, table).group == [(False, False), (True, True)]
+    full = [key(s) for s in solve(Board(rows, cols), pieces, table, engine, order)]
+    expanded = [key(s) for s in solve(Board(rows, cols), pieces, table, engine, order, symmetry=True)]
+    assert sorted(sorted(k) for k in expanded) == sorted(sorted(k) for k in full)
+    assert count(Board(rows, cols), pieces, table, engine, order, symmetry=True) == len(full)
@@ -0,0 +1,123 @@
+##
+# @file         Vectorized.py
+# @author       Daniel Epstein
+# @date         October 18, 2026
+# @purpose      Finds which placements of the pieces fit on a board all at once with NumPy, by sliding every
+#               orientation over the grid of filled spots and counting the filled spots under it. A placement
+#               fits when it covers none. NumPy is optional, everything else works without it
+
+# Imports
+try:
+    import numpy
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:
+    numpy = None
+
+# True when NumPy is installed and FitTable can be used
+AVAILABLE = numpy is not None
+
+class FitTable():
+
+    ##
+    # @function     init
+    # @purpose      FitTable constructor. Stacks the orientations of every piece into one array of masks
+    #               and finds where each placement of the PlacementTable is in the result of sliding them
+    # @param        self - the FitTable instance
+    # @param        table - the PlacementTable to find the fitting placements of, it can be restricted
+    def __init__(self, table):
+        if(not AVAILABLE):
+            raise ImportError("finding the fitting placements with a FitTable needs numpy")
+        self.rows = table.rows
+        self.cols = table.cols
+
+        # Every orientation is padded to the tallest and widest one, so they can all slide over the grid together
+        orientations = [(color, o) for color in table.orientations for o in table.orientations[color]]
+        self.height = max(1 + max(c[0] for c in o) for color, o in orientations)
+        self.width = max(1 + max(c[1] for c in o) for color, o in orientations)
+        self.masks = numpy.zeros((len(orientations), self.height, self.width), numpy.uint8)
+        for k in range(len(orientations)):
+            for r, c in orientations[k][1]:
+                self.masks[k, r, c] = 1
+
+        # For each piece, the range of its orientations in masks, and for each of its placements in the table's
+        # order, its orientation and the index of its top left corner in the result of sliding them
+        size = self.rows * self.cols
+        self.first = {}
+        self.last = {}
+        self.orientation = {}
+        self.index = {}
+        self.placements = {}
+        k = 0
+        for color in table.orientations:
+            shapes = table.orientations[color]
+            self.first[color] = k
+            self.last[color] = k + len(shapes)
+            k += len(shapes)
+            number = {}
+            for i in range(len(shapes)):
+                number[shapes[i]] = i
+            placed = table.placements[color]
+            self.orientation[color] = numpy.zeros(len(placed), numpy.intp)
+            self.index[color] = numpy.zeros(len(placed), numpy.intp)
+            for j in range(len(placed)):
+                r = min(c[0] for c in placed[j].shape)
+                c = min(c[1] for c in placed[j].shape)
+                i = number[tuple(sorted((s[0] - r, s[1] - c) for s in placed[j].shape))]
+                self.orientation[color][j] = i
+                self.index[color][j] = i * size + r * self.cols + c
+            # An object array, so the fitting placements can be picked out without a loop
+            self.placements[color] = numpy.empty(len(placed), object)
+            self.placements[color][:] = placed
+
+    ##
+    # @function     grid
+    # @purpose      Turns the filled spots of a board into a grid of 0s and 1s, padded on the bottom and right so
+    #               every orientation can slide to every spot
+    # @param        self - the FitTable instance
+    # @param        filled - the bitmask of filled spots, bit r * cols + c for spot [r, c]
+    # @return       the padded grid
+    def grid(self, filled):
+        size = self.rows * self.cols
+        spots = numpy.unpackbits(numpy.frombuffer(filled.to_bytes((size + 7) // 8, "little"), numpy.uint8),
+                                 bitorder="little")
+        grid = numpy.zeros((self.rows + self.height - 1, self.cols + self.width - 1), numpy.uint8)
+        grid[:self.rows, :self.cols] = spots[:size].reshape(self.rows, self.cols)
+        return grid
+
+    ##
+    # @function     covered
+    # @purpose      Counts the filled spots under some orientations at every spot of the board, in one pass
+    # @param        self - the FitTable instance
+    # @param        filled - the bitmask of filled spots
+    # @param        first - the first orientation in masks to count
+    # @param        last - the orientation in masks after the last one to count
+    # @return       the flat array of counts, orientation by orientation and each one row by row
+    def covered(self, filled, first, last):
+        windows = sliding_window_view(self.grid(filled), (self.height, self.width))
+        # The correlation of each mask with the grid, every window at once
+        return numpy.einsum("khw,rchw->krc", self.masks[first:last], windows).ravel()
+
+    ##
+    # @function     fitting
+    # @purpose      Finds the placements of a piece that fit on a board
+    # @param        self - the FitTable instance
+    # @param        filled - the bitmask of filled spots
+    # @param        color - the character of the piece
+    # @return       the list of placements that fit, in the order of the PlacementTable
+    def fitting(self, filled, color):
+        counts = self.covered(filled, self.first[color], self.last[color])
+        return self.placements[color][counts[self.index[color]] == 0].tolist()
+
+    ##
+    # @function     validity
+    # @purpose      Finds which placements of every piece fit on a board, sliding every orientation at once
+    # @param        self - the FitTable instance
+    # @param        filled - the bitmask of filled spots
+    # @return       the dictionary of piece color to an array of True or False for each of its placements,
+    #               in the order of the PlacementTable
+    def validity(self, filled):
+        counts = self.covered(filled, 0, len(self.masks))
+        fits = {}
+        for color in self.index:
+            fits[color] = counts[self.index[color] + self.first[color] * self.rows * self.cols] == 0
+        return fits